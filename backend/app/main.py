@@ -2,32 +2,202 @@
 Main FastAPI application
 Entry point for the backend service
 """
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+import asyncio
+import base64
+import binascii
+import json
+import os
+import signal
+import threading
+from typing import Any, Dict, Optional
+
+from fastapi import Body, FastAPI, Header, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from contextlib import asynccontextmanager
 
-from app.services import GameService, MatchmakingService
-from app.websocket import ConnectionManager, MessageHandler
+import numpy as np
+
+from app.models import GameRules, GameState, TournamentFormat
+from app.services import (
+    AnalyticsService,
+    EventBus,
+    GameArchive,
+    GameService,
+    HandoverService,
+    HintService,
+    LeaderboardService,
+    LobbyService,
+    MatchHistoryStore,
+    MatchmakingService,
+    PositionAnalyzer,
+    SamplingProfiler,
+    TournamentService,
+    Tracer,
+    TurnClockService,
+)
+from app.services.archive_service import iter_ndjson
+from app.services.profiler_service import collapse_stacks
+from app.websocket import (
+    ConnectionManager,
+    LeaderboardBroadcaster,
+    MessageHandler,
+    MultiplexedSession,
+)
+
 
+# Configuration
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+MUX_TOKEN = os.getenv("MUX_TOKEN")
+HANDOVER_PATH = os.getenv("HANDOVER_PATH", "/tmp/vanishing-ttt-handover.bin")
+ARCHIVE_PATH = os.getenv("ARCHIVE_PATH", "/tmp/vanishing-ttt-archive.vta")
+ARCHIVE_FLUSH_SECONDS = float(os.getenv("ARCHIVE_FLUSH_SECONDS", "5"))
+HISTORY_PATH = os.getenv("HISTORY_PATH", "/tmp/vanishing-ttt-history.db")
+# Share of inbound messages traced (0 = off); can be changed at runtime by admins
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0"))
+# Spans kept in the tracing ring buffer
+TRACE_BUFFER_SPANS = 10_000
+# Finished games stay in memory this long (for final screens), then only the archive has them
+FINISHED_GAME_TTL_SECONDS = 60
+# Largest page served by the match history endpoint
+MAX_HISTORY_LIMIT = 100
+# How often leaderboard changes are pushed to /ws/leaderboard subscribers
+LEADERBOARD_PUSH_SECONDS = 1.0
+MAX_LEADERBOARD_RADIUS = 50
+# Largest batch accepted by the position analysis endpoint
+MAX_ANALYSIS_POSITIONS = 10_000
+# Largest standings page served by the tournament endpoint
+MAX_TOURNAMENT_STANDINGS = 100
+# Largest page served by the lobby endpoint
+MAX_LOBBY_PAGE = 100
+# How long shutdown waits for event subscribers to catch up
+EVENT_DRAIN_SECONDS = 10.0
+# Bounds for on-demand CPU profiles
+MAX_PROFILE_SECONDS = 60
+MAX_PROFILE_HZ = 1000
+
+# WebSocket close code telling clients the server restarts and they should reconnect
+SERVICE_RESTART_CODE = 1012
+# WebSocket close code for rejected credentials
+POLICY_VIOLATION_CODE = 1008
 
 # Initialize services as singletons
-game_service = GameService()
+event_bus = EventBus()
+game_service = GameService(event_bus)
 matchmaking_service = MatchmakingService(game_service)
 connection_manager = ConnectionManager()
+turn_clock_service = TurnClockService(game_service)
+hint_service = HintService()
+game_archive = GameArchive(ARCHIVE_PATH)
+match_history = MatchHistoryStore(HISTORY_PATH)
+leaderboard_service = LeaderboardService()
+leaderboard_broadcaster = LeaderboardBroadcaster(leaderboard_service)
+analytics_service = AnalyticsService()
+tournament_service = TournamentService(game_service, matchmaking_service)
+# The cached first page covers every limit the lobby endpoint accepts
+lobby_service = LobbyService(game_service, matchmaking_service, page_size=MAX_LOBBY_PAGE)
+tracer = Tracer(TRACE_SAMPLE_RATE, TRACE_BUFFER_SPANS)
+profiler = SamplingProfiler()
 message_handler = MessageHandler(
     game_service=game_service,
     matchmaking_service=matchmaking_service,
-    connection_manager=connection_manager
+    connection_manager=connection_manager,
+    turn_clock_service=turn_clock_service,
+    hint_service=hint_service,
+    game_archive=game_archive,
+    match_history=match_history,
+    leaderboard_service=leaderboard_service,
+    analytics_service=analytics_service,
+    tournament_service=tournament_service,
+    lobby_service=lobby_service,
+    event_bus=event_bus,
+    tracer=tracer
+)
+handover_service = HandoverService(
+    game_service=game_service,
+    matchmaking_service=matchmaking_service,
+    path=HANDOVER_PATH
 )
 
 
+async def drain() -> dict:
+    """Hand live games over to the next process and close all sockets"""
+    if matchmaking_service.is_draining():
+        return {"status": "already_draining"}
+    
+    print("🚰 Draining: writing live games for handover...")
+    result = handover_service.drain()
+    print(f"✅ Handover written: {result}")
+    await connection_manager.close_all(SERVICE_RESTART_CODE, "Server restarting")
+    return {"status": "draining", **result}
+
+
+def restore_handover() -> Optional[dict]:
+    """Take over handed-over games and re-arm their turn clocks"""
+    restored = handover_service.restore()
+    if restored and "error" in restored:
+        print(f"❌ Handover file unreadable, moved to {restored['moved_to']}: {restored['error']}")
+    elif restored:
+        print(f"♻️ Restored games from handover: {restored}")
+        for game in game_service.get_all_games().values():
+            turn_clock_service.schedule(game)
+            lobby_service.update(game)
+    return restored
+
+
+def require_admin(token: Optional[str]) -> None:
+    """Reject admin calls unless ADMIN_TOKEN is configured and matches"""
+    if not ADMIN_TOKEN or token != ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+
+async def cleanup_finished_games() -> None:
+    """Periodically drop finished games from memory (they are archived)"""
+    while True:
+        await asyncio.sleep(FINISHED_GAME_TTL_SECONDS)
+        removed = game_service.cleanup_finished_games()
+        if removed:
+            print(f"🧹 Removed {removed} finished games from memory")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup and shutdown events"""
     # Startup
     print("🚀 Backend starting up...")
+    restore_handover()
+    match_history.start()
+    # The leaderboard lives in memory; rebuild it from the stored totals
+    players = leaderboard_service.load(match_history.iter_totals())
+    print(f"🏆 Leaderboard loaded with {players} players")
+    background_tasks = [
+        asyncio.create_task(turn_clock_service.run(message_handler.handle_timeout)),
+        asyncio.create_task(game_archive.run(ARCHIVE_FLUSH_SECONDS)),
+        asyncio.create_task(cleanup_finished_games()),
+        asyncio.create_task(leaderboard_broadcaster.run(LEADERBOARD_PUSH_SECONDS)),
+    ]
+    
+    # SIGUSR1 starts drain mode (signal handlers are unavailable on Windows);
+    # the loop only keeps weak references to tasks, so hold on to it here
+    def start_drain() -> None:
+        task = asyncio.ensure_future(drain())
+        background_tasks.append(task)
+    
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGUSR1, start_drain)
+    except (AttributeError, NotImplementedError):
+        pass
+    
     yield
-    # Shutdown
+    # Shutdown: let subscribers finish recording games that already ended
+    if not await event_bus.join(timeout=EVENT_DRAIN_SECONDS):
+        print(f"⚠️ Event subscribers still busy after {EVENT_DRAIN_SECONDS:g}s, shutting down anyway")
+    for task in background_tasks:
+        task.cancel()
+    archived = game_archive.flush()
+    if archived:
+        print(f"🗄️ Archived {archived} finished games")
+    match_history.stop()
     print("👋 Backend shutting down...")
 
 
@@ -61,18 +231,419 @@ async def root():
 
 @app.get("/api/health")
 async def health():
-    """Detailed health check"""
-    games = game_service.get_all_games()
+    """Detailed health check (games are listed by /api/lobby)"""
+    return {
+        "status": "draining" if matchmaking_service.is_draining() else "healthy",
+        "active_games": game_service.game_count(),
+        "lobby": lobby_service.counts()
+    }
+
+
+@app.get("/api/lobby")
+async def lobby(state: str = "waiting", cursor: Optional[str] = None, limit: int = 20):
+    """Public games in a state, oldest first; pass next_cursor to continue"""
+    limit = max(1, min(limit, MAX_LOBBY_PAGE))
+    try:
+        return lobby_service.page(GameState(state), cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.get("/api/rooms/{code}")
+async def room(code: str):
+    """Room behind an invite code, while it is still waiting for a player"""
+    game = lobby_service.find_room(code)
+    if game is None:
+        raise HTTPException(status_code=404, detail="Room not found")
+    return game.to_dict()
+
+
+@app.get("/api/hints/stats")
+async def hint_stats():
+    """Position cache hit rate and memory usage"""
+    return hint_service.stats()
+
+
+@app.get("/api/players/{player_id}/games")
+async def player_games(player_id: str, limit: int = 20):
+    """Most recent finished games of a player, newest first"""
+    if not 1 <= limit <= MAX_HISTORY_LIMIT:
+        raise HTTPException(status_code=400, detail=f"limit must be 1..{MAX_HISTORY_LIMIT}")
+    games = await asyncio.to_thread(match_history.last_games, player_id, limit)
+    return {"player_id": player_id, "games": games}
+
+
+@app.get("/api/players/{player_id}/stats")
+async def player_stats(player_id: str):
+    """Win/draw/loss totals of a player"""
+    return await asyncio.to_thread(match_history.totals, player_id)
+
+
+@app.get("/api/players/{player_id}/vs/{opponent_id}")
+async def player_head_to_head(player_id: str, opponent_id: str):
+    """Head-to-head record of a player against one opponent"""
+    return await asyncio.to_thread(match_history.head_to_head, player_id, opponent_id)
+
+
+@app.get("/api/leaderboard")
+async def leaderboard(limit: int = 10, offset: int = 0):
+    """Leaderboard page, best players first"""
+    if not 1 <= limit <= leaderboard_service.page_size or offset < 0:
+        raise HTTPException(
+            status_code=400,
+            detail=f"limit must be 1..{leaderboard_service.page_size}, offset >= 0"
+        )
+    return {
+        "version": leaderboard_service.version,
+        "total_players": len(leaderboard_service),
+        "players": leaderboard_service.top(limit, offset),
+    }
+
+
+@app.get("/api/leaderboard/players/{player_id}")
+async def leaderboard_player(player_id: str, radius: int = 5):
+    """A player's rank and the players ranked around them"""
+    standing = leaderboard_service.standing(player_id)
+    if standing is None:
+        raise HTTPException(status_code=404, detail="Player has no ranked games")
+    radius = max(0, min(radius, MAX_LEADERBOARD_RADIUS))
+    return {
+        **standing,
+        "around": leaderboard_service.around(player_id, radius),
+    }
+
+
+@app.get("/api/analytics")
+async def analytics():
+    """Gameplay aggregates over the last minute, hour and day, per board size"""
+    return analytics_service.snapshot()
+
+
+@app.post("/api/positions/analyze")
+async def analyze_positions(body: Dict[str, Any] = Body(...)):
+    """
+    Analyze a batch of positions under one rule set
+    Positions come as "boards" (lists of board_size**2 cell codes) or as
+    "packed" (base64 of the same codes as row-major int8); results are columnar
+    """
+    try:
+        rules = GameRules.from_dict(body.get("rules") or {})
+        if "packed" in body:
+            boards = np.frombuffer(base64.b64decode(body["packed"], validate=True), dtype=np.int8)
+            if boards.size % rules.cell_count:
+                raise ValueError("packed length is not a multiple of board_size**2")
+            boards = boards.reshape(-1, rules.cell_count)
+        else:
+            boards = np.asarray(body.get("boards", []), dtype=np.int64)
+            if boards.size == 0:
+                boards = boards.reshape(0, rules.cell_count)
+        if len(boards) > MAX_ANALYSIS_POSITIONS:
+            raise ValueError(f"At most {MAX_ANALYSIS_POSITIONS} positions per request")
+        result = await asyncio.to_thread(
+            PositionAnalyzer(rules).analyze, boards, body.get("to_move")
+        )
+    except (ValueError, TypeError, OverflowError, binascii.Error) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return result.to_dict()
+
+
+@app.get("/api/tournaments/{tournament_id}")
+async def tournament_status(tournament_id: str, limit: int = 10):
+    """Tournament state, current round and top of the standings"""
+    tournament = tournament_service.get_tournament(tournament_id)
+    if tournament is None:
+        raise HTTPException(status_code=404, detail="Unknown tournament")
+    limit = max(0, min(limit, MAX_TOURNAMENT_STANDINGS))
     return {
-        "status": "healthy",
-        "active_games": len(games),
-        "games": {
-            game_id: game.state.value 
-            for game_id, game in games.items()
-        }
+        **tournament.to_dict(),
+        "standings": tournament.standings()[:limit]
     }
 
 
+@app.post("/api/admin/tournaments")
+async def admin_create_tournament(
+    body: Dict[str, Any] = Body(default={}),
+    x_admin_token: Optional[str] = Header(default=None)
+):
+    """Create a tournament; players join over WebSocket with join_tournament"""
+    require_admin(x_admin_token)
+    try:
+        tournament = tournament_service.create_tournament(
+            TournamentFormat(body.get("format", TournamentFormat.SWISS.value)),
+            GameRules.from_dict(body["rules"]) if body.get("rules") is not None else None,
+            body.get("rounds")
+        )
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return tournament.to_dict()
+
+
+@app.post("/api/admin/tournaments/{tournament_id}/start")
+async def admin_start_tournament(
+    tournament_id: str,
+    x_admin_token: Optional[str] = Header(default=None)
+):
+    """Close registration, pair round one and notify every entrant"""
+    require_admin(x_admin_token)
+    if tournament_service.get_tournament(tournament_id) is None:
+        raise HTTPException(status_code=404, detail="Unknown tournament")
+    try:
+        update = tournament_service.start(tournament_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    await message_handler.announce_tournament(update)
+    return update.tournament.to_dict()
+
+
+@app.get("/api/admin/events")
+async def admin_events(x_admin_token: Optional[str] = Header(default=None)):
+    """Event bus backlog and every subscriber's queue, deliveries and drops"""
+    require_admin(x_admin_token)
+    return event_bus.stats()
+
+
+@app.get("/api/admin/tracing")
+async def admin_tracing(limit: int = 50, x_admin_token: Optional[str] = Header(default=None)):
+    """Sampling settings and the most recent traced messages"""
+    require_admin(x_admin_token)
+    return {**tracer.stats(), "traces": tracer.recent(max(0, limit))}
+
+
+@app.post("/api/admin/tracing")
+async def admin_set_tracing(
+    body: Dict[str, Any] = Body(...),
+    x_admin_token: Optional[str] = Header(default=None)
+):
+    """Change the share of traced messages, e.g. {"sample_rate": 0.01}"""
+    require_admin(x_admin_token)
+    try:
+        tracer.set_sample_rate(float(body.get("sample_rate", 0)))
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return tracer.stats()
+
+
+@app.post("/api/admin/profile", response_class=PlainTextResponse)
+async def admin_profile(
+    seconds: float = 10,
+    hz: int = 100,
+    all_threads: bool = False,
+    x_admin_token: Optional[str] = Header(default=None)
+):
+    """
+    Sample CPU stacks for `seconds` and return them collapsed for flamegraphs
+    Only the event loop thread is sampled unless all_threads is set
+    """
+    require_admin(x_admin_token)
+    if not 0 < seconds <= MAX_PROFILE_SECONDS:
+        raise HTTPException(status_code=400, detail=f"seconds must be within 0..{MAX_PROFILE_SECONDS}")
+    if not 1 <= hz <= MAX_PROFILE_HZ:
+        raise HTTPException(status_code=400, detail=f"hz must be within 1..{MAX_PROFILE_HZ}")
+    loop_thread = None if all_threads else threading.get_ident()
+    try:
+        stacks = await asyncio.to_thread(profiler.profile, seconds, hz, loop_thread)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return collapse_stacks(stacks)
+
+
+@app.get("/api/admin/archive/export")
+async def admin_archive_export(x_admin_token: Optional[str] = Header(default=None)):
+    """Stream every archived game as NDJSON without loading the archive into memory"""
+    require_admin(x_admin_token)
+    await game_archive.flush_async()
+    return StreamingResponse(
+        iter_ndjson(game_archive.path),
+        media_type="application/x-ndjson"
+    )
+
+
+@app.post("/api/admin/drain")
+async def admin_drain(x_admin_token: Optional[str] = Header(default=None)):
+    """Start drain mode: hand live games over to the replacement process"""
+    require_admin(x_admin_token)
+    return await drain()
+
+
+@app.post("/api/admin/restore")
+async def admin_restore(x_admin_token: Optional[str] = Header(default=None)):
+    """Take over games from a handover file written by a draining process"""
+    require_admin(x_admin_token)
+    restored = restore_handover()
+    if restored is None:
+        raise HTTPException(status_code=404, detail="No handover file")
+    if "error" in restored:
+        raise HTTPException(status_code=422, detail=restored)
+    return restored
+
+
+async def send_resume(player_id: str) -> None:
+    """Put a reconnecting player back into their live game (e.g. after a handover)"""
+    game = matchmaking_service.get_player_game(player_id)
+    if game and game.state == GameState.PLAYING:
+        connection_manager.add_player_to_game(player_id, game.game_id)
+        await connection_manager.send_personal_message(
+            {
+                "type": "game_update",
+                "game": game.to_dict()
+            },
+            player_id
+        )
+
+
+async def handle_disconnect(player_id: str) -> None:
+    """Drop a player's connection, remove them from matchmaking and notify opponents"""
+    connection_manager.disconnect(player_id)
+    
+    # Games were handed over: the player reconnects to the new process
+    if matchmaking_service.is_draining():
+        return
+    
+    # Disconnecting from a game in progress abandons it
+    game = matchmaking_service.get_player_game(player_id)
+    finished = None
+    if game and game.state == GameState.PLAYING:
+        finished = message_handler.handle_game_finished(game, reason="abandoned", leaver=player_id)
+    
+    matchmaking_service.remove_player(player_id)
+    if game and game.state == GameState.WAITING:
+        # Nobody joined the room yet
+        lobby_service.close_room(game)
+    
+    # Notify other players in the game if any
+    game = matchmaking_service.get_player_game(player_id)
+    if game:
+        await connection_manager.broadcast_to_game(
+            {
+                "type": "player_disconnected",
+                "player_id": player_id,
+                "message": "Opponent disconnected"
+            },
+            game.game_id
+        )
+    
+    if finished is not None:
+        event_bus.publish(finished)
+
+
+def decode_mux_frame(text: str) -> Optional[list]:
+    """Messages of one multiplexed frame (a batch or a single message), None if malformed"""
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    if data.get("type") != "batch":
+        return [data]
+    messages = data.get("messages", [])
+    return messages if isinstance(messages, list) else None
+
+
+async def handle_channel_message(session: MultiplexedSession, message: dict) -> None:
+    """Route one inbound multiplexed message to its player's channel"""
+    player_id = message.get("channel")
+    if not isinstance(player_id, str) or not player_id:
+        session.enqueue(None, {"type": "error", "message": "Missing channel"})
+        return
+    
+    message_type = message.get("type")
+    if message_type == "close_channel":
+        if session.has_channel(player_id):
+            session.close_channel(player_id)
+            await handle_disconnect(player_id)
+        return
+    
+    if not session.has_channel(player_id):
+        # First message on a channel opens it, just like a new socket would
+        connection_manager.register(player_id, session.open_channel(player_id))
+        await connection_manager.send_personal_message(
+            {
+                "type": "connected",
+                "player_id": player_id,
+                "message": "Connected to game server"
+            },
+            player_id
+        )
+        await send_resume(player_id)
+    
+    if message_type == "open_channel":
+        return
+    
+    await message_handler.handle_message(player_id, message)
+
+
+@app.websocket("/ws/leaderboard")
+async def leaderboard_endpoint(websocket: WebSocket):
+    """Receive the top of the leaderboard now and whenever it changes"""
+    await websocket.accept()
+    try:
+        await leaderboard_broadcaster.subscribe(websocket)
+        while True:
+            # Nothing to handle from watchers; this only notices disconnects
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        leaderboard_broadcaster.unsubscribe(websocket)
+
+
+@app.websocket("/ws/mux")
+async def multiplexed_endpoint(websocket: WebSocket, token: Optional[str] = None):
+    """
+    Multiplexed WebSocket endpoint for bots, tournament runners and harnesses
+    One authenticated connection carries many players: every message has a
+    "channel" field with the player_id, outbound messages arrive in batches
+    """
+    if not MUX_TOKEN or token != MUX_TOKEN:
+        await websocket.close(code=POLICY_VIOLATION_CODE)
+        return
+    if matchmaking_service.is_draining():
+        await websocket.close(code=SERVICE_RESTART_CODE)
+        return
+    
+    await websocket.accept()
+    session = MultiplexedSession(websocket)
+    print("✅ Multiplexed session connected")
+    
+    try:
+        while True:
+            text = await websocket.receive_text()
+            with tracer.trace("mux_frame"):
+                with tracer.span("receive_json"):
+                    messages = decode_mux_frame(text)
+                if messages is None:
+                    # A bad frame is the client's bug; the other channels keep running
+                    session.enqueue(None, {"type": "error", "message": "Malformed frame"})
+                    continue
+                for message in messages:
+                    if not isinstance(message, dict):
+                        session.enqueue(None, {"type": "error", "message": "Messages must be JSON objects"})
+                        continue
+                    try:
+                        await handle_channel_message(session, message)
+                    except WebSocketDisconnect:
+                        raise
+                    except Exception as e:
+                        # Contained to the message: the session's other games go on
+                        print(f"❌ Error in multiplexed message: {type(e).__name__}: {e}")
+                        channel = message.get("channel")
+                        session.enqueue(
+                            channel if isinstance(channel, str) else None,
+                            {"type": "error", "message": "Message could not be processed"}
+                        )
+    except WebSocketDisconnect as e:
+        print(f"🔌 Multiplexed session disconnect: {e}")
+    except Exception as e:
+        print(f"❌ Error in multiplexed session: {type(e).__name__}: {e}")
+        import traceback
+        traceback.print_exc()
+    finally:
+        for player_id in session.channels:
+            session.close_channel(player_id)
+            await handle_disconnect(player_id)
+
+
 @app.websocket("/ws/{player_id}")
 async def websocket_endpoint(websocket: WebSocket, player_id: str):
     """
@@ -80,6 +651,11 @@ async def websocket_endpoint(websocket: WebSocket, player_id: str):
     Each player connects with a unique player_id
     """
     print(f"🔌 WebSocket connection attempt from player: {player_id}")
+    if matchmaking_service.is_draining():
+        # Games belong to the replacement process now
+        await websocket.close(code=SERVICE_RESTART_CODE)
+        return
+    
     await connection_manager.connect(websocket, player_id)
     print(f"✅ WebSocket connected for player: {player_id}")
     
@@ -96,36 +672,28 @@ async def websocket_endpoint(websocket: WebSocket, player_id: str):
         )
         print(f"✅ Welcome message sent to {player_id}")
         
+        # Player reconnecting into a live game (e.g. after a handover)
+        await send_resume(player_id)
+        
         # Listen for messages
         print(f"👂 Listening for messages from {player_id}")
         while True:
-            data = await websocket.receive_json()
-            print(f"📩 Received message from {player_id}: {data}")
-            await message_handler.handle_message(player_id, data)
+            # Waiting for the frame is idle time; traces start once it arrives
+            text = await websocket.receive_text()
+            with tracer.trace():
+                with tracer.span("receive_json"):
+                    data = json.loads(text)
+                print(f"📩 Received message from {player_id}: {data}")
+                await message_handler.handle_message(player_id, data)
             
     except WebSocketDisconnect as e:
         print(f"🔌 WebSocket disconnect for {player_id}: {e}")
-        # Handle disconnect
-        connection_manager.disconnect(player_id)
-        matchmaking_service.remove_player(player_id)
-        
-        # Notify other players in the game if any
-        game = matchmaking_service.get_player_game(player_id)
-        if game:
-            await connection_manager.broadcast_to_game(
-                {
-                    "type": "player_disconnected",
-                    "player_id": player_id,
-                    "message": "Opponent disconnected"
-                },
-                game.game_id
-            )
+        await handle_disconnect(player_id)
     except Exception as e:
         print(f"❌ Error in WebSocket connection for {player_id}: {type(e).__name__}: {e}")
         import traceback
         traceback.print_exc()
-        connection_manager.disconnect(player_id)
-        matchmaking_service.remove_player(player_id)
+        await handle_disconnect(player_id)
 
 
 if __name__ == "__main__":
@@ -1,4 +1,13 @@
+from .events import GameFinished, GameStarted, MoveApplied, PieceVanished
 from .game import Game, Player, Move, GameState, CellValue
+from .rules import GameRules, LineTable, CLASSIC_RULES, get_line_table
+from .position import canonical_key, get_symmetries
+from .tournament import RoundResult, Tournament, TournamentFormat, TournamentState
 
-__all__ = ["Game", "Player", "Move", "GameState", "CellValue"]
-
+__all__ = [
+    "Game", "Player", "Move", "GameState", "CellValue",
+    "GameFinished", "GameStarted", "MoveApplied", "PieceVanished",
+    "GameRules", "LineTable", "CLASSIC_RULES", "get_line_table",
+    "canonical_key", "get_symmetries",
+    "RoundResult", "Tournament", "TournamentFormat", "TournamentState",
+]
@@ -0,0 +1,43 @@
+"""
+Game events - Domain layer
+Typed facts published on the event bus when a game changes
+"""
+from typing import TYPE_CHECKING, NamedTuple, Optional
+
+if TYPE_CHECKING:
+    from app.models.game import Game
+
+
+class MoveApplied(NamedTuple):
+    """A piece was placed (late moves forfeited on time are never applied)"""
+    game_id: str
+    player_id: str
+    row: int
+    col: int
+    move_number: int   # 1-based position in the game's move history
+    board_size: int
+
+
+class PieceVanished(NamedTuple):
+    """A player's oldest piece left the board to keep the vanish limit"""
+    game_id: str
+    player_id: str
+    row: int
+    col: int
+    board_size: int
+
+
+class GameStarted(NamedTuple):
+    """The second player joined and the first turn began"""
+    game: "Game"
+
+
+class GameFinished(NamedTuple):
+    """
+    A game ended; game is a copy taken at that moment
+    reason overrides game.finish_reason (e.g. "abandoned" while the game
+    is still playing); leaver is the player who abandoned it
+    """
+    game: "Game"
+    reason: Optional[str] = None
+    leaver: Optional[str] = None
@@ -1,11 +1,17 @@
 """
 Game models - Domain layer following SOLID principles
 """
+import copy
+import time
+from collections import deque
 from enum import Enum
-from typing import List, Optional, Tuple
+from typing import Callable, Deque, Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 
+from app.models.events import GameStarted, MoveApplied, PieceVanished
+from app.models.rules import CLASSIC_RULES, GameRules
+
 
 class CellValue(str, Enum):
     """Possible values for a game cell"""
@@ -49,17 +55,29 @@ class Game:
     Follows Single Responsibility Principle: handles only game state and rules
     """
     
-    def __init__(self, game_id: str):
+    def __init__(self, game_id: str, rules: Optional[GameRules] = None):
         self.game_id: str = game_id
+        self.rules: GameRules = rules or CLASSIC_RULES
+        size = self.rules.board_size
         self.board: List[List[CellValue]] = [
-            [CellValue.EMPTY for _ in range(3)] for _ in range(3)
+            [CellValue.EMPTY for _ in range(size)] for _ in range(size)
         ]
         self.players: List[Player] = []
         self.moves: List[Move] = []
+        # Positions of each player's symbols still on the board, oldest first
+        self._active_pieces: Dict[str, Deque[Tuple[int, int]]] = {}
+        self._occupied_cells: int = 0
+        # Turn clock (wall time, so it survives a process handover)
+        self.turn_started_at: Optional[float] = None
+        self.time_remaining: Dict[str, float] = {}  # Bank left at turn start
         self.state: GameState = GameState.WAITING
         self.current_turn: Optional[str] = None
         self.winner: Optional[str] = None
+        # How the game ended: "win", "draw", "timeout" or "abandoned"
+        self.finish_reason: Optional[str] = None
         self.created_at: datetime = datetime.now()
+        # Receives MoveApplied / PieceVanished / GameStarted (e.g. EventBus.publish)
+        self.event_sink: Optional[Callable[[object], None]] = None
     
     def add_player(self, player_id: str) -> bool:
         """
@@ -77,6 +95,13 @@ class Game:
         if len(self.players) == 2:
             self.state = GameState.PLAYING
             self.current_turn = self.players[0].player_id
+            if self.rules.bank_seconds is not None:
+                self.time_remaining = {
+                    p.player_id: self.rules.bank_seconds for p in self.players
+                }
+            self.turn_started_at = time.time()
+            if self.event_sink is not None:
+                self.event_sink(GameStarted(self))
         
         return True
     
@@ -85,6 +110,7 @@ class Game:
         self.players = [p for p in self.players if p.player_id != player_id]
         if len(self.players) < 2 and self.state == GameState.PLAYING:
             self.state = GameState.FINISHED
+            self.finish_reason = "abandoned"
     
     def get_player_symbol(self, player_id: str) -> Optional[CellValue]:
         """Get the symbol for a player"""
@@ -104,7 +130,8 @@ class Game:
             return False
         
         # Check bounds
-        if not (0 <= row < 3 and 0 <= col < 3):
+        size = self.rules.board_size
+        if not (0 <= row < size and 0 <= col < size):
             return False
         
         # Check if cell is empty
@@ -125,26 +152,39 @@ class Game:
         if symbol is None:
             return False
         
+        # A move arriving after the deadline loses on time instead
+        now = time.time()
+        if self.forfeit_on_time(now):
+            return True
+        if self.rules.bank_seconds is not None:
+            self.time_remaining[player_id] -= now - self.turn_started_at
+        
         # Place the move
         self.board[row][col] = symbol
+        self._occupied_cells += 1
         move = Move(row=row, col=col, player_id=player_id, symbol=symbol)
         self.moves.append(move)
+        self._active_pieces.setdefault(player_id, deque()).append((row, col))
+        if self.event_sink is not None:
+            self.event_sink(MoveApplied(
+                self.game_id, player_id, row, col, len(self.moves), self.rules.board_size
+            ))
         
-        # Apply vanishing rule: if player has more than 3 symbols, remove oldest
-        # This happens BEFORE win check (rule: max 3 symbols even in win)
+        # Apply vanishing rule: if player exceeds the limit, remove oldest
+        # This happens BEFORE win check (rule: limit holds even in win)
         self._apply_vanishing_rule(player_id, symbol)
         
         # Check for winner (after vanishing applied)
-        if self._check_winner(symbol):
+        if self._check_winner(symbol, row, col):
             self.state = GameState.FINISHED
             self.winner = player_id
-            print(f"🏆 Player {player_id} ({symbol.value}) wins!")
+            self.finish_reason = "win"
             return True
         
         # Check for draw (board is full)
         if self._is_board_full():
             self.state = GameState.FINISHED
-            print(f"🤝 Game ended in a draw!")
+            self.finish_reason = "draw"
             return True
         
         # Switch turns
@@ -154,23 +194,20 @@ class Game:
     
     def _apply_vanishing_rule(self, player_id: str, symbol: CellValue) -> None:
         """
-        Apply vanishing rule: each player can have max 3 symbols on board
-        When 4th symbol is placed, the oldest one vanishes
+        Apply vanishing rule: each player can have max vanish_limit symbols on board
+        When one more symbol is placed, the oldest one vanishes
         """
-        # Get all moves by this player
-        player_moves = [
-            move for move in self.moves
-            if move.player_id == player_id
-        ]
+        pieces = self._active_pieces[player_id]
         
-        # If player has more than 3 symbols, remove the oldest one
-        if len(player_moves) > 3:
-            # The move to vanish is the one that was made 3 moves before the current one
-            # e.g. if moves are [1, 2, 3, 4], we want to vanish 1. 
-            # 1 is at index -4.
-            move_to_vanish = player_moves[-4]
-            self.board[move_to_vanish.row][move_to_vanish.col] = CellValue.EMPTY
-            print(f"🔄 Vanishing: {symbol.value} at [{move_to_vanish.row}, {move_to_vanish.col}]")
+        # If player has more symbols than allowed, remove the oldest one
+        if len(pieces) > self.rules.vanish_limit:
+            row, col = pieces.popleft()
+            self.board[row][col] = CellValue.EMPTY
+            self._occupied_cells -= 1
+            if self.event_sink is not None:
+                self.event_sink(PieceVanished(
+                    self.game_id, player_id, row, col, self.rules.board_size
+                ))
     
     def _switch_turn(self) -> None:
         """Switch to the other player's turn"""
@@ -180,56 +217,210 @@ class Game:
         current_index = 0 if self.current_turn == self.players[0].player_id else 1
         next_index = 1 - current_index
         self.current_turn = self.players[next_index].player_id
+        self.turn_started_at = time.time()
     
-    def _check_winner(self, symbol: CellValue) -> bool:
-        """Check if the given symbol has won"""
-        # Check rows
-        for row in self.board:
-            if all(cell == symbol for cell in row):
-                return True
+    def turn_deadline(self) -> Optional[float]:
+        """
+        Get the wall time at which the current player loses on time
+        Returns None if the game is untimed or not in progress
+        """
+        if self.state != GameState.PLAYING or self.turn_started_at is None:
+            return None
+        if self.rules.move_seconds is not None:
+            return self.turn_started_at + self.rules.move_seconds
+        if self.rules.bank_seconds is not None:
+            return self.turn_started_at + self.time_remaining[self.current_turn]
+        return None
+    
+    def forfeit_on_time(self, now: float) -> bool:
+        """
+        Finish the game if the current player's time ran out
+        Returns True if the game was forfeited
+        """
+        deadline = self.turn_deadline()
+        if deadline is None or now < deadline:
+            return False
         
-        # Check columns
-        for col in range(3):
-            if all(self.board[row][col] == symbol for row in range(3)):
-                return True
+        loser = self.current_turn
+        if self.rules.bank_seconds is not None:
+            self.time_remaining[loser] = 0.0
+        self.state = GameState.FINISHED
+        self.finish_reason = "timeout"
+        self.winner = next(
+            (p.player_id for p in self.players if p.player_id != loser), None
+        )
+        print(f"⏰ Player {loser} ran out of time")
+        return True
+    
+    def extend_turn(self, seconds: float) -> None:
+        """Give the current player extra time (e.g. to cover a server restart)"""
+        if self.turn_started_at is not None:
+            self.turn_started_at += seconds
+    
+    def get_time_remaining(self) -> Optional[Dict[str, float]]:
+        """
+        Get seconds left for each player, counting down the current turn
+        Returns None if the game is untimed
+        """
+        if not self.rules.has_clock:
+            return None
         
-        # Check diagonals
-        if all(self.board[i][i] == symbol for i in range(3)):
-            return True
-        if all(self.board[i][2-i] == symbol for i in range(3)):
-            return True
+        if self.rules.move_seconds is not None:
+            remaining = {p.player_id: self.rules.move_seconds for p in self.players}
+        else:
+            remaining = dict(self.time_remaining)
         
+        deadline = self.turn_deadline()
+        if deadline is not None:
+            remaining[self.current_turn] = max(0.0, deadline - time.time())
+        return {
+            player_id: round(seconds, 3) for player_id, seconds in remaining.items()
+        }
+    
+    def _check_winner(self, symbol: CellValue, row: int, col: int) -> bool:
+        """
+        Check if the given symbol has won by placing at (row, col)
+        Only lines through the placed cell can have been completed,
+        so just those are scanned (vanishing never helps the mover)
+        """
+        board = self.board
+        for line in self.rules.lines.cell_lines[row][col]:
+            if all(board[r][c] == symbol for r, c in line):
+                return True
         return False
     
     def _is_board_full(self) -> bool:
         """Check if the board is full"""
-        return all(
-            cell != CellValue.EMPTY 
-            for row in self.board 
-            for cell in row
-        )
+        return self._occupied_cells == self.rules.cell_count
+    
+    def get_active_pieces(self, player_id: str) -> Tuple[Tuple[int, int], ...]:
+        """Get positions of the player's symbols on the board, oldest first"""
+        return tuple(self._active_pieces.get(player_id, ()))
     
     def get_next_vanishing_position(self, player_id: str) -> Optional[Tuple[int, int]]:
         """
         Get the position that will vanish on next move by this player
-        Returns None if player has less than 3 symbols
+        Returns None if player has less than vanish_limit symbols
         """
-        symbol = self.get_player_symbol(player_id)
-        if symbol is None:
-            return None
+        pieces = self._active_pieces.get(player_id)
         
-        # Get all moves by this player
-        player_moves = [
-            move for move in self.moves
-            if move.player_id == player_id
+        # If player is at the limit, next move will vanish the oldest active one
+        if pieces and len(pieces) >= self.rules.vanish_limit:
+            return pieces[0]
+        
+        return None
+    
+    def copy(self) -> "Game":
+        """
+        Copy for readers that run later, e.g. event subscribers
+        Players leaving or moves arriving afterwards do not show up in it.
+        """
+        game = copy.copy(self)
+        game.board = [list(row) for row in self.board]
+        game.players = list(self.players)
+        game.moves = list(self.moves)
+        game._active_pieces = {
+            player_id: deque(pieces) for player_id, pieces in self._active_pieces.items()
+        }
+        game.time_remaining = dict(self.time_remaining)
+        game.event_sink = None
+        return game
+    
+    def to_snapshot(self) -> list:
+        """
+        Convert game to a compact list for process handover
+        The board is not stored: it is rebuilt from the move history.
+        Moves are flattened to row, col, player index, ms since created_at.
+        """
+        player_index = {p.player_id: i for i, p in enumerate(self.players)}
+        created_at = self.created_at.timestamp()
+        moves = []
+        for move in self.moves:
+            moves.extend((
+                move.row,
+                move.col,
+                player_index[move.player_id],
+                int((move.timestamp.timestamp() - created_at) * 1000),
+            ))
+        
+        return [
+            self.game_id,
+            [
+                self.rules.board_size,
+                self.rules.win_length,
+                self.rules.vanish_limit,
+                self.rules.move_seconds,
+                self.rules.bank_seconds,
+            ],
+            self.state.value,
+            self.current_turn,
+            self.winner,
+            created_at,
+            [
+                [p.player_id, p.symbol.value, p.joined_at.timestamp()]
+                for p in self.players
+            ],
+            moves,
+            [
+                self.turn_started_at,
+                [self.time_remaining.get(p.player_id) for p in self.players],
+            ],
         ]
+    
+    @classmethod
+    def from_snapshot(cls, data: list) -> "Game":
+        """Rebuild a game from the output of to_snapshot()"""
+        (game_id, rules, state, current_turn, winner,
+         created_at, players, moves) = data[:8]
+        # Turn clock was added later; older snapshots are untimed
+        clock = data[8] if len(data) > 8 else None
         
-        # If player has 3 or more symbols, next move will vanish the oldest active one
-        if len(player_moves) >= 3:
-            oldest_active_move = player_moves[-3]
-            return (oldest_active_move.row, oldest_active_move.col)
+        game = cls(game_id, GameRules(*rules))
+        game.state = GameState(state)
+        game.current_turn = current_turn
+        game.winner = winner
+        game.created_at = datetime.fromtimestamp(created_at)
+        game.players = [
+            Player(
+                player_id=player_id,
+                symbol=CellValue(symbol),
+                joined_at=datetime.fromtimestamp(joined_at),
+            )
+            for player_id, symbol, joined_at in players
+        ]
         
-        return None
+        # Replay history: only the last vanish_limit pieces of each player remain
+        limit = game.rules.vanish_limit
+        fields = iter(moves)
+        for row, col, index, offset_ms in zip(fields, fields, fields, fields):
+            player = game.players[index]
+            game.moves.append(Move(
+                row=row,
+                col=col,
+                player_id=player.player_id,
+                symbol=player.symbol,
+                timestamp=datetime.fromtimestamp(created_at + offset_ms / 1000),
+            ))
+            pieces = game._active_pieces.setdefault(player.player_id, deque())
+            pieces.append((row, col))
+            if len(pieces) > limit:
+                pieces.popleft()
+        
+        for player in game.players:
+            for row, col in game._active_pieces.get(player.player_id, ()):
+                game.board[row][col] = player.symbol
+                game._occupied_cells += 1
+        
+        if clock:
+            turn_started_at, remaining = clock
+            game.turn_started_at = turn_started_at
+            game.time_remaining = {
+                p.player_id: seconds
+                for p, seconds in zip(game.players, remaining)
+                if seconds is not None
+            }
+        
+        return game
     
     def to_dict(self) -> dict:
         """Convert game state to dictionary for serialization"""
@@ -255,7 +446,10 @@ class Game:
             "state": self.state.value,
             "current_turn": self.current_turn,
             "winner": self.winner,
+            "finish_reason": self.finish_reason,
             "move_count": len(self.moves),
-            "next_vanishing": vanishing_positions
+            "next_vanishing": vanishing_positions,
+            "rules": self.rules.to_dict(),
+            "time_remaining": self.get_time_remaining()
         }
 
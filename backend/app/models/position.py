@@ -0,0 +1,81 @@
+"""
+Position canonicalization - Domain layer
+Maps vanishing tic-tac-toe positions to integer keys shared by all 8 board symmetries
+"""
+from functools import lru_cache
+from typing import Sequence, Tuple
+
+
+# Flat cell index = row * board_size + col
+Cells = Tuple[int, ...]
+
+
+@lru_cache(maxsize=None)
+def get_symmetries(board_size: int) -> Tuple[Tuple[Cells, Cells], ...]:
+    """
+    The 8 symmetries of a square board (dihedral group D4)
+    Each entry is (forward, inverse): forward[cell] is where cell lands
+    """
+    n = board_size
+    maps = (
+        lambda r, c: (r, c),                  # identity
+        lambda r, c: (c, n - 1 - r),          # rotate 90
+        lambda r, c: (n - 1 - r, n - 1 - c),  # rotate 180
+        lambda r, c: (n - 1 - c, r),          # rotate 270
+        lambda r, c: (r, n - 1 - c),          # mirror left-right
+        lambda r, c: (n - 1 - r, c),          # mirror top-bottom
+        lambda r, c: (c, r),                  # transpose
+        lambda r, c: (n - 1 - c, n - 1 - r),  # anti-transpose
+    )
+
+    symmetries = []
+    for transform in maps:
+        forward = [0] * (n * n)
+        inverse = [0] * (n * n)
+        for r in range(n):
+            for c in range(n):
+                tr, tc = transform(r, c)
+                forward[r * n + c] = tr * n + tc
+                inverse[tr * n + tc] = r * n + c
+        symmetries.append((tuple(forward), tuple(inverse)))
+    return tuple(symmetries)
+
+
+@lru_cache(maxsize=64)
+def _cell_weights(board_size: int, vanish_limit: int) -> Tuple[Tuple[int, ...], ...]:
+    """weights[t][cell]: place value of cell after symmetry t, in base 2 * vanish_limit + 1"""
+    base = 2 * vanish_limit + 1
+    powers = [base ** i for i in range(board_size * board_size)]
+    return tuple(
+        tuple(powers[forward[cell]] for cell in range(board_size * board_size))
+        for forward, _ in get_symmetries(board_size)
+    )
+
+
+def canonical_key(
+    board_size: int,
+    vanish_limit: int,
+    mover: Sequence[int],
+    opponent: Sequence[int]
+) -> Tuple[int, int]:
+    """
+    Get the canonical integer key of a position and the symmetry producing it
+    mover/opponent list each side's occupied cells, oldest first.
+    A cell is coded 0 when empty, 1..v for the mover's pieces by age and
+    v+1..2v for the opponent's, so the key captures the vanishing order and
+    is independent of which symbol is to move. The key is the minimum over
+    all 8 symmetries; returns (key, symmetry index).
+    """
+    codes = [(cell, age + 1) for age, cell in enumerate(mover)]
+    codes += [(cell, vanish_limit + age + 1) for age, cell in enumerate(opponent)]
+
+    best_key = -1
+    best_symmetry = 0
+    for index, weights in enumerate(_cell_weights(board_size, vanish_limit)):
+        key = 0
+        for cell, code in codes:
+            key += code * weights[cell]
+        if best_key < 0 or key < best_key:
+            best_key = key
+            best_symmetry = index
+    return best_key, best_symmetry
@@ -0,0 +1,153 @@
+"""
+Game rules - Domain layer
+Parameterizes board size, win length and vanishing limit per game
+"""
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+
+# Directions scanned for winning lines: row, column, diagonal, anti-diagonal
+_DIRECTIONS: Tuple[Tuple[int, int], ...] = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+# A winning line is a tuple of (row, col) positions
+Line = Tuple[Tuple[int, int], ...]
+
+
+@dataclass(frozen=True)
+class GameRules:
+    """
+    Immutable rule set for a single game
+    board_size x board_size board, win_length in a row wins,
+    each player keeps at most vanish_limit symbols on the board.
+    Optional turn clock: move_seconds per move, or a chess-style
+    bank_seconds total per player. Running out of time forfeits.
+    """
+    board_size: int = 3
+    win_length: int = 3
+    vanish_limit: int = 3
+    move_seconds: Optional[float] = None
+    bank_seconds: Optional[float] = None
+
+    MAX_BOARD_SIZE = 15
+    # Piece ages are int8 codes in position analysis
+    MAX_VANISH_LIMIT = 127
+    # Longest turn clock or bank, in seconds
+    MAX_CLOCK_SECONDS = 3600.0
+
+    def __post_init__(self):
+        if not 3 <= self.board_size <= self.MAX_BOARD_SIZE:
+            raise ValueError(
+                f"board_size must be between 3 and {self.MAX_BOARD_SIZE}"
+            )
+        if not 3 <= self.win_length <= self.board_size:
+            raise ValueError("win_length must be between 3 and board_size")
+        if self.vanish_limit < self.win_length:
+            raise ValueError("vanish_limit must be at least win_length")
+        # More pieces than cells would never vanish; also bounds the
+        # number of distinct rule sets queues and caches are keyed by
+        max_vanish_limit = min(self.board_size * self.board_size, self.MAX_VANISH_LIMIT)
+        if self.vanish_limit > max_vanish_limit:
+            raise ValueError(f"vanish_limit must be at most {max_vanish_limit}")
+        if self.move_seconds is not None and self.bank_seconds is not None:
+            raise ValueError("Use either move_seconds or bank_seconds, not both")
+        for name in ("move_seconds", "bank_seconds"):
+            value = getattr(self, name)
+            # Written so that NaN fails too
+            if value is not None and not (
+                math.isfinite(value) and 0 < value <= self.MAX_CLOCK_SECONDS
+            ):
+                raise ValueError(
+                    f"{name} must be positive and at most {self.MAX_CLOCK_SECONDS:g}"
+                )
+    
+    @property
+    def has_clock(self) -> bool:
+        """Check if games under these rules are timed"""
+        return self.move_seconds is not None or self.bank_seconds is not None
+
+    @property
+    def cell_count(self) -> int:
+        """Total number of cells on the board"""
+        return self.board_size * self.board_size
+
+    @property
+    def lines(self) -> "LineTable":
+        """Precomputed winning lines for this board configuration"""
+        return get_line_table(self.board_size, self.win_length)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "GameRules":
+        """
+        Build rules from a client-provided dict
+        Missing keys fall back to the classic 3x3 defaults
+        Raises ValueError on invalid values
+        """
+        try:
+            move_seconds = data.get("move_seconds")
+            bank_seconds = data.get("bank_seconds")
+            return cls(
+                board_size=int(data.get("board_size", cls.board_size)),
+                win_length=int(data.get("win_length", cls.win_length)),
+                vanish_limit=int(data.get("vanish_limit", cls.vanish_limit)),
+                move_seconds=None if move_seconds is None else float(move_seconds),
+                bank_seconds=None if bank_seconds is None else float(bank_seconds),
+            )
+        except (TypeError, AttributeError) as e:
+            raise ValueError(f"Invalid rules: {e}") from e
+
+    def to_dict(self) -> dict:
+        """Convert rules to dictionary for serialization"""
+        return {
+            "board_size": self.board_size,
+            "win_length": self.win_length,
+            "vanish_limit": self.vanish_limit,
+            "move_seconds": self.move_seconds,
+            "bank_seconds": self.bank_seconds,
+        }
+
+
+CLASSIC_RULES = GameRules()
+
+
+class LineTable:
+    """
+    Winning lines for one (board_size, win_length) configuration
+    lines holds every winning line as a tuple of (row, col) positions,
+    cell_lines[row][col] holds only the lines passing through that cell
+    """
+
+    __slots__ = ("board_size", "win_length", "lines", "cell_lines")
+
+    def __init__(self, board_size: int, win_length: int):
+        self.board_size = board_size
+        self.win_length = win_length
+
+        lines = []
+        for row in range(board_size):
+            for col in range(board_size):
+                for d_row, d_col in _DIRECTIONS:
+                    end_row = row + d_row * (win_length - 1)
+                    end_col = col + d_col * (win_length - 1)
+                    if not (0 <= end_row < board_size and 0 <= end_col < board_size):
+                        continue
+                    lines.append(tuple(
+                        (row + d_row * i, col + d_col * i)
+                        for i in range(win_length)
+                    ))
+        self.lines: Tuple[Line, ...] = tuple(lines)
+
+        through = [[[] for _ in range(board_size)] for _ in range(board_size)]
+        for line in self.lines:
+            for row, col in line:
+                through[row][col].append(line)
+        self.cell_lines: Tuple[Tuple[Tuple[Line, ...], ...], ...] = tuple(
+            tuple(tuple(cell) for cell in row) for row in through
+        )
+
+
+@lru_cache(maxsize=None)
+def get_line_table(board_size: int, win_length: int) -> LineTable:
+    """Get the shared line table for a board configuration (cached across games)"""
+    return LineTable(board_size, win_length)
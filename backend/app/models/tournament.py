@@ -0,0 +1,255 @@
+"""
+Tournament models - Domain layer
+Swiss and single-elimination pairing, scoring and standings
+"""
+import math
+from enum import Enum
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.models.rules import CLASSIC_RULES, GameRules
+
+
+class TournamentFormat(str, Enum):
+    """Pairing system"""
+    SWISS = "swiss"
+    KNOCKOUT = "knockout"
+
+
+class TournamentState(str, Enum):
+    """Tournament state enumeration"""
+    REGISTERING = "registering"
+    RUNNING = "running"
+    FINISHED = "finished"
+
+
+class RoundResult(str, Enum):
+    """What recording a game result means for the round"""
+    PENDING = "pending"  # Other games of the round are still running
+    REMATCH = "rematch"  # Knockout draw: the same pair plays again
+    COMPLETE = "complete"  # Last result of the round is in
+
+
+# (X player, O player); O is None for a bye
+Pairing = Tuple[str, Optional[str]]
+
+# How far down the score order Swiss pairing looks for an opponent not met yet
+_SWISS_SEARCH_WINDOW = 32
+
+
+class Tournament:
+    """
+    Tournament model - encapsulates pairing and scoring
+    Knows nothing about Game objects: the service opens a game per pairing
+    and reports each result with the game's ID.
+    Swiss: win 1, draw 0.5, bye 1; ceil(log2(players)) rounds by default.
+    Knockout: seeded bracket, byes go to top seeds, draws are replayed;
+    the number of rounds always follows from the bracket size.
+    """
+
+    def __init__(
+        self,
+        tournament_id: str,
+        format: TournamentFormat,
+        rules: Optional[GameRules] = None,
+        rounds: Optional[int] = None
+    ):
+        self.tournament_id = tournament_id
+        self.format = format
+        self.rules = rules or CLASSIC_RULES
+        self.state = TournamentState.REGISTERING
+        self.round_number = 0
+        self.players: List[str] = []
+        self.scores: Dict[str, float] = {}
+        self._rounds = rounds
+        self._seeds: Dict[str, int] = {}
+        self._opponents: Dict[str, Set[str]] = {}
+        self._x_games: Dict[str, int] = {}
+        self._had_bye: Set[str] = set()
+        # Knockout players still in, in bracket order (None marks a bye)
+        self._bracket: List[Optional[str]] = []
+        self._advancing: Dict[int, str] = {}
+        # game_id -> (X player, O player, bracket slot) for games of the current round
+        self._open_games: Dict[str, Tuple[str, str, int]] = {}
+
+    @property
+    def total_rounds(self) -> int:
+        """Number of rounds the tournament will play"""
+        if self._rounds is not None:
+            return self._rounds
+        return max(1, math.ceil(math.log2(max(2, len(self.players)))))
+
+    def add_player(self, player_id: str) -> None:
+        """Register a player; seeds follow registration order"""
+        if self.state != TournamentState.REGISTERING:
+            raise ValueError("Registration is closed")
+        if player_id in self._seeds:
+            raise ValueError("Already registered")
+        self._seeds[player_id] = len(self.players)
+        self.players.append(player_id)
+        self.scores[player_id] = 0.0
+        self._opponents[player_id] = set()
+        self._x_games[player_id] = 0
+
+    def start(self) -> List[Pairing]:
+        """Close registration and pair the first round"""
+        if self.state != TournamentState.REGISTERING:
+            raise ValueError("Tournament already started")
+        if len(self.players) < 2:
+            raise ValueError("At least 2 players are needed")
+        self.state = TournamentState.RUNNING
+        if self.format == TournamentFormat.KNOCKOUT:
+            self._bracket = self._seeded_bracket()
+            self._rounds = math.ceil(math.log2(len(self.players)))
+        return self._pair_round()
+
+    def open_game(self, game_id: str, pairing: Pairing, slot: int = 0) -> None:
+        """Track the game a pairing plays; slot is its place in the bracket"""
+        player_x, player_o = pairing
+        self._open_games[game_id] = (player_x, player_o, slot)
+        self._x_games[player_x] += 1
+        self._opponents[player_x].add(player_o)
+        self._opponents[player_o].add(player_x)
+
+    def record_result(self, game_id: str, winner: Optional[str]) -> Tuple[RoundResult, Optional[Pairing], int]:
+        """
+        Record the result of an open game (winner None for a draw)
+        Returns (outcome, pairing to replay for a knockout draw, bracket slot)
+        """
+        player_x, player_o, slot = self._open_games.pop(game_id)
+        if self.format == TournamentFormat.KNOCKOUT:
+            if winner is None:
+                return RoundResult.REMATCH, (player_o, player_x), slot
+            self._advancing[slot] = winner
+            self.scores[winner] += 1
+        elif winner is None:
+            self.scores[player_x] += 0.5
+            self.scores[player_o] += 0.5
+        else:
+            self.scores[winner] += 1
+
+        if self._open_games:
+            return RoundResult.PENDING, None, slot
+        return RoundResult.COMPLETE, None, slot
+
+    def next_round(self) -> List[Pairing]:
+        """Pair the next round after a completed one, [] once finished"""
+        if self.format == TournamentFormat.KNOCKOUT:
+            self._bracket = [self._advancing[slot] for slot in sorted(self._advancing)]
+            self._advancing = {}
+            if len(self._bracket) < 2:
+                self.state = TournamentState.FINISHED
+                return []
+        if self.round_number >= self.total_rounds:
+            self.state = TournamentState.FINISHED
+            return []
+        return self._pair_round()
+
+    def standings(self) -> List[dict]:
+        """Players by score, then Buchholz (sum of opponents' scores), then seed"""
+        buchholz = {
+            player_id: sum(self.scores[o] for o in self._opponents[player_id] if o is not None)
+            for player_id in self.players
+        }
+        ordered = sorted(
+            self.players,
+            key=lambda p: (-self.scores[p], -buchholz[p], self._seeds[p])
+        )
+        return [
+            {
+                "rank": rank,
+                "player_id": player_id,
+                "score": self.scores[player_id],
+                "buchholz": buchholz[player_id],
+            }
+            for rank, player_id in enumerate(ordered, start=1)
+        ]
+
+    def to_dict(self) -> dict:
+        """Summary without per-player data"""
+        return {
+            "tournament_id": self.tournament_id,
+            "format": self.format.value,
+            "rules": self.rules.to_dict(),
+            "state": self.state.value,
+            "round": self.round_number,
+            "total_rounds": self.total_rounds,
+            "players": len(self.players),
+            "open_games": len(self._open_games),
+        }
+
+    def _pair_round(self) -> List[Pairing]:
+        self.round_number += 1
+        if self.format == TournamentFormat.KNOCKOUT:
+            return self._pair_knockout()
+        return self._pair_swiss()
+
+    def _pair_swiss(self) -> List[Pairing]:
+        """Pair neighbours in score order, avoiding rematches within a window"""
+        order = sorted(self.players, key=lambda p: (-self.scores[p], self._seeds[p]))
+        pairings: List[Pairing] = []
+
+        if len(order) % 2:
+            # Bye for the lowest placed player who has not had one
+            index = next(
+                (i for i in range(len(order) - 1, -1, -1) if order[i] not in self._had_bye),
+                len(order) - 1
+            )
+            bye = order.pop(index)
+            self._had_bye.add(bye)
+            self.scores[bye] += 1
+            pairings.append((bye, None))
+
+        paired = [False] * len(order)
+        for i, player in enumerate(order):
+            if paired[i]:
+                continue
+            paired[i] = True
+            partner = None
+            first_free = None
+            for j in range(i + 1, len(order)):
+                if paired[j]:
+                    continue
+                if first_free is None:
+                    first_free = j
+                if order[j] not in self._opponents[player]:
+                    partner = j
+                    break
+                if j - i > _SWISS_SEARCH_WINDOW:
+                    break
+            if partner is None:
+                partner = first_free  # Everyone nearby was met already: allow a rematch
+            paired[partner] = True
+            pairings.append(self._colored(player, order[partner]))
+        return pairings
+
+    def _pair_knockout(self) -> List[Pairing]:
+        """Pair bracket neighbours; the i-th pairing plays for bracket slot i"""
+        pairings: List[Pairing] = []
+        for index in range(0, len(self._bracket), 2):
+            player = self._bracket[index]
+            opponent = self._bracket[index + 1]
+            if opponent is None:
+                self._advancing[index // 2] = player
+                pairings.append((player, None))
+            else:
+                pairings.append(self._colored(player, opponent))
+        return pairings
+
+    def _seeded_bracket(self) -> List[Optional[str]]:
+        """
+        Standard seeding (1 v 16, 8 v 9, ...) on the next power of two
+        Missing seeds become byes for the top seeds, so byes never meet
+        """
+        size = 1 << math.ceil(math.log2(len(self.players)))
+        order = [1]
+        while len(order) < size:
+            order = [s for seed in order for s in (seed, 2 * len(order) + 1 - seed)]
+        by_seed = {seed: player for seed, player in enumerate(self.players, start=1)}
+        # The higher seed of a pair always exists, the lower one may be a bye
+        return [by_seed.get(seed) for seed in order]
+
+    def _colored(self, first: str, second: str) -> Pairing:
+        """Give X to whoever has played X less often"""
+        if self._x_games[first] > self._x_games[second]:
+            return second, first
+        return first, second
@@ -1,5 +1,41 @@
+from .analytics_service import AnalyticsService
+from .archive_service import GameArchive
+from .event_bus import BackpressurePolicy, EventBus
 from .game_service import GameService
 from .matchmaking_service import MatchmakingService
+from .handover_service import HandoverService
+from .history_service import MatchHistoryStore
+from .hint_service import HintService, PositionCache
+from .leaderboard_service import LeaderboardService
+from .lobby_service import LobbyService
+from .position_analysis_service import PositionAnalyzer, PositionBatchResult
+from .profiler_service import SamplingProfiler
+from .skip_list import IndexedSkipList
+from .timing_wheel import TimingWheel
+from .tracing_service import Tracer
+from .tournament_service import TournamentRound, TournamentService
+from .turn_clock_service import TurnClockService
 
-__all__ = ["GameService", "MatchmakingService"]
-
+__all__ = [
+    "AnalyticsService",
+    "BackpressurePolicy",
+    "EventBus",
+    "GameArchive",
+    "GameService",
+    "MatchmakingService",
+    "HandoverService",
+    "HintService",
+    "IndexedSkipList",
+    "LeaderboardService",
+    "LobbyService",
+    "MatchHistoryStore",
+    "PositionAnalyzer",
+    "PositionBatchResult",
+    "PositionCache",
+    "SamplingProfiler",
+    "TimingWheel",
+    "TournamentRound",
+    "TournamentService",
+    "Tracer",
+    "TurnClockService",
+]
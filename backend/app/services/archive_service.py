@@ -0,0 +1,366 @@
+"""
+Archive Service - Append-only compressed columnar archive of finished games
+Follows Single Responsibility Principle: handles only storing and reading finished games
+"""
+import asyncio
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+import time
+import zlib
+from array import array
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+from app.models import CellValue, Game
+
+
+# Segment layout: MAGIC, u32 segment length, u32 header length, JSON header, column blobs
+MAGIC = b"VTA1"
+_PREFIX = struct.Struct("<4sII")
+
+OUTCOMES = ("draw", "x", "o")
+REASONS = ("win", "draw", "timeout", "abandoned")
+
+# Column name -> array typecode; text columns are NUL-joined UTF-8
+# Segments record their typecodes; older ones lack them and used _LEGACY_TYPES
+_NUMERIC_COLUMNS = {
+    "outcome": "B",
+    "reason": "B",
+    "rules": "H",
+    "clock": "d",
+    "created_at": "d",
+    "finished_at": "d",
+    "move_offsets": "I",
+    "move_cells": "B",
+    "move_deltas": "I",
+}
+_TEXT_COLUMNS = ("game_id", "player_x", "player_o")
+_LEGACY_TYPES = {**_NUMERIC_COLUMNS, "rules": "B"}
+_TEXT_SEPARATOR = "\x00"
+
+
+class ArchivedGame(NamedTuple):
+    """Compact row captured when a game finishes, independent of the Game object"""
+    game_id: str
+    player_x: str
+    player_o: str
+    outcome: int
+    reason: int
+    rules: tuple
+    clock: tuple       # move_seconds, bank_seconds; NaN where unset
+    created_at: float
+    finished_at: float
+    cells: bytes
+    deltas: array
+
+
+class GameArchive:
+    """
+    Archive of finished games on local disk
+    Finished games are buffered in memory and flushed in batches, each batch
+    becoming one segment with one zlib-compressed column per field, so the
+    move path only pays for an append to a list.
+    """
+
+    def __init__(self, path: str, batch_size: int = 1000):
+        self._path = path
+        self._batch_size = batch_size
+        self._pending: List[ArchivedGame] = []
+        self._rejected = 0
+        self._truncate_torn_tail()
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def pending_count(self) -> int:
+        """Get number of games waiting to be flushed"""
+        return len(self._pending)
+
+    def rejected_count(self) -> int:
+        """Get number of games dropped because they could not be encoded"""
+        return self._rejected
+
+    def record(self, game: Game, reason: Optional[str] = None) -> None:
+        """
+        Capture a finished game for the next flush
+        reason defaults to game.finish_reason; for games ending because a
+        player leaves, call before removing them so both seats are known
+        """
+        reason = reason or game.finish_reason or "abandoned"
+        symbols = {p.symbol: p.player_id for p in game.players}
+        for move in game.moves:
+            symbols.setdefault(move.symbol, move.player_id)
+        winner_symbol = next(
+            (p.symbol for p in game.players if p.player_id == game.winner), None
+        )
+
+        created_at = game.created_at.timestamp()
+        rules = game.rules
+        n = rules.board_size
+        cells = bytes(move.row * n + move.col for move in game.moves)
+        deltas = array("I")
+        previous = created_at
+        for move in game.moves:
+            timestamp = move.timestamp.timestamp()
+            deltas.append(max(0, int((timestamp - previous) * 1000)))
+            previous = timestamp
+
+        self._pending.append(ArchivedGame(
+            game_id=game.game_id,
+            player_x=symbols.get(CellValue.X, ""),
+            player_o=symbols.get(CellValue.O, ""),
+            outcome={CellValue.X: 1, CellValue.O: 2}.get(winner_symbol, 0),
+            reason=REASONS.index(reason),
+            rules=(n, rules.win_length, rules.vanish_limit),
+            clock=tuple(
+                math.nan if seconds is None else seconds
+                for seconds in (rules.move_seconds, rules.bank_seconds)
+            ),
+            created_at=created_at,
+            finished_at=time.time(),
+            cells=cells,
+            deltas=deltas,
+        ))
+
+    def should_flush(self) -> bool:
+        """Check if a full batch is waiting"""
+        return len(self._pending) >= self._batch_size
+
+    def take_pending(self) -> List[ArchivedGame]:
+        """Detach the pending batch (call on the event loop, write elsewhere)"""
+        batch, self._pending = self._pending, []
+        return batch
+
+    def flush(self) -> int:
+        """Write all pending games as one segment, return count written"""
+        return self.write_batch(self.take_pending())
+
+    def write_batch(self, batch: List[ArchivedGame]) -> int:
+        """
+        Append one segment holding batch (safe to run in a worker thread)
+        Games that cannot be encoded are dropped and logged rather than
+        failing the batch; a failed write raises and keeps nothing.
+        """
+        try:
+            segment = _encode_segment(batch)
+        except Exception:
+            batch = self._drop_unencodable(batch)
+            segment = _encode_segment(batch)
+        if not batch:
+            return 0
+
+        # One write per segment; readers ignore a torn tail segment
+        with open(self._path, "ab") as f:
+            f.write(segment)
+            f.flush()
+            os.fsync(f.fileno())
+        return len(batch)
+
+    async def flush_async(self) -> int:
+        """Write pending games from a worker thread, keeping them if the write fails"""
+        batch = self.take_pending()
+        try:
+            return await asyncio.to_thread(self.write_batch, batch)
+        except Exception:
+            # Only I/O errors get here, so the same games can be retried
+            self._pending[:0] = batch
+            raise
+
+    def _drop_unencodable(self, batch: List[ArchivedGame]) -> List[ArchivedGame]:
+        """Keep the games that encode on their own, log the rest"""
+        kept = []
+        for game in batch:
+            try:
+                _encode_segment([game])
+            except Exception as e:
+                self._rejected += 1
+                print(f"❌ Archive dropped game {game.game_id!r}: {type(e).__name__}: {e}")
+            else:
+                kept.append(game)
+        return kept
+
+    async def run(self, interval: float = 5.0) -> None:
+        """Flush every interval seconds, or sooner when a batch fills"""
+        elapsed = 0.0
+        step = min(interval, 0.5)
+        while True:
+            await asyncio.sleep(step)
+            elapsed += step
+            if elapsed < interval and not self.should_flush():
+                continue
+            elapsed = 0.0
+            try:
+                await self.flush_async()
+            except Exception as e:
+                print(f"❌ Failed to archive games: {e}")
+
+    def _truncate_torn_tail(self) -> None:
+        """Cut off a partially written last segment so appends stay readable"""
+        if not os.path.exists(self._path):
+            return
+        size = os.path.getsize(self._path)
+        end = _valid_length(self._path)
+        if end < size:
+            print(f"⚠️ Archive {self._path}: dropping {size - end} bytes of torn tail")
+            with open(self._path, "r+b") as f:
+                f.truncate(end)
+
+
+def _encode_segment(batch: List[ArchivedGame]) -> bytes:
+    """Pack a batch into one segment; raises if a value does not fit its column"""
+    if not batch:
+        return b""
+
+    columns: Dict[str, bytes] = {}
+    for name in _TEXT_COLUMNS:
+        columns[name] = _TEXT_SEPARATOR.join(getattr(g, name) for g in batch).encode()
+
+    numeric = {name: array(code) for name, code in _NUMERIC_COLUMNS.items()}
+    numeric["move_offsets"].append(0)
+    for g in batch:
+        numeric["outcome"].append(g.outcome)
+        numeric["reason"].append(g.reason)
+        numeric["rules"].extend(g.rules)
+        numeric["clock"].extend(g.clock)
+        numeric["created_at"].append(g.created_at)
+        numeric["finished_at"].append(g.finished_at)
+        numeric["move_cells"].frombytes(g.cells)
+        numeric["move_deltas"].extend(g.deltas)
+        numeric["move_offsets"].append(len(numeric["move_cells"]))
+    for name, values in numeric.items():
+        columns[name] = values.tobytes()
+
+    header_columns = {}
+    blobs = []
+    offset = 0
+    for name, raw in columns.items():
+        blob = zlib.compress(raw, 6)
+        header_columns[name] = [offset, len(blob), len(raw)]
+        blobs.append(blob)
+        offset += len(blob)
+
+    header = json.dumps({
+        "count": len(batch),
+        "byteorder": sys.byteorder,
+        "types": _NUMERIC_COLUMNS,
+        "columns": header_columns,
+    }, separators=(",", ":")).encode()
+    body = header + b"".join(blobs)
+    return _PREFIX.pack(MAGIC, _PREFIX.size + len(body), len(header)) + body
+
+
+def _valid_length(path: str) -> int:
+    """Byte length covered by complete segments"""
+    position = 0
+    with open(path, "rb") as f:
+        while True:
+            prefix = f.read(_PREFIX.size)
+            if len(prefix) < _PREFIX.size:
+                return position
+            magic, length, _ = _PREFIX.unpack(prefix)
+            if magic != MAGIC or length < _PREFIX.size:
+                return position
+            f.seek(position + length)
+            if f.tell() > os.fstat(f.fileno()).st_size:
+                return position
+            position += length
+
+
+def iter_segments(path: str) -> Iterator[Dict[str, object]]:
+    """
+    Yield each complete segment as decoded columns, reading through mmap
+    Only one segment's columns are decompressed at a time
+    """
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        position = 0
+        while position + _PREFIX.size <= len(data):
+            magic, length, header_length = _PREFIX.unpack_from(data, position)
+            if magic != MAGIC or position + length > len(data):
+                break  # Torn or foreign tail
+            header_start = position + _PREFIX.size
+            body_start = header_start + header_length
+            header = json.loads(data[header_start:body_start])
+
+            columns: Dict[str, object] = {"count": header["count"]}
+            swap = header["byteorder"] != sys.byteorder
+            types = header.get("types", _LEGACY_TYPES)
+            for name, (offset, blob_length, _) in header["columns"].items():
+                start = body_start + offset
+                raw = zlib.decompress(data[start:start + blob_length])
+                if name in _TEXT_COLUMNS:
+                    columns[name] = raw.decode().split(_TEXT_SEPARATOR)
+                else:
+                    values = array(types[name])
+                    values.frombytes(raw)
+                    if swap:
+                        values.byteswap()
+                    columns[name] = values
+            yield columns
+            position += length
+
+
+def iter_games(path: str) -> Iterator[dict]:
+    """Yield archived games one by one as plain dicts"""
+    for columns in iter_segments(path):
+        offsets = columns["move_offsets"]
+        cells = columns["move_cells"]
+        deltas = columns["move_deltas"]
+        rules = columns["rules"]
+        clock = columns.get("clock")
+        for i in range(columns["count"]):
+            n, k, v = rules[3 * i:3 * i + 3]
+            player_x = columns["player_x"][i]
+            player_o = columns["player_o"][i]
+            outcome = OUTCOMES[columns["outcome"][i]]
+            # Segments written before the clock column did not record it
+            move_seconds, bank_seconds = (
+                (None, None) if clock is None else
+                (None if math.isnan(s) else s for s in clock[2 * i:2 * i + 2])
+            )
+            yield {
+                "game_id": columns["game_id"][i],
+                "players": [player_x, player_o],
+                "winner": {"x": player_x, "o": player_o}.get(outcome),
+                "outcome": outcome,
+                "reason": REASONS[columns["reason"][i]],
+                "rules": {
+                    "board_size": n,
+                    "win_length": k,
+                    "vanish_limit": v,
+                    "move_seconds": move_seconds,
+                    "bank_seconds": bank_seconds,
+                },
+                "created_at": columns["created_at"][i],
+                "finished_at": columns["finished_at"][i],
+                "moves": [
+                    [cells[m] // n, cells[m] % n, deltas[m]]
+                    for m in range(offsets[i], offsets[i + 1])
+                ],
+            }
+
+
+def iter_ndjson(path: str, chunk_size: int = 500) -> Iterator[bytes]:
+    """Stream the archive as NDJSON, chunk_size games per yielded chunk"""
+    lines = []
+    for game in iter_games(path):
+        lines.append(json.dumps(game, separators=(",", ":")))
+        if len(lines) >= chunk_size:
+            yield ("\n".join(lines) + "\n").encode()
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode()
+
+
+if __name__ == "__main__":
+    # Export without the server: python -m app.services.archive_service ARCHIVE > games.ndjson
+    if len(sys.argv) != 2:
+        print("Usage: python -m app.services.archive_service ARCHIVE_PATH", file=sys.stderr)
+        sys.exit(2)
+    for chunk in iter_ndjson(sys.argv[1]):
+        sys.stdout.buffer.write(chunk)
@@ -0,0 +1,206 @@
+"""
+Event Bus - In-process publish/subscribe for game events
+Follows Single Responsibility Principle: handles only getting events from publishers to subscribers
+"""
+import asyncio
+import inspect
+from collections import deque
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+
+# Receives a batch of events, oldest first; may be sync or async
+EventHandler = Callable[[List[Any]], Any]
+
+
+class BackpressurePolicy(str, Enum):
+    """What happens to new events while a subscriber's queue is full"""
+    REPORT = "report"            # Records: shed new events and log each overflow as an error
+    DROP_OLDEST = "drop_oldest"  # Keep the newest events
+    DROP_NEWEST = "drop_newest"  # Keep the queued events, shed new ones
+
+
+class Subscription:
+    """
+    One subscriber: its bounded queue and the task delivering from it
+    The task is started when events arrive and ends when the queue is
+    empty, so an idle subscriber costs nothing.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: EventHandler,
+        event_types: Tuple[type, ...],
+        capacity: int,
+        batch_size: int,
+        policy: BackpressurePolicy
+    ):
+        self.name = name
+        self.event_types = event_types
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.policy = policy
+        self.delivered = 0
+        self.dropped = 0
+        self.failed = 0
+        self._handler = handler
+        self._queue: Deque[Any] = deque()
+        self._task: Optional[asyncio.Task] = None
+        # Set while a REPORT subscriber sheds events, so one overflow logs once
+        self._overflowing = False
+
+    def offer(self, event: Any) -> None:
+        """Queue an event, applying the policy if the queue is full; never waits"""
+        queue = self._queue
+        if len(queue) >= self.capacity:
+            self.dropped += 1
+            if self.policy == BackpressurePolicy.DROP_OLDEST:
+                queue.popleft()
+            else:
+                if self.policy == BackpressurePolicy.REPORT and not self._overflowing:
+                    self._overflowing = True
+                    print(
+                        f"❌ Event subscriber {self.name} is {self.capacity} events behind, "
+                        f"dropping new events until it catches up"
+                    )
+                return
+        queue.append(event)
+        self._ensure_task()
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "events": [event_type.__name__ for event_type in self.event_types],
+            "policy": self.policy.value,
+            "capacity": self.capacity,
+            "queued": len(self._queue),
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+    def _ensure_task(self) -> Optional[asyncio.Task]:
+        task = self._task
+        if self._queue and (task is None or task.done()):
+            task = self._task = asyncio.get_running_loop().create_task(self._deliver())
+        return task
+
+    async def _deliver(self) -> None:
+        queue = self._queue
+        try:
+            while queue:
+                count = min(len(queue), self.batch_size)
+                batch = [queue.popleft() for _ in range(count)]
+                self._overflowing = False
+                try:
+                    result = self._handler(batch)
+                    if inspect.isawaitable(result):
+                        await result
+                    self.delivered += count
+                except Exception as e:
+                    self.failed += count
+                    print(f"❌ Event subscriber {self.name} failed: {type(e).__name__}: {e}")
+                if queue:
+                    # A long backlog must not starve the event loop
+                    await asyncio.sleep(0)
+        finally:
+            self._task = None
+
+
+class EventBus:
+    """
+    Typed in-process event bus
+    publish() appends to one inbox and, if no dispatch is pending, starts
+    one: O(1) whatever the number of subscribers, and it never waits.
+    The dispatch task then fans the inbox out to the bounded queue of every
+    subscriber of each event's type without ever waiting, and each
+    subscriber receives batches on its own task: a slow or stuck one only
+    fills its own queue, where its policy decides what is lost.
+    """
+
+    def __init__(self):
+        self._inbox: Deque[Any] = deque()
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._subscriptions: List[Subscription] = []
+        self._by_type: Dict[type, Tuple[Subscription, ...]] = {}
+        self._published = 0
+
+    def subscribe(
+        self,
+        name: str,
+        handler: EventHandler,
+        event_types: Iterable[type],
+        capacity: int = 1024,
+        batch_size: int = 64,
+        policy: BackpressurePolicy = BackpressurePolicy.REPORT
+    ) -> Subscription:
+        """
+        Deliver events of the given types to handler in batches of up to batch_size
+        At most capacity events wait for the handler; policy decides what
+        happens to more.
+        """
+        if capacity < 1 or batch_size < 1:
+            raise ValueError("capacity and batch_size must be at least 1")
+        subscription = Subscription(
+            name, handler, tuple(event_types), capacity, batch_size, policy
+        )
+        self._subscriptions.append(subscription)
+        for event_type in subscription.event_types:
+            self._by_type[event_type] = self._by_type.get(event_type, ()) + (subscription,)
+        return subscription
+
+    def publish(self, event: Any) -> None:
+        """Queue an event for its subscribers; returns without delivering it"""
+        self._inbox.append(event)
+        self._published += 1
+        task = self._dispatcher
+        if task is None or task.done():
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return  # Dispatched by the next publish or join() inside a loop
+            self._dispatcher = loop.create_task(self._dispatch())
+
+    async def join(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every published event was handled (e.g. before shutdown)
+        Returns False if timeout seconds passed first, e.g. a subscriber is stuck
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while True:
+            tasks = []
+            if self._inbox and (self._dispatcher is None or self._dispatcher.done()):
+                self._dispatcher = loop.create_task(self._dispatch())
+            if self._dispatcher is not None and not self._dispatcher.done():
+                tasks.append(self._dispatcher)
+            for subscription in self._subscriptions:
+                task = subscription._ensure_task()
+                if task is not None and not task.done():
+                    tasks.append(task)
+            if not tasks:
+                return True
+            remaining = None if deadline is None else deadline - loop.time()
+            if remaining is not None and remaining <= 0:
+                return False
+            await asyncio.wait(tasks, timeout=remaining)
+
+    def stats(self) -> dict:
+        """Published count, inbox backlog and every subscriber's queue"""
+        return {
+            "published": self._published,
+            "inbox": len(self._inbox),
+            "subscribers": [subscription.stats() for subscription in self._subscriptions],
+        }
+
+    async def _dispatch(self) -> None:
+        inbox = self._inbox
+        by_type = self._by_type
+        try:
+            while inbox:
+                event = inbox.popleft()
+                for subscription in by_type.get(type(event), ()):
+                    subscription.offer(event)
+        finally:
+            self._dispatcher = None
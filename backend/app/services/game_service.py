@@ -2,28 +2,53 @@
 Game Service - Application layer
 Follows Single Responsibility Principle: manages game instances
 """
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 from uuid import uuid4
 
-from app.models import Game
+from app.models import Game, GameRules
+from app.services.event_bus import EventBus
 
 
 class GameService:
     """
     Service for managing game instances
     Implements Service pattern for business logic
+    Games publish their moves, vanishing pieces and start to event_bus.
     """
     
-    def __init__(self):
+    def __init__(self, event_bus: Optional[EventBus] = None):
         self._games: Dict[str, Game] = {}
+        self._event_sink = event_bus.publish if event_bus is not None else None
     
-    def create_game(self) -> Game:
-        """Create a new game"""
+    def create_game(self, rules: Optional[GameRules] = None) -> Game:
+        """Create a new game (classic 3x3 rules unless given)"""
         game_id = str(uuid4())
-        game = Game(game_id=game_id)
+        game = Game(game_id=game_id, rules=rules)
+        game.event_sink = self._event_sink
         self._games[game_id] = game
         return game
     
+    def create_games(
+        self,
+        pairings: Iterable[Tuple[str, str]],
+        rules: Optional[GameRules] = None
+    ) -> List[Game]:
+        """Create started games for (X player, O player) pairs in one pass"""
+        games = []
+        for player_x, player_o in pairings:
+            game = Game(game_id=str(uuid4()), rules=rules)
+            game.event_sink = self._event_sink
+            game.add_player(player_x)
+            game.add_player(player_o)
+            games.append(game)
+        self._games.update((game.game_id, game) for game in games)
+        return games
+    
+    def add_game(self, game: Game) -> None:
+        """Register an existing game (e.g. one restored from a handover)"""
+        game.event_sink = self._event_sink
+        self._games[game.game_id] = game
+    
     def get_game(self, game_id: str) -> Optional[Game]:
         """Get a game by ID"""
         return self._games.get(game_id)
@@ -35,6 +60,10 @@ class GameService:
             return True
         return False
     
+    def game_count(self) -> int:
+        """Number of games in memory"""
+        return len(self._games)
+    
     def get_all_games(self) -> Dict[str, Game]:
         """Get all games"""
         return self._games.copy()
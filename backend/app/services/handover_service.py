@@ -0,0 +1,157 @@
+"""
+Handover Service - Moves live games between backend processes
+Follows Single Responsibility Principle: handles only drain and restore
+"""
+import gc
+import json
+import os
+import time
+import zlib
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+from app.models import Game, GameState
+from app.services.game_service import GameService
+from app.services.matchmaking_service import MatchmakingService
+
+
+SNAPSHOT_VERSION = 1
+
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    """Skip cyclic GC passes while allocating many small objects in bulk"""
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+class HandoverService:
+    """
+    Service for zero-downtime deploys
+    The old process drains: it stops matchmaking, snapshots every live game
+    into a compressed file and closes its sockets. The new process restores
+    the snapshot, so reconnecting players land back in the same games.
+    """
+    
+    def __init__(
+        self,
+        game_service: GameService,
+        matchmaking_service: MatchmakingService,
+        path: str
+    ):
+        self._game_service = game_service
+        self._matchmaking_service = matchmaking_service
+        self._path = path
+    
+    def snapshot(self) -> bytes:
+        """Serialize all live (not finished) games into a compressed blob"""
+        return self._encode(self._live_games())
+    
+    def _live_games(self) -> list:
+        """Compact snapshots of every game that is not finished"""
+        with _gc_paused():
+            return [
+                game.to_snapshot()
+                for game in self._game_service.get_all_games().values()
+                if game.state != GameState.FINISHED
+            ]
+    
+    def _encode(self, games: list) -> bytes:
+        """Pack game snapshots into the versioned, compressed file format"""
+        payload = json.dumps(
+            {"version": SNAPSHOT_VERSION, "created_at": time.time(), "games": games},
+            separators=(",", ":"),
+        )
+        return zlib.compress(payload.encode(), 1)
+    
+    def load(self, blob: bytes) -> int:
+        """Register games from a snapshot blob, return count of restored games"""
+        games = self._decode(blob)
+        self._register(games)
+        return len(games)
+    
+    def _decode(self, blob: bytes) -> List[Game]:
+        """
+        Rebuild every game of a snapshot without registering any
+        Raises (ValueError, KeyError, zlib.error, ...) if the blob is unusable
+        """
+        data = json.loads(zlib.decompress(blob))
+        if data.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version: {data.get('version')}")
+        
+        # Don't charge players for the time the handover took
+        paused = max(0.0, time.time() - data["created_at"])
+        
+        with _gc_paused():
+            games = [Game.from_snapshot(raw_game) for raw_game in data["games"]]
+            for game in games:
+                game.extend_turn(paused)
+        return games
+    
+    def _register(self, games: List[Game]) -> None:
+        for game in games:
+            self._game_service.add_game(game)
+            self._matchmaking_service.assign_game(game)
+    
+    def drain(self) -> dict:
+        """
+        Enter drain mode and write the handover file
+        Callers must stop serving messages before calling (no awaits inside,
+        so no move can land between the snapshot and the drain flag)
+        """
+        started = time.perf_counter()
+        self._matchmaking_service.start_draining()
+        games = self._live_games()
+        blob = self._encode(games)
+        
+        # Write atomically so the new process never reads a partial file
+        tmp_path = f"{self._path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(blob)
+        os.replace(tmp_path, self._path)
+        
+        return {
+            "path": self._path,
+            "games": len(games),
+            "bytes": len(blob),
+            "seconds": round(time.perf_counter() - started, 4),
+        }
+    
+    def restore(self) -> Optional[dict]:
+        """
+        Take over games from a handover file if one is present
+        The whole file is decoded before any game is registered, and it is
+        removed only after that, so games are restored exactly once. A file
+        that cannot be decoded is renamed aside (the result carries "error")
+        instead of stopping the process from starting.
+        """
+        if not os.path.exists(self._path):
+            return None
+        
+        started = time.perf_counter()
+        with open(self._path, "rb") as f:
+            blob = f.read()
+        try:
+            games = self._decode(blob)
+        except Exception as e:
+            bad_path = f"{self._path}.bad-{int(time.time())}"
+            os.replace(self._path, bad_path)
+            return {
+                "games": 0,
+                "bytes": len(blob),
+                "error": f"{type(e).__name__}: {e}",
+                "moved_to": bad_path,
+            }
+        
+        self._register(games)
+        os.remove(self._path)
+        return {
+            "games": len(games),
+            "bytes": len(blob),
+            "seconds": round(time.perf_counter() - started, 4),
+        }
@@ -0,0 +1,309 @@
+"""
+Hint Service - Suggests moves from a symmetry-aware position cache
+Follows Single Responsibility Principle: handles only position evaluation and caching
+"""
+import asyncio
+import sys
+from collections import OrderedDict
+from functools import lru_cache
+from typing import NamedTuple, Optional, Tuple
+
+from app.models import Game, GameState, canonical_key, get_line_table, get_symmetries
+
+
+# Score of a win found with `depth` plies left; sooner wins score higher
+WIN_SCORE = 100
+
+# (board_size, win_length, vanish_limit, depth, canonical position key)
+CacheKey = Tuple[int, int, int, int, int]
+# (score for the mover, best move as a cell of the canonical position)
+CacheValue = Tuple[int, int]
+
+
+class _HintRequest(NamedTuple):
+    """A position to search, snapshotted from the game on the event loop"""
+    board_size: int
+    win_length: int
+    vanish_limit: int
+    mover: Tuple[int, ...]
+    opponent: Tuple[int, ...]
+    depth: int
+    key: int                      # Canonical position key
+    symmetry: Tuple[Tuple[int, ...], Tuple[int, ...]]
+
+    def cache_key(self, depth: int) -> CacheKey:
+        return (self.board_size, self.win_length, self.vanish_limit, depth, self.key)
+
+
+class _BudgetExceeded(Exception):
+    """The search visited more nodes than it was allowed to"""
+
+
+@lru_cache(maxsize=None)
+def _flat_cell_lines(board_size: int, win_length: int) -> Tuple[Tuple[Tuple[int, ...], ...], ...]:
+    """Winning lines through each flat cell index, as flat cell indices"""
+    table = get_line_table(board_size, win_length)
+    return tuple(
+        tuple(
+            tuple(r * board_size + c for r, c in line)
+            for line in table.cell_lines[cell // board_size][cell % board_size]
+        )
+        for cell in range(board_size * board_size)
+    )
+
+
+class PositionCache:
+    """
+    Bounded LRU cache of position evaluations
+    Tracks hit rate and an estimate of the memory held by its entries
+    """
+
+    def __init__(self, capacity: int = 100_000):
+        self._capacity = capacity
+        self._entries: "OrderedDict[CacheKey, CacheValue]" = OrderedDict()
+        self._entry_bytes = 0
+        self._hits = 0
+        self._misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: CacheKey) -> Optional[CacheValue]:
+        """Look up an evaluation, marking it recently used"""
+        value = self._entries.get(key)
+        if value is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: CacheKey, value: CacheValue) -> None:
+        """Store an evaluation, evicting the least recently used if full"""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return
+        self._entries[key] = value
+        self._entry_bytes += self._size_of(key, value)
+        if len(self._entries) > self._capacity:
+            old_key, old_value = self._entries.popitem(last=False)
+            self._entry_bytes -= self._size_of(old_key, old_value)
+
+    def stats(self) -> dict:
+        """Get hit rate and memory usage"""
+        lookups = self._hits + self._misses
+        return {
+            "entries": len(self._entries),
+            "capacity": self._capacity,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+            "memory_bytes": sys.getsizeof(self._entries) + self._entry_bytes,
+        }
+
+    @staticmethod
+    def _size_of(key: CacheKey, value: CacheValue) -> int:
+        """Approximate bytes held by one entry (tuples and their ints)"""
+        return (
+            sys.getsizeof(key) + sum(sys.getsizeof(part) for part in key)
+            + sys.getsizeof(value) + sum(sys.getsizeof(part) for part in value)
+        )
+
+
+class HintService:
+    """
+    Service for move hints
+    Positions are canonicalized under the 8 board symmetries (including each
+    side's piece age order), so symmetric positions share one cache entry.
+    Misses run an iteratively deepened alpha-beta search that stops after
+    node_budget nodes and answers from the deepest completed depth.
+    """
+
+    def __init__(
+        self,
+        cache: Optional[PositionCache] = None,
+        depth: int = 6,
+        large_board_depth: int = 2,
+        node_budget: int = 50_000
+    ):
+        self._cache = cache or PositionCache()
+        self._depth = depth
+        self._large_board_depth = large_board_depth
+        self._node_budget = node_budget
+
+    def get_hint(self, game: Game, player_id: str) -> Optional[dict]:
+        """
+        Suggest a move for player_id, searching on the calling thread
+        Returns None if it is not the player's turn in a game in progress
+        (or there is no empty cell)
+        """
+        request = self._prepare(game, player_id)
+        if request is None:
+            return None
+        hint = self._cached_hint(request)
+        if hint is None:
+            hint = self._store(request, self._search(request))
+        return hint
+
+    async def get_hint_async(self, game: Game, player_id: str) -> Optional[dict]:
+        """
+        Like get_hint, but a cache miss is searched in a worker thread
+        The game and the cache are only touched on the event loop; returns
+        None if the game moved on while the search ran.
+        """
+        request = self._prepare(game, player_id)
+        if request is None:
+            return None
+        hint = self._cached_hint(request)
+        if hint is not None:
+            return hint
+
+        move_count = len(game.moves)
+        result = await asyncio.to_thread(self._search, request)
+        if (
+            game.state != GameState.PLAYING
+            or game.current_turn != player_id
+            or len(game.moves) != move_count
+        ):
+            return None
+        return self._store(request, result)
+
+    def stats(self) -> dict:
+        """Get cache statistics"""
+        return self._cache.stats()
+
+    def _prepare(self, game: Game, player_id: str) -> Optional[_HintRequest]:
+        """Snapshot the position to search, None if no hint applies"""
+        if game.state != GameState.PLAYING or game.current_turn != player_id:
+            return None
+        opponent_id = next(
+            (p.player_id for p in game.players if p.player_id != player_id), None
+        )
+        if opponent_id is None:
+            return None
+
+        rules = game.rules
+        n = rules.board_size
+        mover = tuple(r * n + c for r, c in game.get_active_pieces(player_id))
+        opponent = tuple(r * n + c for r, c in game.get_active_pieces(opponent_id))
+        key, symmetry = canonical_key(n, rules.vanish_limit, mover, opponent)
+        return _HintRequest(
+            n, rules.win_length, rules.vanish_limit, mover, opponent,
+            self._depth if n == 3 else self._large_board_depth,
+            key, get_symmetries(n)[symmetry]
+        )
+
+    def _cached_hint(self, request: _HintRequest) -> Optional[dict]:
+        cached = self._cache.get(request.cache_key(request.depth))
+        if cached is None:
+            return None
+        score, canonical_move = cached
+        _, inverse = request.symmetry
+        return self._hint(request.board_size, inverse[canonical_move], score, True)
+
+    def _search(self, request: _HintRequest) -> Tuple[int, int, int]:
+        """
+        (score, cell, depth) from the deepest search finished within budget
+        Safe to run in a worker thread: it only reads the request.
+        """
+        # On top of the budget: depth 1 (one node, every empty cell) always fits
+        search = _Search(
+            request.board_size, request.win_length, request.vanish_limit,
+            self._node_budget + request.board_size * request.board_size
+        )
+        result = (0, -1, 0)
+        for depth in range(1, request.depth + 1):
+            try:
+                score, move = search.run(request.mover, request.opponent, depth)
+            except _BudgetExceeded:
+                break
+            result = (score, move, depth)
+        return result
+
+    def _store(self, request: _HintRequest, result: Tuple[int, int, int]) -> Optional[dict]:
+        """Cache a search result under the depth it reached and build the hint"""
+        score, move, depth = result
+        if move < 0:
+            return None
+        forward, _ = request.symmetry
+        self._cache.put(request.cache_key(depth), (score, forward[move]))
+        return self._hint(request.board_size, move, score, False)
+
+    @staticmethod
+    def _hint(board_size: int, move: int, score: int, cached: bool) -> dict:
+        return {
+            "row": move // board_size,
+            "col": move % board_size,
+            "score": score,
+            "cached": cached,
+        }
+
+
+class _Search:
+    """
+    Depth-limited negamax with alpha-beta over (mover, opponent) piece tuples
+    Raises _BudgetExceeded once node_budget child positions were generated
+    across runs
+    """
+
+    def __init__(self, board_size: int, win_length: int, vanish_limit: int, node_budget: int):
+        self._cell_count = board_size * board_size
+        self._cell_lines = _flat_cell_lines(board_size, win_length)
+        self._vanish_limit = vanish_limit
+        self._nodes_left = node_budget
+
+    def run(self, mover: Tuple[int, ...], opponent: Tuple[int, ...], depth: int) -> Tuple[int, int]:
+        """Return (score for the mover, best cell)"""
+        return self._negamax(mover, opponent, depth, -WIN_SCORE * 2, WIN_SCORE * 2)
+
+    def _place(self, pieces: Tuple[int, ...], cell: int) -> Tuple[int, ...]:
+        """Add a piece, dropping the oldest beyond the vanishing limit"""
+        pieces = pieces + (cell,)
+        if len(pieces) > self._vanish_limit:
+            pieces = pieces[1:]
+        return pieces
+
+    def _negamax(
+        self,
+        mover: Tuple[int, ...],
+        opponent: Tuple[int, ...],
+        depth: int,
+        alpha: int,
+        beta: int
+    ) -> Tuple[int, int]:
+        occupied = set(mover)
+        occupied.update(opponent)
+        empties = [c for c in range(self._cell_count) if c not in occupied]
+        if not empties:
+            return 0, -1
+        # Every empty cell is a child position to check, whatever the depth
+        self._nodes_left -= len(empties)
+        if self._nodes_left < 0:
+            raise _BudgetExceeded()
+
+        # Immediate wins end the search at this node; placing a piece
+        # beyond the limit drops the mover's oldest one first
+        owned = set(mover)
+        if len(mover) >= self._vanish_limit:
+            owned.discard(mover[0])
+        for cell in empties:
+            owned.add(cell)
+            if any(map(owned.issuperset, self._cell_lines[cell])):
+                return WIN_SCORE + depth, cell
+            owned.discard(cell)
+
+        if depth <= 1:
+            return 0, empties[0]
+
+        best_score = -WIN_SCORE * 2
+        best_cell = empties[0]
+        for cell in empties:
+            placed = self._place(mover, cell)
+            score = -self._negamax(opponent, placed, depth - 1, -beta, -alpha)[0]
+            if score > best_score:
+                best_score, best_cell = score, cell
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                break
+        return best_score, best_cell
@@ -0,0 +1,242 @@
+"""
+Match History Store - Per-player results in an embedded SQLite database
+Follows Single Responsibility Principle: handles only recording and querying results
+"""
+import queue
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from app.models import Game
+
+
+_SCHEMA = """
+-- One row per seat, game details included, so "last N games for player"
+-- is a single range scan on the key with no join
+CREATE TABLE IF NOT EXISTS player_games (
+    player_id   TEXT NOT NULL,
+    finished_at REAL NOT NULL,
+    game_id     TEXT NOT NULL,
+    opponent_id TEXT NOT NULL,
+    result      INTEGER,  -- 1 win, 0 draw, -1 loss, NULL abandoned
+    reason      TEXT NOT NULL,
+    move_count  INTEGER NOT NULL,
+    PRIMARY KEY (player_id, finished_at, game_id)
+) WITHOUT ROWID;
+-- Covering index for head-to-head records
+CREATE INDEX IF NOT EXISTS idx_player_games_opponent
+    ON player_games (player_id, opponent_id, result);
+-- Totals maintained on insert, so stats are a single-row lookup
+CREATE TABLE IF NOT EXISTS player_totals (
+    player_id TEXT PRIMARY KEY,
+    wins      INTEGER NOT NULL DEFAULT 0,
+    draws     INTEGER NOT NULL DEFAULT 0,
+    losses    INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+"""
+
+# (game_id, player_x, player_o, winner, reason, finished_at, move_count)
+HistoryRow = Tuple[str, str, str, Optional[str], str, float, int]
+
+_STOP = object()
+
+# Page cache of the writer connection
+WRITER_CACHE_KIB = 256 * 1024
+
+
+class MatchHistoryStore:
+    """
+    Store of finished games and per-player results
+    record() only enqueues; a background writer thread commits batches,
+    so no SQLite work happens on the event loop's move path. A batch is
+    whatever is queued when the writer wakes, so batches grow under load
+    and each commit rewrites fewer index pages per game.
+    Reads use one connection per calling thread (WAL allows concurrent readers).
+    """
+
+    def __init__(self, path: str, batch_size: int = 50_000):
+        self._path = path
+        self._batch_size = batch_size
+        self._queue: "queue.Queue" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._local = threading.local()
+
+        connection = self._connect()
+        connection.executescript(_SCHEMA)
+        connection.close()
+
+    def start(self) -> None:
+        """Start the background writer thread"""
+        if self._writer is None:
+            self._writer = threading.Thread(
+                target=self._writer_loop, name="match-history-writer", daemon=True
+            )
+            self._writer.start()
+
+    def stop(self) -> None:
+        """Commit everything queued and stop the writer"""
+        if self._writer is not None:
+            self._queue.put(_STOP)
+            self._writer.join()
+            self._writer = None
+
+    def record(self, game: Game, reason: Optional[str] = None) -> None:
+        """Queue a finished game (call before a leaving player is removed)"""
+        seats = [p.player_id for p in game.players]
+        if len(seats) < 2:
+            return
+        self.record_row((
+            game.game_id,
+            seats[0],
+            seats[1],
+            game.winner,
+            reason or game.finish_reason or "abandoned",
+            time.time(),
+            len(game.moves),
+        ))
+
+    def record_row(self, row: HistoryRow) -> None:
+        """Queue a prepared history row"""
+        self._queue.put(row)
+
+    def pending_count(self) -> int:
+        """Get number of rows waiting for the writer"""
+        return self._queue.qsize()
+
+    def last_games(self, player_id: str, limit: int = 20) -> List[dict]:
+        """Most recent games of a player, newest first"""
+        rows = self._reader().execute(
+            """
+            SELECT game_id, opponent_id, result, finished_at, reason, move_count
+            FROM player_games
+            WHERE player_id = ?
+            ORDER BY finished_at DESC
+            LIMIT ?
+            """,
+            (player_id, limit),
+        ).fetchall()
+        return [
+            {
+                "game_id": game_id,
+                "opponent_id": opponent_id,
+                "result": _result_name(result),
+                "finished_at": finished_at,
+                "reason": reason,
+                "move_count": move_count,
+            }
+            for game_id, opponent_id, result, finished_at, reason, move_count in rows
+        ]
+
+    def totals(self, player_id: str) -> dict:
+        """Win/draw/loss totals of a player"""
+        row = self._reader().execute(
+            "SELECT wins, draws, losses FROM player_totals WHERE player_id = ?",
+            (player_id,),
+        ).fetchone()
+        wins, draws, losses = row or (0, 0, 0)
+        return {"player_id": player_id, "wins": wins, "draws": draws, "losses": losses}
+
+    def head_to_head(self, player_id: str, opponent_id: str) -> dict:
+        """Results of player_id against opponent_id"""
+        counts = dict(self._reader().execute(
+            """
+            SELECT result, COUNT(*) FROM player_games
+            WHERE player_id = ? AND opponent_id = ?
+            GROUP BY result
+            """,
+            (player_id, opponent_id),
+        ).fetchall())
+        return {
+            "player_id": player_id,
+            "opponent_id": opponent_id,
+            "wins": counts.get(1, 0),
+            "draws": counts.get(0, 0),
+            "losses": counts.get(-1, 0),
+            "abandoned": counts.get(None, 0),
+        }
+
+    def iter_totals(self) -> Iterator[Tuple[str, int, int, int]]:
+        """Yield (player_id, wins, draws, losses) for every player"""
+        yield from self._reader().execute(
+            "SELECT player_id, wins, draws, losses FROM player_totals"
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self._path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def _reader(self) -> sqlite3.Connection:
+        """Connection owned by the calling thread"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = self._connect()
+        return connection
+
+    def _writer_loop(self) -> None:
+        connection = self._connect()
+        # Inserts land on random pages of the per-player index; keep them cached
+        connection.execute(f"PRAGMA cache_size={-WRITER_CACHE_KIB}")
+        try:
+            while True:
+                # Block for the first row, then take whatever else is queued
+                batch = [self._queue.get()]
+                while len(batch) < self._batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                stop = any(row is _STOP for row in batch)
+                rows = [row for row in batch if row is not _STOP]
+                if rows:
+                    try:
+                        self._write(connection, rows)
+                    except sqlite3.Error as e:
+                        print(f"❌ Failed to store {len(rows)} games in history: {e}")
+                if stop:
+                    return
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _write(connection: sqlite3.Connection, rows: List[HistoryRow]) -> None:
+        """Insert one batch in a single transaction"""
+        seats = []
+        totals: Dict[str, List[int]] = defaultdict(lambda: [0, 0, 0])
+        for game_id, player_x, player_o, winner, reason, finished_at, move_count in rows:
+            for player, opponent in ((player_x, player_o), (player_o, player_x)):
+                if reason == "abandoned":
+                    result = None
+                elif winner is None:
+                    result = 0
+                else:
+                    result = 1 if winner == player else -1
+                seats.append((
+                    player, finished_at, game_id, opponent, result, reason, move_count
+                ))
+                if result is not None:
+                    totals[player][1 - result] += 1  # wins, draws, losses
+
+        with connection:
+            connection.executemany(
+                "INSERT OR IGNORE INTO player_games VALUES (?, ?, ?, ?, ?, ?, ?)", seats
+            )
+            connection.executemany(
+                """
+                INSERT INTO player_totals (player_id, wins, draws, losses)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (player_id) DO UPDATE SET
+                    wins = wins + excluded.wins,
+                    draws = draws + excluded.draws,
+                    losses = losses + excluded.losses
+                """,
+                [(player, *counts) for player, counts in totals.items()],
+            )
+
+
+def _result_name(result: Optional[int]) -> str:
+    return {1: "win", 0: "draw", -1: "loss"}.get(result, "abandoned")
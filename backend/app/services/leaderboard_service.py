@@ -0,0 +1,165 @@
+"""
+Leaderboard Service - Global player ranking from game outcomes
+Follows Single Responsibility Principle: handles only scoring and ranking players
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.models import Game
+from app.services.skip_list import IndexedSkipList
+
+
+# Ties are broken by who reached the score first: sequence numbers fill the
+# low bits of the ranking key, the negated score the high bits
+_SEQUENCE_BITS = 40
+
+
+class _Standing:
+    __slots__ = ("key", "score", "wins", "draws", "losses")
+
+    def __init__(self):
+        self.key = 0
+        self.score = 0
+        self.wins = 0
+        self.draws = 0
+        self.losses = 0
+
+
+class LeaderboardService:
+    """
+    Live leaderboard kept in an order-statistic skip list
+    Each finished game moves its two players in O(log n); top-N, rank and
+    "players around me" are O(log n + page). The top page is cached and
+    rebuilt only when the version changes, and the version changes only
+    when an update touches the cached page.
+    """
+
+    def __init__(
+        self,
+        win_points: int = 2,
+        draw_points: int = 1,
+        page_size: int = 100,
+        seed: Optional[int] = None
+    ):
+        self._win_points = win_points
+        self._draw_points = draw_points
+        self._page_size = page_size
+        self._ranking = IndexedSkipList(seed)
+        self._standings: Dict[str, _Standing] = {}
+        self._sequence = 0
+        self._version = 0
+        self._top_page: Optional[Tuple[int, List[dict]]] = None
+
+    @property
+    def version(self) -> int:
+        """Changes whenever the cached top page would change"""
+        return self._version
+
+    @property
+    def page_size(self) -> int:
+        return self._page_size
+
+    def __len__(self) -> int:
+        return len(self._standings)
+
+    def record(self, game: Game, reason: Optional[str] = None) -> None:
+        """Score a finished game; abandoned games are not scored"""
+        reason = reason or game.finish_reason or "abandoned"
+        if reason == "abandoned" or len(game.players) < 2:
+            return
+        for player in game.players:
+            if game.winner is None:
+                self.record_result(player.player_id, draws=1)
+            elif game.winner == player.player_id:
+                self.record_result(player.player_id, wins=1)
+            else:
+                self.record_result(player.player_id, losses=1)
+
+    def record_result(self, player_id: str, wins: int = 0, draws: int = 0, losses: int = 0) -> None:
+        """Add results to a player's totals and move them in the ranking"""
+        standing = self._standings.get(player_id)
+        old_rank = None
+        if standing is None:
+            standing = self._standings[player_id] = _Standing()
+        else:
+            old_rank = self._ranking.rank(standing.key)
+
+        standing.wins += wins
+        standing.draws += draws
+        standing.losses += losses
+        score = standing.score + wins * self._win_points + draws * self._draw_points
+
+        if old_rank is None or score != standing.score:
+            if old_rank is not None:
+                self._ranking.remove(standing.key)
+            standing.score = score
+            standing.key = self._next_key(score)
+            self._ranking.insert(standing.key, player_id)
+            new_rank = self._ranking.rank(standing.key)
+        else:
+            new_rank = old_rank  # Only the W/D/L columns changed
+
+        if new_rank < self._page_size or (old_rank is not None and old_rank < self._page_size):
+            self._version += 1
+
+    def load(self, totals: Iterable[Tuple[str, int, int, int]]) -> int:
+        """Rebuild from (player_id, wins, draws, losses) totals, return player count"""
+        self._standings = {}
+        for player_id, wins, draws, losses in totals:
+            standing = self._standings[player_id] = _Standing()
+            standing.wins, standing.draws, standing.losses = wins, draws, losses
+            standing.score = wins * self._win_points + draws * self._draw_points
+
+        # Assign keys in ranking order so the skip list is built in one pass
+        ordered = sorted(self._standings.items(), key=lambda item: -item[1].score)
+        for _, standing in ordered:
+            standing.key = self._next_key(standing.score)
+        self._ranking = IndexedSkipList.from_sorted(
+            (standing.key, player_id) for player_id, standing in ordered
+        )
+        self._version += 1
+        return len(self._standings)
+
+    def top(self, limit: int = 10, offset: int = 0) -> List[dict]:
+        """Leaderboard page; pages within the first page_size ranks are cached"""
+        if offset + limit <= self._page_size:
+            if self._top_page is None or self._top_page[0] != self._version:
+                self._top_page = (self._version, self._page(0, self._page_size))
+            return self._top_page[1][offset:offset + limit]
+        return self._page(offset, limit)
+
+    def standing(self, player_id: str) -> Optional[dict]:
+        """Rank and totals of a player, None if they have no scored games"""
+        standing = self._standings.get(player_id)
+        if standing is None:
+            return None
+        return self._entry(self._ranking.rank(standing.key), player_id)
+
+    def around(self, player_id: str, radius: int = 5) -> List[dict]:
+        """Players ranked up to radius places above and below player_id"""
+        standing = self._standings.get(player_id)
+        if standing is None:
+            return []
+        rank = self._ranking.rank(standing.key)
+        start = max(0, rank - radius)
+        return self._page(start, rank - start + radius + 1)
+
+    def _next_key(self, score: int) -> int:
+        self._sequence += 1
+        return (-score << _SEQUENCE_BITS) + self._sequence
+
+    def _page(self, start: int, count: int) -> List[dict]:
+        return [
+            self._entry(start + i, player_id)
+            for i, (_, player_id) in enumerate(self._ranking.slice(start, count))
+        ]
+
+    def _entry(self, rank: int, player_id: str) -> dict:
+        standing = self._standings[player_id]
+        return {
+            "rank": rank + 1,
+            "player_id": player_id,
+            "score": standing.score,
+            "wins": standing.wins,
+            "draws": standing.draws,
+            "losses": standing.losses,
+        }
@@ -0,0 +1,226 @@
+"""
+Lobby Service - Invite-code rooms and a paginated listing of open and live games
+Follows Single Responsibility Principle: handles only finding games to join or watch
+"""
+import secrets
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.models import Game, GameRules, GameState
+from app.services.game_service import GameService
+from app.services.matchmaking_service import MatchmakingService
+from app.services.skip_list import IndexedSkipList
+
+
+# Invite code characters: no 0/O or 1/I to misread
+CODE_ALPHABET = "ABCDEFGHJKLMNPQRSTUVWXYZ23456789"
+
+# States listed by the lobby, each with its own created_at index
+LISTED_STATES = (GameState.WAITING, GameState.PLAYING)
+
+# Index key: (created_at in microseconds, game_id) so ties stay unique
+LobbyKey = Tuple[int, str]
+
+
+class LobbyService:
+    """
+    Rooms joined by invite code plus a lobby of public games
+    code -> game_id is a plain dict, so resolving a code is O(1). Every
+    public game in a listed state sits in that state's created_at index
+    (an order-statistic skip list); state changes move it between indexes
+    in O(log n). A page is O(log n + limit) from an opaque cursor, and the
+    first page of each state is cached until a change reaches it, so no
+    listing ever walks the whole game table.
+    """
+
+    def __init__(
+        self,
+        game_service: GameService,
+        matchmaking_service: MatchmakingService,
+        page_size: int = 20,
+        code_length: int = 6
+    ):
+        self._game_service = game_service
+        self._matchmaking_service = matchmaking_service
+        self._page_size = page_size
+        self._code_length = code_length
+        self._indexes: Dict[GameState, IndexedSkipList] = {
+            state: IndexedSkipList() for state in LISTED_STATES
+        }
+        # game_id -> (state it is indexed under, index key)
+        self._indexed: Dict[str, Tuple[GameState, LobbyKey]] = {}
+        self._codes: Dict[str, str] = {}
+        self._game_codes: Dict[str, str] = {}
+        self._private: Set[str] = set()
+        self._versions: Dict[GameState, int] = {state: 0 for state in LISTED_STATES}
+        self._first_pages: Dict[GameState, Tuple[int, List[dict]]] = {}
+
+    @property
+    def page_size(self) -> int:
+        return self._page_size
+
+    def create_room(
+        self,
+        player_id: str,
+        rules: Optional[GameRules] = None,
+        private: bool = False
+    ) -> Tuple[Game, str]:
+        """Open a waiting game for player_id, return it with its invite code"""
+        game = self._game_service.create_game(rules)
+        game.add_player(player_id)
+        self._matchmaking_service.assign_game(game)
+
+        code = self._new_code()
+        self._codes[code] = game.game_id
+        self._game_codes[game.game_id] = code
+        if private:
+            self._private.add(game.game_id)
+        self.update(game)
+        return game, code
+
+    def find_room(self, code: str) -> Optional[Game]:
+        """Game waiting behind an invite code (case-insensitive)"""
+        game_id = self._codes.get(code.strip().upper())
+        return self._game_service.get_game(game_id) if game_id else None
+
+    def join_room(
+        self,
+        player_id: str,
+        code: Optional[str] = None,
+        game_id: Optional[str] = None
+    ) -> Game:
+        """
+        Take the free seat of a room, by invite code or, for public rooms, by game ID
+        Raises ValueError if there is no such room or it is not waiting
+        """
+        if code is not None:
+            game = self.find_room(code)
+        elif game_id is not None and game_id not in self._private:
+            game = self._game_service.get_game(game_id)
+        else:
+            game = None
+        if game is None or game.game_id not in self._game_codes:
+            raise ValueError("Room not found")
+        if game.state != GameState.WAITING:
+            raise ValueError("Room is no longer open")
+        if any(p.player_id == player_id for p in game.players):
+            raise ValueError("You are already in this room")
+
+        game.add_player(player_id)
+        self._matchmaking_service.assign_game(game)
+        self._release_code(game.game_id)
+        self.update(game)
+        return game
+
+    def close_room(self, game: Game) -> None:
+        """Drop a waiting room whose creator left"""
+        self.remove(game.game_id)
+        self._game_service.delete_game(game.game_id)
+
+    def update(self, game: Game) -> None:
+        """Re-index a game after it was created or changed state"""
+        game_id = game.game_id
+        current = self._indexed.get(game_id)
+        if current is not None and current[0] == game.state:
+            return
+        if current is not None:
+            self._unindex(game_id)
+        if game.state in self._indexes and game_id not in self._private:
+            key = (int(game.created_at.timestamp() * 1_000_000), game_id)
+            index = self._indexes[game.state]
+            index.insert(key, game_id)
+            self._indexed[game_id] = (game.state, key)
+            self._touch(game.state, index.rank(key))
+
+    def remove(self, game_id: str) -> None:
+        """Forget a game (finished, abandoned or deleted)"""
+        if game_id in self._indexed:
+            self._unindex(game_id)
+        self._release_code(game_id)
+        self._private.discard(game_id)
+
+    def page(
+        self,
+        state: GameState = GameState.WAITING,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> dict:
+        """
+        Oldest first page of public games in state, continuing after cursor
+        Raises ValueError for unlisted states and malformed cursors
+        """
+        if state not in self._indexes:
+            raise ValueError(f"state must be one of {[s.value for s in LISTED_STATES]}")
+        limit = self._page_size if limit is None else limit
+        index = self._indexes[state]
+
+        if cursor is None and limit <= self._page_size:
+            cached = self._first_pages.get(state)
+            if cached is None or cached[0] != self._versions[state]:
+                cached = self._first_pages[state] = (
+                    self._versions[state], self._entries(index, 0, self._page_size + 1)
+                )
+            entries = cached[1][:limit + 1]
+        else:
+            start = 0 if cursor is None else index.bisect_right(_decode_cursor(cursor))
+            entries = self._entries(index, start, limit + 1)
+
+        games = entries[:limit]
+        has_more = len(entries) > limit
+        return {
+            "games": games,
+            "next_cursor": games[-1]["cursor"] if has_more and games else None,
+        }
+
+    def counts(self) -> dict:
+        """Sizes of the lobby indexes and open invite codes"""
+        counts = {state.value: len(index) for state, index in self._indexes.items()}
+        counts["rooms"] = len(self._codes)
+        return counts
+
+    def _entries(self, index: IndexedSkipList, start: int, count: int) -> List[dict]:
+        entries = []
+        for key, game_id in index.slice(start, count):
+            game = self._game_service.get_game(game_id)
+            if game is None:
+                continue
+            entries.append({
+                "game_id": game_id,
+                "code": self._game_codes.get(game_id),
+                "state": game.state.value,
+                "players": [p.player_id for p in game.players],
+                "rules": game.rules.to_dict(),
+                "created_at": game.created_at.isoformat(),
+                "cursor": f"{key[0]}:{key[1]}",
+            })
+        return entries
+
+    def _unindex(self, game_id: str) -> None:
+        state, key = self._indexed.pop(game_id)
+        index = self._indexes[state]
+        self._touch(state, index.rank(key))
+        index.remove(key)
+
+    def _touch(self, state: GameState, rank: int) -> None:
+        """Invalidate the cached first page if a change at rank reaches it"""
+        # One extra entry is cached to know whether a next page exists
+        if rank <= self._page_size:
+            self._versions[state] += 1
+
+    def _release_code(self, game_id: str) -> None:
+        code = self._game_codes.pop(game_id, None)
+        if code is not None:
+            del self._codes[code]
+
+    def _new_code(self) -> str:
+        while True:
+            code = "".join(secrets.choice(CODE_ALPHABET) for _ in range(self._code_length))
+            if code not in self._codes:
+                return code
+
+
+def _decode_cursor(cursor: str) -> Tuple[int, str]:
+    created, _, game_id = cursor.partition(":")
+    try:
+        return int(created), game_id
+    except ValueError:
+        raise ValueError("Malformed cursor") from None
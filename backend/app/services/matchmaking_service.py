@@ -2,10 +2,10 @@
 Matchmaking Service - Manages player queue and game matching
 Follows Single Responsibility Principle: handles only matchmaking logic
 """
-from typing import Optional, Set
+from typing import Dict, Optional
 from queue import Queue
 
-from app.models import Game
+from app.models import CLASSIC_RULES, Game, GameRules
 from app.services.game_service import GameService
 
 
@@ -17,23 +17,34 @@ class MatchmakingService:
     
     def __init__(self, game_service: GameService):
         self._game_service = game_service
-        self._waiting_players: Queue[str] = Queue()
+        # One waiting queue per rule set, players only match within a variant
+        self._waiting_players: Dict[GameRules, Queue[str]] = {}
         self._player_to_game: dict[str, str] = {}
-        self._waiting_set: Set[str] = set()  # For O(1) lookup
+        # Waiting players and the rules they queued for; queue entries of
+        # players who left (or re-queued for other rules) are skipped lazily
+        self._waiting: Dict[str, GameRules] = {}
+        self._draining: bool = False
     
-    def add_player_to_queue(self, player_id: str) -> Optional[Game]:
+    def add_player_to_queue(
+        self,
+        player_id: str,
+        rules: Optional[GameRules] = None
+    ) -> Optional[Game]:
         """
-        Add a player to the matchmaking queue
+        Add a player to the matchmaking queue for the given rules
         Returns a Game if match was found, None if player is waiting
         """
+        rules = rules or CLASSIC_RULES
+
         # Check if player is already in a game
         if player_id in self._player_to_game:
             game_id = self._player_to_game[player_id]
             game = self._game_service.get_game(game_id)
             
-            # If game is finished, remove player and continue to matchmaking
+            # If game is finished (or already cleaned up), remove player
+            # and continue to matchmaking
             from app.models import GameState
-            if game and game.state == GameState.FINISHED:
+            if game is None or game.state == GameState.FINISHED:
                 print(f"🔄 Player {player_id} in finished game, removing...")
                 del self._player_to_game[player_id]
                 # Continue to matchmaking below
@@ -42,16 +53,26 @@ class MatchmakingService:
                 return game
         
         # Check if player is already waiting
-        if player_id in self._waiting_set:
+        if player_id in self._waiting:
             return None
         
         # Try to match with waiting player
-        if not self._waiting_players.empty():
-            waiting_player_id = self._waiting_players.get()
-            self._waiting_set.discard(waiting_player_id)
+        queue = self._waiting_players.setdefault(rules, Queue())
+        waiting_player_id = None
+        while not queue.empty():
+            candidate = queue.get()
+            if self._waiting.get(candidate) == rules:
+                waiting_player_id = candidate
+                break
+        
+        if waiting_player_id is not None:
+            del self._waiting[waiting_player_id]
+            if queue.empty():
+                # Rare variants must not leave a queue behind each
+                del self._waiting_players[rules]
             
             # Create a new game
-            game = self._game_service.create_game()
+            game = self._game_service.create_game(rules)
             
             # Add both players to the game
             game.add_player(waiting_player_id)
@@ -64,14 +85,31 @@ class MatchmakingService:
             return game
         else:
             # No match found, add to queue
-            self._waiting_players.put(player_id)
-            self._waiting_set.add(player_id)
+            queue.put(player_id)
+            self._waiting[player_id] = rules
             return None
     
+    def start_draining(self) -> None:
+        """Stop matching new players (process is handing over its games)"""
+        self._draining = True
+    
+    def is_draining(self) -> bool:
+        """Check if the service stopped accepting new matchmaking"""
+        return self._draining
+    
+    def assign_game(self, game: Game) -> None:
+        """Track every player of an existing game (e.g. after a handover)"""
+        for player in game.players:
+            self._player_to_game[player.player_id] = game.game_id
+    
     def remove_player_from_queue(self, player_id: str) -> None:
         """Remove a player from the waiting queue"""
-        self._waiting_set.discard(player_id)
-        # Note: Can't efficiently remove from Queue, but we check _waiting_set when matching
+        # Its queue entry stays behind and is skipped when matching,
+        # unless it was the only one and the queue can go
+        rules = self._waiting.pop(player_id, None)
+        queue = self._waiting_players.get(rules)
+        if queue is not None and queue.qsize() == 1:
+            del self._waiting_players[rules]
     
     def get_player_game(self, player_id: str) -> Optional[Game]:
         """Get the game a player is in"""
@@ -93,5 +131,5 @@ class MatchmakingService:
     
     def is_player_waiting(self, player_id: str) -> bool:
         """Check if a player is in the waiting queue"""
-        return player_id in self._waiting_set
+        return player_id in self._waiting
 
@@ -0,0 +1,189 @@
+"""
+Position Analysis Service - Vectorized evaluation of many positions at once
+Follows Single Responsibility Principle: handles only static analysis of board positions
+"""
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.models import CLASSIC_RULES, CellValue, Game, GameRules, get_line_table
+
+
+# Side codes used in the winner and to_move columns
+NO_SIDE = 0
+X_SIDE = 1
+O_SIDE = 2
+
+# Positions evaluated per NumPy pass; bounds the (positions x lines x cells) temporaries
+CHUNK_SIZE = 2048
+
+
+@lru_cache(maxsize=None)
+def _line_cells(board_size: int, win_length: int) -> np.ndarray:
+    """Winning lines as a (line count, win_length) array of flat cell indices"""
+    table = get_line_table(board_size, win_length)
+    return np.array(
+        [[r * board_size + c for r, c in line] for line in table.lines],
+        dtype=np.intp
+    )
+
+
+class PositionBatchResult(NamedTuple):
+    """Columnar analysis of a batch; row i describes position i"""
+    board_size: int
+    winner: np.ndarray           # (P,) NO_SIDE, X_SIDE or O_SIDE
+    to_move: np.ndarray          # (P,) X_SIDE or O_SIDE
+    legal_moves: np.ndarray      # (P, cells) bool, empty where the game is over
+    next_vanishing: np.ndarray   # (P, 2) cell of X's / O's piece vanishing on its next move, -1 if none
+    winning_moves: np.ndarray    # (P, 2, cells) bool, cells where X / O would win immediately
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-friendly columns; cell lists hold flat indices (row * board_size + col)"""
+        return {
+            "count": len(self.winner),
+            "board_size": self.board_size,
+            "winner": self.winner.tolist(),
+            "to_move": self.to_move.tolist(),
+            "legal_moves": _cell_lists(self.legal_moves),
+            "next_vanishing": {
+                "x": self.next_vanishing[:, 0].tolist(),
+                "o": self.next_vanishing[:, 1].tolist(),
+            },
+            "winning_moves": {
+                "x": _cell_lists(self.winning_moves[:, 0]),
+                "o": _cell_lists(self.winning_moves[:, 1]),
+            },
+        }
+
+
+class PositionAnalyzer:
+    """
+    Analyzes batches of positions under one rule set
+    A position is a row of board_size**2 int8 codes: 0 for empty, k for X's
+    k-th oldest piece and -k for O's, so the vanishing order is part of the
+    position. All positions are evaluated together with array operations
+    over a (positions x winning lines x cells) view of the boards.
+    """
+
+    def __init__(self, rules: GameRules = CLASSIC_RULES):
+        self._rules = rules
+        self._lines = _line_cells(rules.board_size, rules.win_length)
+
+    def analyze(
+        self,
+        boards: Any,
+        to_move: Optional[Sequence[int]] = None
+    ) -> PositionBatchResult:
+        """
+        Evaluate a batch: boards is anything np.asarray accepts with shape
+        (P, board_size**2). to_move defaults to X when X has no more pieces
+        than O. Raises ValueError on malformed positions.
+        """
+        cell_count = self._rules.cell_count
+        boards = np.asarray(boards)
+        if boards.ndim != 2 or boards.shape[1] != cell_count:
+            raise ValueError(f"boards must have shape (positions, {cell_count})")
+        if not np.issubdtype(boards.dtype, np.integer):
+            raise ValueError("boards must hold integers")
+        v = self._rules.vanish_limit
+        if ((boards > v) | (boards < -v)).any():
+            raise ValueError(f"Piece ages must be within -{v}..{v}")
+        boards = boards.astype(np.int8, copy=False)
+        if to_move is not None:
+            to_move = np.asarray(to_move)
+            if to_move.shape != (len(boards),) or not np.isin(to_move, (X_SIDE, O_SIDE)).all():
+                raise ValueError("to_move must hold 1 (X) or 2 (O) per position")
+            to_move = to_move.astype(np.int8)
+
+        parts = [
+            self._analyze_chunk(
+                boards[start:start + CHUNK_SIZE],
+                None if to_move is None else to_move[start:start + CHUNK_SIZE]
+            )
+            for start in range(0, len(boards), CHUNK_SIZE)
+        ]
+        if not parts:
+            parts = [self._analyze_chunk(boards, to_move)]
+        return PositionBatchResult(
+            self._rules.board_size,
+            *(np.concatenate(column) for column in zip(*parts))
+        )
+
+    def _analyze_chunk(
+        self,
+        boards: np.ndarray,
+        to_move: Optional[np.ndarray]
+    ) -> Tuple[np.ndarray, ...]:
+        rules = self._rules
+        k = rules.win_length
+        v = rules.vanish_limit
+        lines = self._lines
+        self._validate_ages(boards)
+
+        empty = boards == 0
+        counts = np.stack(((boards > 0).sum(axis=1), (boards < 0).sum(axis=1)), axis=1)
+        if to_move is None:
+            to_move = np.where(counts[:, 0] <= counts[:, 1], X_SIDE, O_SIDE).astype(np.int8)
+
+        line_values = boards[:, lines]                  # (P, L, k)
+        line_empty = line_values == 0
+        empties_in_line = line_empty.sum(axis=2)
+
+        wins = np.zeros((len(boards), 2), dtype=bool)
+        next_vanishing = np.full((len(boards), 2), -1, dtype=np.intp)
+        winning_moves = np.zeros((len(boards), 2, rules.cell_count), dtype=bool)
+        for side, sign in enumerate((1, -1)):
+            own_in_line = (np.sign(line_values) == sign).sum(axis=2)
+            wins[:, side] = (own_in_line == k).any(axis=1)
+
+            # At the limit the oldest piece vanishes before the win check
+            at_limit = counts[:, side] >= v
+            oldest = boards == sign
+            next_vanishing[:, side] = np.where(at_limit, oldest.argmax(axis=1), -1)
+            oldest_in_line = (line_values == sign).any(axis=2) & at_limit[:, None]
+
+            threat_lines = (own_in_line == k - 1) & (empties_in_line == 1) & ~oldest_in_line
+            positions, line_index, slot = np.nonzero(threat_lines[:, :, None] & line_empty)
+            winning_moves[positions, side, lines[line_index, slot]] = True
+
+        winner = np.where(wins[:, 0], X_SIDE, np.where(wins[:, 1], O_SIDE, NO_SIDE)).astype(np.int8)
+        over = winner != NO_SIDE
+        legal_moves = empty & ~over[:, None]
+        winning_moves &= ~over[:, None, None]
+        return winner, to_move, legal_moves, next_vanishing, winning_moves
+
+    def _validate_ages(self, boards: np.ndarray) -> None:
+        """Each side's ages must be exactly 1..piece count, each used once"""
+        ages = np.arange(1, self._rules.vanish_limit + 1, dtype=np.int8)
+        for sign in (1, -1):
+            present = (boards[:, :, None] == sign * ages).sum(axis=1)   # (P, v)
+            invalid = (present > 1).any(axis=1) | (np.diff(present, axis=1) > 0).any(axis=1)
+            if invalid.any():
+                bad = np.nonzero(invalid)[0]
+                raise ValueError(
+                    f"Invalid piece ages at positions {bad[:10].tolist()}: "
+                    "each side needs ages 1..count exactly once"
+                )
+
+
+def encode_game(game: Game) -> Tuple[np.ndarray, int]:
+    """Encode a game's position as (board codes, to_move side)"""
+    n = game.rules.board_size
+    board = np.zeros(n * n, dtype=np.int8)
+    for player in game.players:
+        sign = 1 if player.symbol == CellValue.X else -1
+        for age, (row, col) in enumerate(game.get_active_pieces(player.player_id), start=1):
+            board[row * n + col] = sign * age
+    side = X_SIDE
+    for player in game.players:
+        if player.player_id == game.current_turn and player.symbol == CellValue.O:
+            side = O_SIDE
+    return board, side
+
+
+def _cell_lists(mask: np.ndarray) -> List[List[int]]:
+    """Per-row lists of the True column indices of a 2-D mask"""
+    rows, cells = np.nonzero(mask)
+    splits = np.cumsum(np.bincount(rows, minlength=len(mask)))[:-1]
+    return [part.tolist() for part in np.split(cells, splits)]
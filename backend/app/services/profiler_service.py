@@ -0,0 +1,80 @@
+"""
+Profiler Service - On-demand sampling CPU profiler
+Follows Single Responsibility Principle: handles only sampling and folding call stacks
+"""
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional
+
+
+class SamplingProfiler:
+    """
+    Samples the call stacks of running threads from a helper thread
+    Nothing is instrumented: every 1/hz seconds the sampler reads
+    sys._current_frames() and counts each stack, so the profiled code runs
+    unchanged and the cost is one stack walk per sample. Stacks fold into
+    the collapsed format flamegraph.pl and speedscope read. Samples can
+    only be taken when the sampler gets the GIL, so long pure-Python
+    stretches without a GIL switch are undercounted. One profile at a time.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._lock.locked()
+
+    def profile(
+        self,
+        seconds: float,
+        hz: int = 100,
+        thread_id: Optional[int] = None
+    ) -> Dict[str, int]:
+        """
+        Sample for `seconds` (blocking; run it in a worker thread)
+        Returns collapsed stack -> sample count. thread_id limits sampling
+        to one thread, e.g. the event loop's; by default every thread but
+        the sampler is included. Raises RuntimeError if a profile is running.
+        """
+        if not self._lock.acquire(blocking=False):
+            raise RuntimeError("A profile is already running")
+        try:
+            sampler = threading.get_ident()
+            interval = 1.0 / hz
+            stacks: Counter = Counter()
+            deadline = time.perf_counter() + seconds
+            next_sample = time.perf_counter()
+            while next_sample < deadline:
+                names = {thread.ident: thread.name for thread in threading.enumerate()}
+                for ident, frame in sys._current_frames().items():
+                    if ident == sampler or (thread_id is not None and ident != thread_id):
+                        continue
+                    stacks[_collapse(frame, names.get(ident, str(ident)))] += 1
+                next_sample += interval
+                delay = next_sample - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            return dict(stacks)
+        finally:
+            self._lock.release()
+
+
+def collapse_stacks(stacks: Dict[str, int]) -> str:
+    """One "root;...;leaf count" line per stack, the flamegraph input format"""
+    return "".join(f"{stack} {count}\n" for stack, count in sorted(stacks.items()))
+
+
+def _collapse(frame, thread_name: str) -> str:
+    """Frame chain as "thread;module:function;..." from the root down"""
+    labels = []
+    while frame is not None:
+        code = frame.f_code
+        labels.append(f"{frame.f_globals.get('__name__', '?')}:{code.co_qualname}")
+        frame = frame.f_back
+    labels.append(thread_name)
+    labels.reverse()
+    # Spaces separate the count and semicolons the frames
+    return ";".join(label.replace(" ", "_").replace(";", "_") for label in labels)
@@ -0,0 +1,199 @@
+"""
+Indexable Skip List - Ordered map with positional access
+Follows Single Responsibility Principle: keeps keys ranked, knows nothing about players
+"""
+import random
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+
+
+# Enough levels for 4**16 (~4 billion) entries at p = 1/4
+MAX_LEVEL = 16
+_PROMOTE_PROBABILITY = 0.25
+
+
+class _Node:
+    __slots__ = ("key", "value", "next", "width")
+
+    def __init__(self, key: Any, value: Any, level: int):
+        self.key = key
+        self.value = value
+        self.next: List[Optional["_Node"]] = [None] * level
+        # width[level]: positions skipped by following next[level]
+        self.width: List[int] = [1] * level
+
+
+class IndexedSkipList:
+    """
+    Skip list whose links carry widths (an order-statistic skip list)
+    Keys are unique and kept ascending. Insert, remove, rank(key) and
+    select-by-position are O(log n) expected; walking on from a position
+    is O(1) per entry.
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        self._head = _Node(None, None, MAX_LEVEL)
+        self._level = 1
+        self._size = 0
+        self._random = random.Random(seed)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @classmethod
+    def from_sorted(
+        cls,
+        items: Iterable[Tuple[Any, Any]],
+        seed: Optional[int] = None
+    ) -> "IndexedSkipList":
+        """Build in O(n) from (key, value) pairs with strictly ascending keys"""
+        skip_list = cls(seed)
+        head = skip_list._head
+        # Last node linked at each level and its position
+        tails: List[_Node] = [head] * MAX_LEVEL
+        tail_positions = [0] * MAX_LEVEL
+        position = 0
+        for key, value in items:
+            position += 1
+            level_count = skip_list._random_level()
+            node = _Node(key, value, level_count)
+            for level in range(level_count):
+                tail = tails[level]
+                tail.next[level] = node
+                tail.width[level] = position - tail_positions[level]
+                tails[level] = node
+                tail_positions[level] = position
+            if level_count > skip_list._level:
+                skip_list._level = level_count
+        for level in range(MAX_LEVEL):
+            tails[level].width[level] = position + 1 - tail_positions[level]
+        skip_list._size = position
+        return skip_list
+
+    def insert(self, key: Any, value: Any = None) -> None:
+        """Add key (must not be present already)"""
+        update: List[_Node] = [self._head] * MAX_LEVEL
+        positions = [0] * MAX_LEVEL
+        node = self._head
+        position = 0
+        for level in range(self._level - 1, -1, -1):
+            following = node.next[level]
+            while following is not None and following.key < key:
+                position += node.width[level]
+                node = following
+                following = node.next[level]
+            update[level] = node
+            positions[level] = position
+
+        level_count = self._random_level()
+        if level_count > self._level:
+            for level in range(self._level, level_count):
+                # An empty level spans from the head past the last entry
+                self._head.next[level] = None
+                self._head.width[level] = self._size + 1
+            self._level = level_count
+
+        new = _Node(key, value, level_count)
+        for level in range(level_count):
+            previous = update[level]
+            skipped = position - positions[level]
+            new.next[level] = previous.next[level]
+            new.width[level] = previous.width[level] - skipped
+            previous.next[level] = new
+            previous.width[level] = skipped + 1
+        for level in range(level_count, self._level):
+            update[level].width[level] += 1
+        self._size += 1
+
+    def _random_level(self) -> int:
+        level_count = 1
+        while level_count < MAX_LEVEL and self._random.random() < _PROMOTE_PROBABILITY:
+            level_count += 1
+        return level_count
+
+    def remove(self, key: Any) -> Any:
+        """Delete key and return its value, raises KeyError if absent"""
+        update: List[_Node] = [self._head] * MAX_LEVEL
+        node = self._head
+        for level in range(self._level - 1, -1, -1):
+            following = node.next[level]
+            while following is not None and following.key < key:
+                node = following
+                following = node.next[level]
+            update[level] = node
+
+        target = node.next[0]
+        if target is None or target.key != key:
+            raise KeyError(key)
+        for level in range(self._level):
+            previous = update[level]
+            if previous.next[level] is target:
+                previous.width[level] += target.width[level] - 1
+                previous.next[level] = target.next[level]
+            else:
+                previous.width[level] -= 1
+        while self._level > 1 and self._head.next[self._level - 1] is None:
+            self._level -= 1
+        self._size -= 1
+        return target.value
+
+    def rank(self, key: Any) -> int:
+        """Zero-based position of key, raises KeyError if absent"""
+        node = self._head
+        position = 0
+        for level in range(self._level - 1, -1, -1):
+            following = node.next[level]
+            while following is not None and following.key < key:
+                position += node.width[level]
+                node = following
+                following = node.next[level]
+        following = node.next[0]
+        if following is None or following.key != key:
+            raise KeyError(key)
+        return position
+
+    def bisect_right(self, key: Any) -> int:
+        """Number of keys <= key: the position just after key, present or not"""
+        node = self._head
+        position = 0
+        for level in range(self._level - 1, -1, -1):
+            following = node.next[level]
+            while following is not None and following.key <= key:
+                position += node.width[level]
+                node = following
+                following = node.next[level]
+        return position
+
+    def at(self, index: int) -> Tuple[Any, Any]:
+        """(key, value) at zero-based position index"""
+        if not 0 <= index < self._size:
+            raise IndexError(index)
+        return next(self.iter_from(index))
+
+    def iter_from(self, index: int) -> Iterator[Tuple[Any, Any]]:
+        """Yield (key, value) pairs in order starting at position index"""
+        if not 0 <= index < self._size:
+            if index == self._size:
+                return
+            raise IndexError(index)
+        target = index + 1
+        node = self._head
+        position = 0
+        for level in range(self._level - 1, -1, -1):
+            while node.next[level] is not None and position + node.width[level] <= target:
+                position += node.width[level]
+                node = node.next[level]
+        while node is not None:
+            yield node.key, node.value
+            node = node.next[0]
+
+    def slice(self, start: int, count: int) -> List[Tuple[Any, Any]]:
+        """Up to count (key, value) pairs starting at position start"""
+        start = max(0, start)
+        if count <= 0 or start >= self._size:
+            return []
+        result = []
+        for item in self.iter_from(start):
+            result.append(item)
+            if len(result) == count:
+                break
+        return result
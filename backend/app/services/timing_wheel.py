@@ -0,0 +1,111 @@
+"""
+Hierarchical Timing Wheel - Shared deadline scheduler
+Follows Single Responsibility Principle: tracks deadlines, knows nothing about games
+"""
+import math
+import time
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+
+class TimingWheel:
+    """
+    Hierarchical hashed timing wheel
+    Level 0 has one slot per tick, each higher level has slots spanning a full
+    rotation of the level below. Entries start in the coarsest level that fits
+    their delay and cascade down as time advances, so arm, cancel and re-arm
+    are O(1) and advancing costs O(1) per tick plus O(1) per expired entry.
+    """
+
+    def __init__(
+        self,
+        tick: float = 0.1,
+        slots_per_level: Sequence[int] = (256, 64, 64, 64),
+        start: Optional[float] = None
+    ):
+        self._tick = tick
+        self._start = time.time() if start is None else start
+        self._current_tick = 0
+        self._slot_counts: Tuple[int, ...] = tuple(slots_per_level)
+
+        # Ticks covered by one slot of each level, and by a full wheel
+        self._units: List[int] = []
+        unit = 1
+        for count in self._slot_counts:
+            self._units.append(unit)
+            unit *= count
+        self._span = unit
+
+        # levels[level][slot] maps key -> absolute expiry tick
+        self._levels: List[List[Dict[Hashable, int]]] = [
+            [{} for _ in range(count)] for count in self._slot_counts
+        ]
+        # key -> (level, slot) for O(1) cancel
+        self._entries: Dict[Hashable, Tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def arm(self, key: Hashable, deadline: float) -> None:
+        """Schedule key to expire at deadline, replacing any earlier schedule"""
+        self.cancel(key)
+        expiry = math.ceil((deadline - self._start) / self._tick)
+        # Past deadlines fire on the next advance
+        self._place(key, max(expiry, self._current_tick + 1))
+
+    def cancel(self, key: Hashable) -> bool:
+        """Unschedule key, returns False if it was not scheduled"""
+        position = self._entries.pop(key, None)
+        if position is None:
+            return False
+        level, slot = position
+        del self._levels[level][slot][key]
+        return True
+
+    def advance(self, now: float) -> List[Hashable]:
+        """Move the wheel up to now and return keys whose deadline has passed"""
+        target = math.floor((now - self._start) / self._tick)
+        expired: List[Hashable] = []
+
+        while self._current_tick < target:
+            self._current_tick += 1
+            current = self._current_tick
+
+            # Cascade coarser levels first so their entries can land below
+            for level in range(len(self._slot_counts) - 1, 0, -1):
+                unit = self._units[level]
+                if current % unit:
+                    continue
+                slot = (current // unit) % self._slot_counts[level]
+                bucket = self._levels[level][slot]
+                if bucket:
+                    self._levels[level][slot] = {}
+                    for key, expiry in bucket.items():
+                        self._place(key, expiry)
+
+            slot = current % self._slot_counts[0]
+            bucket = self._levels[0][slot]
+            if bucket:
+                self._levels[0][slot] = {}
+                for key in bucket:
+                    del self._entries[key]
+                expired.extend(bucket)
+
+        return expired
+
+    def _place(self, key: Hashable, expiry: int) -> None:
+        """Put key into the coarsest-fitting slot for its absolute expiry tick"""
+        delay = expiry - self._current_tick
+        # Beyond the wheel's span: park in the farthest top slot, re-placed on cascade
+        slot_tick = expiry if delay < self._span else self._current_tick + self._span - 1
+        delay = slot_tick - self._current_tick
+
+        for level, count in enumerate(self._slot_counts):
+            if delay < self._units[level] * count:
+                break
+        slot = (slot_tick // self._units[level]) % count
+
+        self._levels[level][slot][key] = expiry
+        self._entries[key] = (level, slot)
@@ -0,0 +1,150 @@
+"""
+Tournament Service - Runs Swiss and knockout tournaments on top of regular games
+Follows Single Responsibility Principle: handles only tournament lifecycle and round advancement
+"""
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+from uuid import uuid4
+
+from app.models import (
+    Game,
+    GameRules,
+    GameState,
+    RoundResult,
+    Tournament,
+    TournamentFormat,
+    TournamentState,
+)
+from app.services.game_service import GameService
+from app.services.matchmaking_service import MatchmakingService
+
+
+class TournamentRound(NamedTuple):
+    """Games to announce after a tournament event"""
+    tournament: Tournament
+    games: List[Game]     # Newly started games (a round, or one knockout replay)
+    byes: List[str]       # Players sitting this round out
+    finished: bool        # The tournament is over, games and byes are empty
+    # (unfinished game, entrant) for every casual game an entrant must leave
+    displaced: Tuple[Tuple[Game, str], ...] = ()
+
+
+class TournamentService:
+    """
+    Service for managing tournaments
+    Rounds advance on events: the result of a round's last game pairs the
+    next round and creates all of its games at once. A game ID index makes
+    finding the tournament of a finished game O(1), so regular games pay
+    one dictionary miss.
+    """
+
+    def __init__(self, game_service: GameService, matchmaking_service: MatchmakingService):
+        self._game_service = game_service
+        self._matchmaking_service = matchmaking_service
+        self._tournaments: Dict[str, Tournament] = {}
+        # game_id -> tournament_id of every game still waiting for a result
+        self._game_tournament: Dict[str, str] = {}
+
+    def create_tournament(
+        self,
+        format: TournamentFormat,
+        rules: Optional[GameRules] = None,
+        rounds: Optional[int] = None
+    ) -> Tournament:
+        """Create a tournament open for registration"""
+        if rounds is not None and rounds < 1:
+            raise ValueError("rounds must be at least 1")
+        tournament = Tournament(str(uuid4()), format, rules, rounds)
+        self._tournaments[tournament.tournament_id] = tournament
+        return tournament
+
+    def get_tournament(self, tournament_id: str) -> Optional[Tournament]:
+        """Get a tournament by ID"""
+        return self._tournaments.get(tournament_id)
+
+    def register(self, tournament_id: str, player_id: str) -> Tournament:
+        """Add a player to a tournament that has not started"""
+        tournament = self._tournaments.get(tournament_id)
+        if tournament is None:
+            raise ValueError("Unknown tournament")
+        tournament.add_player(player_id)
+        return tournament
+
+    def start(self, tournament_id: str) -> TournamentRound:
+        """Close registration and create the first round's games"""
+        tournament = self._tournaments.get(tournament_id)
+        if tournament is None:
+            raise ValueError("Unknown tournament")
+        return self._open_round(tournament, tournament.start())
+
+    def record_game(
+        self,
+        game: Game,
+        reason: Optional[str] = None,
+        leaver: Optional[str] = None
+    ) -> Optional[TournamentRound]:
+        """
+        Score a finished game if it belongs to a tournament
+        An abandoned game is won by whoever did not leave. Returns the games
+        to announce when this result completes a round (or forces a
+        knockout replay), otherwise None.
+        """
+        tournament_id = self._game_tournament.pop(game.game_id, None)
+        if tournament_id is None:
+            return None
+        tournament = self._tournaments[tournament_id]
+
+        reason = reason or game.finish_reason or "abandoned"
+        winner = game.winner
+        if reason == "abandoned":
+            winner = next(
+                (p.player_id for p in game.players if p.player_id != leaver),
+                None
+            ) if leaver is not None else None
+
+        outcome, replay, slot = tournament.record_result(game.game_id, winner)
+        if outcome == RoundResult.PENDING:
+            return None
+        if outcome == RoundResult.REMATCH:
+            return self._open_round(tournament, [replay], [slot])
+
+        pairings = tournament.next_round()
+        if tournament.state == TournamentState.FINISHED:
+            print(f"🏆 Tournament {tournament_id} finished")
+            return TournamentRound(tournament, [], [], True)
+        return self._open_round(tournament, pairings)
+
+    def _open_round(
+        self,
+        tournament: Tournament,
+        pairings: List[Tuple[str, Optional[str]]],
+        slots: Optional[Sequence[int]] = None
+    ) -> TournamentRound:
+        """
+        Create the games of a pairing list; the i-th pairing plays for slot i
+        Entrants are taken out of the matchmaking queue, and any unfinished
+        game they were still in is returned for the caller to abandon.
+        """
+        if slots is None:
+            slots = range(len(pairings))
+        played = [(pairing, slot) for pairing, slot in zip(pairings, slots) if pairing[1] is not None]
+        byes = [player_x for player_x, player_o in pairings if player_o is None]
+
+        displaced = []
+        for pairing, _ in played:
+            for player_id in pairing:
+                self._matchmaking_service.remove_player_from_queue(player_id)
+                previous = self._matchmaking_service.get_player_game(player_id)
+                if previous is not None and previous.state != GameState.FINISHED:
+                    displaced.append((previous, player_id))
+
+        games = self._game_service.create_games((pairing for pairing, _ in played), tournament.rules)
+        for game, (pairing, slot) in zip(games, played):
+            tournament.open_game(game.game_id, pairing, slot)
+            self._game_tournament[game.game_id] = tournament.tournament_id
+            self._matchmaking_service.assign_game(game)
+
+        print(
+            f"🏁 Tournament {tournament.tournament_id} round {tournament.round_number}: "
+            f"{len(games)} games, {len(byes)} byes"
+        )
+        return TournamentRound(tournament, games, byes, False, tuple(displaced))
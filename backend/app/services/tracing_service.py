@@ -0,0 +1,157 @@
+"""
+Tracing Service - Sampled timing spans along the message path
+Follows Single Responsibility Principle: handles only recording where message handling time goes
+"""
+import itertools
+import random
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+
+# (trace_id, name, start ns, duration ns, wall clock start or None for child spans)
+SpanRecord = Tuple[int, str, int, int, Optional[float]]
+
+
+class _NoopSpan:
+    """Shared span for messages that are not sampled"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class _Span:
+    __slots__ = ("_tracer", "_trace_id", "_name", "_start")
+
+    def __init__(self, tracer: "Tracer", trace_id: int, name: str):
+        self._tracer = tracer
+        self._trace_id = trace_id
+        self._name = name
+
+    def __enter__(self):
+        self._start = self._tracer._clock()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        duration = self._tracer._clock() - self._start
+        self._tracer._spans.append((self._trace_id, self._name, self._start, duration, None))
+        return False
+
+
+class _Trace:
+    """Root span: makes the trace current for everything awaited inside it"""
+    __slots__ = ("_tracer", "_trace_id", "_name", "_start", "_wall", "_token")
+
+    def __init__(self, tracer: "Tracer", trace_id: int, name: str):
+        self._tracer = tracer
+        self._trace_id = trace_id
+        self._name = name
+
+    def __enter__(self):
+        self._token = self._tracer._current.set(self._trace_id)
+        self._wall = time.time()
+        self._start = self._tracer._clock()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        duration = self._tracer._clock() - self._start
+        self._tracer._current.reset(self._token)
+        self._tracer._spans.append((self._trace_id, self._name, self._start, duration, self._wall))
+        return False
+
+
+class Tracer:
+    """
+    Sampled tracing of inbound messages
+    trace() decides once per message whether it is sampled; span() then
+    times a stage of that message. The current trace travels in a
+    ContextVar, so spans nest across awaits without passing IDs around.
+    Unsampled messages get one shared no-op span: a random draw per message
+    and a ContextVar read per span, nothing allocated. Finished spans go to
+    a fixed-size ring buffer, so memory stays bounded at any rate.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = 0.0,
+        capacity: int = 10_000,
+        clock: Callable[[], int] = time.perf_counter_ns,
+        seed: Optional[int] = None
+    ):
+        self._clock = clock
+        self._random = random.Random(seed).random
+        self._spans: Deque[SpanRecord] = deque(maxlen=capacity)
+        self._current: ContextVar[Optional[int]] = ContextVar("trace_id", default=None)
+        self._trace_ids = itertools.count(1)
+        self._sample_rate = 0.0
+        self.set_sample_rate(sample_rate)
+
+    @property
+    def sample_rate(self) -> float:
+        return self._sample_rate
+
+    def set_sample_rate(self, sample_rate: float) -> None:
+        """Share of messages to trace, 0 (off) to 1 (every message)"""
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be between 0 and 1")
+        self._sample_rate = float(sample_rate)
+
+    def trace(self, name: str = "message"):
+        """Context manager around one inbound message; sampled at sample_rate"""
+        rate = self._sample_rate
+        if rate <= 0.0 or (rate < 1.0 and self._random() >= rate):
+            return _NOOP_SPAN
+        return _Trace(self, next(self._trace_ids), name)
+
+    def span(self, name: str):
+        """Context manager timing one stage of the current trace (no-op outside one)"""
+        trace_id = self._current.get()
+        if trace_id is None:
+            return _NOOP_SPAN
+        return _Span(self, trace_id, name)
+
+    def recent(self, limit: int = 50) -> List[dict]:
+        """Newest traces first, spans in start order with offsets from the first one"""
+        traces: Dict[int, List[SpanRecord]] = {}
+        for record in reversed(self._spans):
+            spans = traces.get(record[0])
+            if spans is None:
+                if len(traces) == limit:
+                    break
+                spans = traces[record[0]] = []
+            spans.append(record)
+
+        result = []
+        for trace_id, spans in traces.items():
+            spans.sort(key=lambda record: (record[2], -record[3]))
+            origin = spans[0][2]
+            result.append({
+                "trace_id": trace_id,
+                # None when the root span was already pushed out of the buffer
+                "started_at": next((r[4] for r in spans if r[4] is not None), None),
+                "spans": [
+                    {
+                        "name": name,
+                        "offset_us": round((start - origin) / 1000, 1),
+                        "duration_us": round(duration / 1000, 1),
+                    }
+                    for _, name, start, duration, _ in spans
+                ],
+            })
+        return result
+
+    def stats(self) -> dict:
+        """Sampling settings and ring buffer fill"""
+        return {
+            "sample_rate": self._sample_rate,
+            "capacity": self._spans.maxlen,
+            "buffered_spans": len(self._spans),
+        }
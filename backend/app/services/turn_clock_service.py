@@ -0,0 +1,64 @@
+"""
+Turn Clock Service - Enforces per-move and bank time limits
+Follows Single Responsibility Principle: handles only turn deadlines
+"""
+import asyncio
+import time
+from typing import Awaitable, Callable, List
+
+from app.models import Game
+from app.services.game_service import GameService
+from app.services.timing_wheel import TimingWheel
+
+
+class TurnClockService:
+    """
+    Service for turn timeouts
+    All deadlines share one timing wheel driven by a single task,
+    so there is no asyncio timer per game
+    """
+    
+    def __init__(self, game_service: GameService, tick: float = 0.1):
+        self._game_service = game_service
+        self._tick = tick
+        self._wheel = TimingWheel(tick=tick)
+    
+    def schedule(self, game: Game) -> None:
+        """Arm (or re-arm) the game's turn deadline, cancel it if there is none"""
+        deadline = game.turn_deadline()
+        if deadline is None:
+            self._wheel.cancel(game.game_id)
+        else:
+            self._wheel.arm(game.game_id, deadline)
+    
+    def cancel(self, game_id: str) -> None:
+        """Stop tracking a game's deadline"""
+        self._wheel.cancel(game_id)
+    
+    def scheduled_count(self) -> int:
+        """Get number of games with an armed deadline"""
+        return len(self._wheel)
+    
+    def expire(self, now: float) -> List[Game]:
+        """Forfeit every game whose deadline passed, return the finished games"""
+        forfeited = []
+        for game_id in self._wheel.advance(now):
+            game = self._game_service.get_game(game_id)
+            if game is None:
+                continue
+            if game.forfeit_on_time(now):
+                forfeited.append(game)
+            else:
+                # Deadline moved without a re-arm (e.g. extend_turn)
+                self.schedule(game)
+        return forfeited
+    
+    async def run(self, on_timeout: Callable[[Game], Awaitable[None]]) -> None:
+        """Drive the wheel forever, calling on_timeout for each forfeited game"""
+        while True:
+            await asyncio.sleep(self._tick)
+            for game in self.expire(time.time()):
+                try:
+                    await on_timeout(game)
+                except Exception as e:
+                    print(f"❌ Error handling timeout for {game.game_id}: {e}")
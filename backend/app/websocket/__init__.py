@@ -1,5 +1,13 @@
 from .connection_manager import ConnectionManager
+from .leaderboard_broadcaster import LeaderboardBroadcaster
 from .message_handler import MessageHandler
+from .multiplexer import ChannelConnection, MultiplexedSession
 
-__all__ = ["ConnectionManager", "MessageHandler"]
+__all__ = [
+    "ConnectionManager",
+    "LeaderboardBroadcaster",
+    "MessageHandler",
+    "ChannelConnection",
+    "MultiplexedSession",
+]
 
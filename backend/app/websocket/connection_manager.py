@@ -2,7 +2,7 @@
 WebSocket Connection Manager
 Follows Single Responsibility Principle: manages WebSocket connections
 """
-from typing import Dict, Set
+from typing import Dict, Iterable, Set, Tuple
 from fastapi import WebSocket
 
 
@@ -21,6 +21,13 @@ class ConnectionManager:
     async def connect(self, websocket: WebSocket, player_id: str) -> None:
         """Accept and store a new WebSocket connection"""
         await websocket.accept()
+        self.register(player_id, websocket)
+    
+    def register(self, player_id: str, websocket: WebSocket) -> None:
+        """
+        Store an already accepted connection for a player
+        Anything with async send_json/close works, e.g. a multiplexed channel
+        """
         self._active_connections[player_id] = websocket
     
     def remove_player_from_game(self, player_id: str, game_id: str) -> None:
@@ -68,6 +75,26 @@ class ConnectionManager:
         for player_id in players:
             await self.send_personal_message(message, player_id)
     
+    async def send_many(self, messages: Iterable[Tuple[str, dict]]) -> None:
+        """
+        Send (player_id, message) pairs in one pass
+        Players sharing a message get the same dict, so it is built once.
+        One coroutine walks the batch: a task per message (asyncio.gather)
+        costs far more than the sends themselves at thousands of players.
+        """
+        for player_id, message in messages:
+            await self.send_personal_message(message, player_id)
+    
+    async def close_all(self, code: int, reason: str = "") -> None:
+        """Close every connection (e.g. when handing over to a new process)"""
+        for player_id, websocket in list(self._active_connections.items()):
+            try:
+                await websocket.close(code=code, reason=reason)
+            except Exception:
+                # Connection might be closed already
+                pass
+            self.disconnect(player_id)
+    
     def is_connected(self, player_id: str) -> bool:
         """Check if a player is connected"""
         return player_id in self._active_connections
@@ -0,0 +1,67 @@
+"""
+Leaderboard Broadcaster
+Follows Single Responsibility Principle: pushes leaderboard changes to watching sockets
+"""
+import asyncio
+from typing import Any, Dict, Set
+
+from fastapi import WebSocket
+
+from app.services import LeaderboardService
+
+
+class LeaderboardBroadcaster:
+    """
+    Pushes the top of the leaderboard to subscribed WebSockets
+    Checks the leaderboard version on an interval and sends one message per
+    change, so a burst of finished games costs one push, not one per game.
+    """
+
+    def __init__(self, leaderboard_service: LeaderboardService, size: int = 10):
+        self._leaderboard_service = leaderboard_service
+        self._size = size
+        self._sockets: Set[WebSocket] = set()
+        self._pushed_version = -1
+
+    def subscriber_count(self) -> int:
+        """Get number of watching sockets"""
+        return len(self._sockets)
+
+    def message(self) -> Dict[str, Any]:
+        """Current top of the leaderboard as a push message"""
+        return {
+            "type": "leaderboard",
+            "version": self._leaderboard_service.version,
+            "players": self._leaderboard_service.top(self._size),
+        }
+
+    async def subscribe(self, websocket: WebSocket) -> None:
+        """Send the current leaderboard and watch for changes"""
+        await websocket.send_json(self.message())
+        self._sockets.add(websocket)
+
+    def unsubscribe(self, websocket: WebSocket) -> None:
+        self._sockets.discard(websocket)
+
+    async def push_if_changed(self) -> int:
+        """Push to every subscriber if the leaderboard changed, return sockets sent to"""
+        version = self._leaderboard_service.version
+        if version == self._pushed_version or not self._sockets:
+            return 0
+        self._pushed_version = version
+        message = self.message()
+        sockets = list(self._sockets)
+        results = await asyncio.gather(
+            *(websocket.send_json(message) for websocket in sockets),
+            return_exceptions=True
+        )
+        for websocket, result in zip(sockets, results):
+            if isinstance(result, Exception):
+                self._sockets.discard(websocket)
+        return len(sockets)
+
+    async def run(self, interval: float = 1.0) -> None:
+        """Push changes every interval seconds"""
+        while True:
+            await asyncio.sleep(interval)
+            await self.push_if_changed()
@@ -2,12 +2,50 @@
 WebSocket Message Handler
 Handles incoming WebSocket messages and delegates to appropriate services
 """
-from typing import Dict, Any
+import math
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
-from app.services import GameService, MatchmakingService
+from app.models import (
+    Game,
+    GameFinished,
+    GameRules,
+    GameStarted,
+    GameState,
+    MoveApplied,
+    PieceVanished,
+)
+from app.services import (
+    AnalyticsService,
+    BackpressurePolicy,
+    EventBus,
+    GameArchive,
+    GameService,
+    HintService,
+    LeaderboardService,
+    LobbyService,
+    MatchHistoryStore,
+    MatchmakingService,
+    TournamentRound,
+    TournamentService,
+    Tracer,
+    TurnClockService,
+)
 from app.websocket.connection_manager import ConnectionManager
 
 
+# Final standings rows sent to every entrant when a tournament ends
+TOURNAMENT_STANDINGS_SHOWN = 10
+
+# A player may ask for a hint once per this many seconds, one search at a time
+HINT_COOLDOWN_SECONDS = 1.0
+# Above this many tracked players, expired hint cooldowns are forgotten
+HINT_COOLDOWN_TRACKED = 10_000
+
+# Events a record-keeping subscriber may fall behind by before they are shed
+RECORD_BACKLOG = 65_536
+
+
 class MessageHandler:
     """
     Handles WebSocket messages
@@ -18,33 +56,110 @@ class MessageHandler:
         self,
         game_service: GameService,
         matchmaking_service: MatchmakingService,
-        connection_manager: ConnectionManager
+        connection_manager: ConnectionManager,
+        turn_clock_service: TurnClockService,
+        hint_service: HintService,
+        game_archive: GameArchive,
+        match_history: MatchHistoryStore,
+        leaderboard_service: LeaderboardService,
+        analytics_service: AnalyticsService,
+        tournament_service: TournamentService,
+        lobby_service: LobbyService,
+        event_bus: EventBus,
+        tracer: Tracer
     ):
         self._game_service = game_service
         self._matchmaking_service = matchmaking_service
         self._connection_manager = connection_manager
+        self._turn_clock_service = turn_clock_service
+        self._hint_service = hint_service
+        self._game_archive = game_archive
+        self._match_history = match_history
+        self._leaderboard_service = leaderboard_service
+        self._analytics_service = analytics_service
+        self._tournament_service = tournament_service
+        self._lobby_service = lobby_service
+        self._event_bus = event_bus
+        self._tracer = tracer
+        # player_id -> monotonic time of their next allowed hint
+        self._hint_ready_at: Dict[str, float] = {}
+        self._subscribe_side_effects()
+    
+    def _subscribe_side_effects(self) -> None:
+        """
+        Run everything a move or a finished game triggers beyond the reply
+        to the players as event subscribers, off the move path
+        Records get deep queues and report an error if one still overflows
+        (a stuck subscriber only loses its own events); dashboards and logs
+        shed their oldest events instead.
+        """
+        bus = self._event_bus
+        bus.subscribe("archive", self._archive_games, (GameFinished,), capacity=RECORD_BACKLOG)
+        bus.subscribe("match_history", self._record_history, (GameFinished,), capacity=RECORD_BACKLOG)
+        bus.subscribe("leaderboard", self._record_results, (GameFinished,), capacity=RECORD_BACKLOG)
+        bus.subscribe("lobby", self._index_lobby, (GameStarted, GameFinished), capacity=RECORD_BACKLOG)
+        bus.subscribe(
+            "tournaments", self._score_tournament_games, (GameFinished,), capacity=RECORD_BACKLOG
+        )
+        bus.subscribe(
+            "analytics", self._record_analytics,
+            (MoveApplied, PieceVanished, GameFinished),
+            capacity=16_384, batch_size=1024, policy=BackpressurePolicy.DROP_OLDEST
+        )
+        bus.subscribe(
+            "log", self._log_events,
+            (MoveApplied, PieceVanished, GameFinished),
+            capacity=4096, policy=BackpressurePolicy.DROP_OLDEST
+        )
     
     async def handle_message(self, player_id: str, message: Dict[str, Any]) -> None:
         """
         Process incoming message from a player
         """
-        message_type = message.get("type")
-        
-        if message_type == "join_queue":
-            await self._handle_join_queue(player_id)
-        elif message_type == "make_move":
-            await self._handle_make_move(player_id, message)
-        elif message_type == "leave_game":
-            await self._handle_leave_game(player_id)
-        else:
-            await self._send_error(player_id, f"Unknown message type: {message_type}")
+        with self._tracer.span("handle_message"):
+            message_type = message.get("type")
+            
+            # While draining, games are being handed over to a new process
+            if self._matchmaking_service.is_draining():
+                await self._send_error(player_id, "Server is restarting, reconnecting...")
+                return
+            
+            if message_type == "join_queue":
+                await self._handle_join_queue(player_id, message)
+            elif message_type == "make_move":
+                await self._handle_make_move(player_id, message)
+            elif message_type == "leave_game":
+                await self._handle_leave_game(player_id)
+            elif message_type == "request_hint":
+                await self._handle_request_hint(player_id)
+            elif message_type == "join_tournament":
+                await self._handle_join_tournament(player_id, message)
+            elif message_type == "create_room":
+                await self._handle_create_room(player_id, message)
+            elif message_type == "join_room":
+                await self._handle_join_room(player_id, message)
+            else:
+                await self._send_error(player_id, f"Unknown message type: {message_type}")
     
-    async def _handle_join_queue(self, player_id: str) -> None:
+    async def _handle_join_queue(
+        self,
+        player_id: str,
+        message: Dict[str, Any]
+    ) -> None:
         """Handle player joining matchmaking queue"""
-        game = self._matchmaking_service.add_player_to_queue(player_id)
+        rules = None
+        if message.get("rules") is not None:
+            try:
+                rules = GameRules.from_dict(message["rules"])
+            except ValueError as e:
+                await self._send_error(player_id, str(e))
+                return
+        
+        game = self._matchmaking_service.add_player_to_queue(player_id, rules)
         
         if game:
-            # Match found! Notify both players
+            # Match found! Start the turn clock and notify both players
+            self._turn_clock_service.schedule(game)
             self._connection_manager.add_player_to_game(player_id, game.game_id)
             
             # Find the other player
@@ -85,41 +200,48 @@ class MessageHandler:
         if row is None or col is None:
             await self._send_error(player_id, "Invalid move: missing row or col")
             return
+        if type(row) is not int or type(col) is not int:
+            await self._send_error(player_id, "Invalid move: row and col must be integers")
+            return
         
         game = self._matchmaking_service.get_player_game(player_id)
         if not game:
             await self._send_error(player_id, "You are not in a game")
             return
         
-        print(f"🎯 Player {player_id} attempting move at [{row}, {col}]")
-        
         # Attempt to make the move
-        success = game.make_move(row, col, player_id)
+        with self._tracer.span("make_move"):
+            success = game.make_move(row, col, player_id)
         
         if success:
-            print(f"✅ Move successful! Game state: {game.state.value}")
+            # Re-arm the clock for the next player (cancelled once finished)
+            self._turn_clock_service.schedule(game)
             
             # Broadcast updated game state to all players
-            await self._connection_manager.broadcast_to_game(
-                {
-                    "type": "game_update",
-                    "game": game.to_dict()
-                },
-                game.game_id
-            )
-            
-            # Check if game is finished
-            from app.models import GameState
-            if game.state == GameState.FINISHED:
-                print(f"🎮 Game finished! Winner: {game.winner}")
+            with self._tracer.span("to_dict"):
+                state = game.to_dict()
+            with self._tracer.span("broadcast_to_game"):
                 await self._connection_manager.broadcast_to_game(
                     {
-                        "type": "game_over",
-                        "game": game.to_dict(),
-                        "winner": game.winner
+                        "type": "game_update",
+                        "game": state
                     },
                     game.game_id
                 )
+            
+            # Check if game is finished
+            if game.state == GameState.FINISHED:
+                finished = self.handle_game_finished(game)
+                with self._tracer.span("broadcast_to_game"):
+                    await self._connection_manager.broadcast_to_game(
+                        {
+                            "type": "game_over",
+                            "game": state,
+                            "winner": game.winner
+                        },
+                        game.game_id
+                    )
+                self._event_bus.publish(finished)
         else:
             print(f"❌ Move failed for player {player_id}")
             await self._send_error(player_id, "Invalid move")
@@ -127,8 +249,13 @@ class MessageHandler:
     async def _handle_leave_game(self, player_id: str) -> None:
         """Handle player leaving game"""
         game = self._matchmaking_service.get_player_game(player_id)
+        finished = None
         
         if game:
+            # Leaving a game in progress abandons it
+            if game.state == GameState.PLAYING:
+                finished = self.handle_game_finished(game, reason="abandoned", leaver=player_id)
+            
             # First, remove the leaving player from the game's broadcast group
             # This prevents them from receiving their own "player_left" message
             self._connection_manager.remove_player_from_game(player_id, game.game_id)
@@ -145,7 +272,303 @@ class MessageHandler:
         
         # Only remove from matchmaking/game, keep connection open!
         self._matchmaking_service.remove_player(player_id)
+        if game:
+            self._turn_clock_service.cancel(game.game_id)
+            if game.state == GameState.WAITING:
+                # Nobody joined the room yet
+                self._lobby_service.close_room(game)
         # self._connection_manager.disconnect(player_id)  <-- DO NOT DISCONNECT SOCKET
+        if finished is not None:
+            self._event_bus.publish(finished)
+    
+    async def _handle_request_hint(self, player_id: str) -> None:
+        """Handle player asking for a suggested move"""
+        game = self._matchmaking_service.get_player_game(player_id)
+        if not game:
+            await self._send_error(player_id, "You are not in a game")
+            return
+        
+        now = time.monotonic()
+        if self._hint_ready_at.get(player_id, 0.0) > now:
+            await self._send_error(player_id, "Too many hint requests, try again shortly")
+            return
+        if len(self._hint_ready_at) >= HINT_COOLDOWN_TRACKED:
+            self._hint_ready_at = {
+                p: ready_at for p, ready_at in self._hint_ready_at.items() if ready_at > now
+            }
+        
+        # Searching runs in a worker thread; no second request until it is done
+        self._hint_ready_at[player_id] = math.inf
+        try:
+            hint = await self._hint_service.get_hint_async(game, player_id)
+        finally:
+            self._hint_ready_at[player_id] = time.monotonic() + HINT_COOLDOWN_SECONDS
+        if hint is None:
+            await self._send_error(player_id, "Hints are available only on your turn")
+            return
+        
+        await self._connection_manager.send_personal_message(
+            {
+                "type": "hint",
+                **hint
+            },
+            player_id
+        )
+    
+    async def _handle_create_room(
+        self,
+        player_id: str,
+        message: Dict[str, Any]
+    ) -> None:
+        """Handle player opening a room and waiting for someone to join"""
+        if await self._reject_if_playing(player_id):
+            return
+        rules = None
+        if message.get("rules") is not None:
+            try:
+                rules = GameRules.from_dict(message["rules"])
+            except ValueError as e:
+                await self._send_error(player_id, str(e))
+                return
+        
+        self._matchmaking_service.remove_player_from_queue(player_id)
+        game, code = self._lobby_service.create_room(
+            player_id, rules, private=bool(message.get("private", False))
+        )
+        self._connection_manager.add_player_to_game(player_id, game.game_id)
+        await self._connection_manager.send_personal_message(
+            {
+                "type": "room_created",
+                "code": code,
+                "game": game.to_dict()
+            },
+            player_id
+        )
+    
+    async def _handle_join_room(
+        self,
+        player_id: str,
+        message: Dict[str, Any]
+    ) -> None:
+        """Handle player joining a room by invite code or lobby game ID"""
+        if await self._reject_if_playing(player_id):
+            return
+        code = message.get("code")
+        game_id = message.get("game_id")
+        try:
+            game = self._lobby_service.join_room(
+                player_id,
+                code=str(code) if code is not None else None,
+                game_id=str(game_id) if game_id is not None else None
+            )
+        except ValueError as e:
+            await self._send_error(player_id, str(e))
+            return
+        
+        self._matchmaking_service.remove_player_from_queue(player_id)
+        self._turn_clock_service.schedule(game)
+        self._connection_manager.add_player_to_game(player_id, game.game_id)
+        await self._connection_manager.broadcast_to_game(
+            {
+                "type": "game_start",
+                "game": game.to_dict()
+            },
+            game.game_id
+        )
+    
+    async def _reject_if_playing(self, player_id: str) -> bool:
+        """Send an error and return True if the player already has an unfinished game"""
+        game = self._matchmaking_service.get_player_game(player_id)
+        if game is not None and game.state != GameState.FINISHED:
+            await self._send_error(player_id, "You are already in a game")
+            return True
+        return False
+    
+    async def _handle_join_tournament(
+        self,
+        player_id: str,
+        message: Dict[str, Any]
+    ) -> None:
+        """Handle player registering for a tournament"""
+        try:
+            tournament = self._tournament_service.register(
+                str(message.get("tournament_id")), player_id
+            )
+        except ValueError as e:
+            await self._send_error(player_id, str(e))
+            return
+        
+        await self._connection_manager.send_personal_message(
+            {
+                "type": "tournament_joined",
+                "tournament": tournament.to_dict()
+            },
+            player_id
+        )
+    
+    def handle_game_finished(
+        self,
+        game: Game,
+        reason: Optional[str] = None,
+        leaver: Optional[str] = None
+    ) -> GameFinished:
+        """
+        Capture a game's end for the event subscribers (archiving, match
+        history, leaderboard, analytics, lobby, tournament scoring)
+        reason overrides game.finish_reason, e.g. "abandoned" before a
+        leaving player is removed from the game; leaver is that player
+        Returns the event to publish once the caller has sent game over
+        """
+        return GameFinished(game.copy(), reason, leaver)
+    
+    async def announce_tournament(self, update: Optional[TournamentRound]) -> None:
+        """
+        Start a tournament round's games and notify every entrant in one batch
+        Entrants leave any casual game they were still in, and players no
+        longer connected forfeit their new game; those results come back
+        through the event bus and may complete the round in turn.
+        """
+        if update is None:
+            return
+        await self._abandon_displaced_games(update.displaced)
+        tournament = update.tournament
+        summary = tournament.to_dict()
+        messages = []
+        absent = []
+        for game in update.games:
+            self._turn_clock_service.schedule(game)
+            # Serialized once and shared by both players
+            message = {
+                "type": "game_start",
+                "game": game.to_dict(),
+                "tournament": summary
+            }
+            for player in game.players:
+                if self._connection_manager.is_connected(player.player_id):
+                    self._connection_manager.add_player_to_game(player.player_id, game.game_id)
+                    messages.append((player.player_id, message))
+                else:
+                    absent.append((game, player.player_id))
+        
+        if update.byes:
+            bye_message = {"type": "tournament_bye", "tournament": summary}
+            messages.extend((player_id, bye_message) for player_id in update.byes)
+        if update.finished:
+            final_message = {
+                "type": "tournament_finished",
+                "tournament": summary,
+                "standings": tournament.standings()[:TOURNAMENT_STANDINGS_SHOWN]
+            }
+            messages.extend((player_id, final_message) for player_id in tournament.players)
+        await self._connection_manager.send_many(messages)
+        
+        for game, player_id in absent:
+            if game.state != GameState.PLAYING:
+                continue  # Both players were gone, the first one forfeited already
+            finished = self.handle_game_finished(game, reason="abandoned", leaver=player_id)
+            self._matchmaking_service.remove_player(player_id)
+            self._turn_clock_service.cancel(game.game_id)
+            await self._connection_manager.broadcast_to_game(
+                {
+                    "type": "player_disconnected",
+                    "player_id": player_id,
+                    "message": "Opponent disconnected"
+                },
+                game.game_id
+            )
+            self._event_bus.publish(finished)
+    
+    async def _abandon_displaced_games(self, displaced: Sequence[Tuple[Game, str]]) -> None:
+        """Take entrants out of casual games left unfinished when their round opened"""
+        for game, player_id in displaced:
+            finished = None
+            if game.state == GameState.PLAYING:
+                finished = self.handle_game_finished(game, reason="abandoned", leaver=player_id)
+            self._connection_manager.remove_player_from_game(player_id, game.game_id)
+            if game.state == GameState.WAITING:
+                # Nobody joined the room yet
+                self._lobby_service.close_room(game)
+                continue
+            game.remove_player(player_id)
+            if finished is None:
+                continue  # The opponent was an entrant too and left first
+            self._turn_clock_service.cancel(game.game_id)
+            await self._connection_manager.broadcast_to_game(
+                {
+                    "type": "player_left",
+                    "player_id": player_id,
+                    "message": "Opponent has left for a tournament game"
+                },
+                game.game_id
+            )
+            self._event_bus.publish(finished)
+    
+    async def handle_timeout(self, game: Game) -> None:
+        """Notify players that the game was forfeited on time"""
+        finished = self.handle_game_finished(game)
+        await self._connection_manager.broadcast_to_game(
+            {
+                "type": "game_update",
+                "game": game.to_dict()
+            },
+            game.game_id
+        )
+        await self._connection_manager.broadcast_to_game(
+            {
+                "type": "game_over",
+                "game": game.to_dict(),
+                "winner": game.winner,
+                "reason": "timeout"
+            },
+            game.game_id
+        )
+        self._event_bus.publish(finished)
+    
+    def _archive_games(self, events: List[GameFinished]) -> None:
+        for event in events:
+            self._game_archive.record(event.game, event.reason)
+    
+    def _record_history(self, events: List[GameFinished]) -> None:
+        for event in events:
+            self._match_history.record(event.game, event.reason)
+    
+    def _record_results(self, events: List[GameFinished]) -> None:
+        for event in events:
+            self._leaderboard_service.record(event.game, event.reason)
+    
+    def _index_lobby(self, events: List[Any]) -> None:
+        for event in events:
+            if type(event) is GameStarted:
+                self._lobby_service.update(event.game)
+            else:
+                self._lobby_service.remove(event.game.game_id)
+    
+    async def _score_tournament_games(self, events: List[GameFinished]) -> None:
+        for event in events:
+            update = self._tournament_service.record_game(event.game, event.reason, event.leaver)
+            await self.announce_tournament(update)
+    
+    def _record_analytics(self, events: List[Any]) -> None:
+        analytics = self._analytics_service
+        for event in events:
+            event_type = type(event)
+            if event_type is MoveApplied:
+                analytics.record_placement(event.board_size, event.row, event.col)
+            elif event_type is PieceVanished:
+                analytics.record_vanish(event.board_size)
+            else:
+                analytics.record_game_finished(event.game, event.reason)
+    
+    def _log_events(self, events: List[Any]) -> None:
+        for event in events:
+            event_type = type(event)
+            if event_type is MoveApplied:
+                print(f"✅ Move {event.move_number} by {event.player_id} at [{event.row}, {event.col}]")
+            elif event_type is PieceVanished:
+                print(f"🔄 Vanishing: {event.player_id} at [{event.row}, {event.col}]")
+            else:
+                game = event.game
+                print(f"🎮 Game finished ({event.reason or game.finish_reason}). Winner: {game.winner}")
     
     async def _send_error(self, player_id: str, error_message: str) -> None:
         """Send error message to player"""
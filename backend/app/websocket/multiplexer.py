@@ -0,0 +1,103 @@
+"""
+WebSocket Multiplexer
+Follows Single Responsibility Principle: carries many player channels over one socket
+"""
+import asyncio
+from typing import Any, Dict, List, Optional, Set
+
+from fastapi import WebSocket
+
+
+class MultiplexedSession:
+    """
+    One WebSocket holding many player channels
+    Every message carries a "channel" field naming the player it belongs to.
+    Outbound messages are queued and coalesced into a single
+    {"type": "batch", "messages": [...]} frame per flush.
+    """
+
+    def __init__(self, websocket: WebSocket, flush_interval: float = 0.005):
+        self._websocket = websocket
+        self._flush_interval = flush_interval
+        self._channels: Set[str] = set()
+        self._outbox: List[Dict[str, Any]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    @property
+    def channels(self) -> Set[str]:
+        """Player IDs currently open on this session"""
+        return set(self._channels)
+
+    def open_channel(self, player_id: str) -> "ChannelConnection":
+        """Start carrying a player over this session"""
+        self._channels.add(player_id)
+        return ChannelConnection(self, player_id)
+
+    def close_channel(self, player_id: str) -> None:
+        """Stop carrying a player over this session"""
+        self._channels.discard(player_id)
+
+    def has_channel(self, player_id: str) -> bool:
+        """Check if a player is carried over this session"""
+        return player_id in self._channels
+
+    def enqueue(self, channel: Optional[str], message: Dict[str, Any]) -> None:
+        """
+        Queue an outbound message, scheduling a flush if none is pending
+        channel is None for session-level messages (e.g. protocol errors)
+        """
+        if self._closed:
+            raise ConnectionError("Session is closed")
+        self._outbox.append({"channel": channel, **message})
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def flush(self) -> None:
+        """Send every queued message as one batch frame"""
+        if not self._outbox or self._closed:
+            return
+        messages, self._outbox = self._outbox, []
+        await self._websocket.send_json({"type": "batch", "messages": messages})
+
+    async def close(self, code: int = 1000, reason: str = "") -> None:
+        """Flush pending messages and close the socket (idempotent)"""
+        if self._closed:
+            return
+        try:
+            await self.flush()
+        finally:
+            self._closed = True
+            if self._flush_task is not None:
+                self._flush_task.cancel()
+            await self._websocket.close(code=code, reason=reason)
+
+    async def _flush_later(self) -> None:
+        """Wait briefly so updates from many games share a frame, then flush"""
+        try:
+            await asyncio.sleep(self._flush_interval)
+            self._flush_task = None
+            await self.flush()
+        except Exception as e:
+            # Socket is gone; the receive loop sees the disconnect and cleans up
+            print(f"❌ Failed to flush multiplexed session: {e}")
+            self._closed = True
+
+
+class ChannelConnection:
+    """
+    Stand-in for a WebSocket inside ConnectionManager
+    Routes a single player's messages into its session's outbox
+    """
+
+    def __init__(self, session: MultiplexedSession, player_id: str):
+        self._session = session
+        self._player_id = player_id
+
+    async def send_json(self, message: Dict[str, Any]) -> None:
+        """Queue a message for this channel"""
+        self._session.enqueue(self._player_id, message)
+
+    async def close(self, code: int = 1000, reason: str = "") -> None:
+        """Closing any channel closes the shared socket"""
+        await self._session.close(code=code, reason=reason)
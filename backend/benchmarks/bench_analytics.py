@@ -0,0 +1,72 @@
+"""
+Benchmark: analytics ingest cost per move against make_move itself
+Run from backend/: python -m benchmarks.bench_analytics
+"""
+import contextlib
+import io
+import random
+import time
+
+from app.models import Game, GameRules, GameState
+from app.services import AnalyticsService
+
+
+GAME_COUNT = 20_000
+SNAPSHOT_COUNT = 200
+RULES = [
+    GameRules(),
+    GameRules(board_size=7, win_length=5, vanish_limit=5),
+]
+
+
+def main() -> None:
+    rng = random.Random(42)
+    analytics = AnalyticsService()
+    move_seconds = 0.0
+    record_seconds = 0.0
+    finish_seconds = 0.0
+    moves = 0
+
+    with contextlib.redirect_stdout(io.StringIO()) as sink:
+        for index in range(GAME_COUNT):
+            rules = RULES[index % len(RULES)]
+            n = rules.board_size
+            game = Game(f"game-{index}", rules)
+            game.add_player("p1")
+            game.add_player("p2")
+            while game.state == GameState.PLAYING and len(game.moves) < 60:
+                row, col = rng.randrange(n), rng.randrange(n)
+                if game.board[row][col].value:
+                    continue
+                started = time.perf_counter()
+                game.make_move(row, col, game.current_turn)
+                move_seconds += time.perf_counter() - started
+
+                started = time.perf_counter()
+                analytics.record_placement(n, row, col)
+                if len(game.moves) > 2 * rules.vanish_limit:
+                    analytics.record_vanish(n)
+                record_seconds += time.perf_counter() - started
+                moves += 1
+
+            started = time.perf_counter()
+            analytics.record_game_finished(game, game.finish_reason or "abandoned")
+            finish_seconds += time.perf_counter() - started
+            sink.seek(0)
+            sink.truncate()
+
+    started = time.perf_counter()
+    for _ in range(SNAPSHOT_COUNT):
+        analytics.snapshot()
+    snapshot_seconds = (time.perf_counter() - started) / SNAPSHOT_COUNT
+
+    print(f"games: {GAME_COUNT}, moves: {moves}")
+    print(f"make_move:            {move_seconds / moves * 1e6:8.3f} us/move")
+    print(f"record_placement:     {record_seconds / moves * 1e6:8.3f} us/move "
+          f"({record_seconds / move_seconds * 100:.1f}% of make_move)")
+    print(f"record_game_finished: {finish_seconds / GAME_COUNT * 1e6:8.3f} us/game")
+    print(f"snapshot (3 windows): {snapshot_seconds * 1e3:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark: archive cost on the move path, flush throughput and export speed
+Run from backend/: python -m benchmarks.bench_archive
+"""
+import contextlib
+import io
+import os
+import random
+import tempfile
+import time
+
+from app.models import Game, GameState
+from app.services import GameArchive
+from app.services.archive_service import iter_ndjson
+
+
+GAME_COUNT = 50_000
+BATCH_SIZE = 1000
+
+
+def random_finished_game(index: int, rng: random.Random) -> Game:
+    """Play random moves until the game ends (or 40 moves, then abandon)"""
+    game = Game(f"game-{index}")
+    game.add_player(f"p{index}a")
+    game.add_player(f"p{index}b")
+    for _ in range(40):
+        if game.state != GameState.PLAYING:
+            break
+        empties = [(r, c) for r in range(3) for c in range(3) if not game.board[r][c].value]
+        row, col = rng.choice(empties)
+        game.make_move(row, col, game.current_turn)
+    return game
+
+
+def main() -> None:
+    rng = random.Random(42)
+    with contextlib.redirect_stdout(io.StringIO()):
+        games = [random_finished_game(i, rng) for i in range(GAME_COUNT)]
+    move_count = sum(len(g.moves) for g in games)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = GameArchive(os.path.join(tmp, "games.vta"), batch_size=BATCH_SIZE)
+
+        record_seconds = 0.0
+        flush_seconds = 0.0
+        for game in games:
+            started = time.perf_counter()
+            archive.record(game)
+            record_seconds += time.perf_counter() - started
+            if archive.should_flush():
+                started = time.perf_counter()
+                archive.flush()
+                flush_seconds += time.perf_counter() - started
+        started = time.perf_counter()
+        archive.flush()
+        flush_seconds += time.perf_counter() - started
+
+        size = os.path.getsize(archive.path)
+        started = time.perf_counter()
+        exported = sum(len(chunk) for chunk in iter_ndjson(archive.path))
+        export_seconds = time.perf_counter() - started
+
+    print(f"games: {GAME_COUNT}, moves: {move_count}")
+    print(f"record (move path):  {record_seconds / GAME_COUNT * 1e6:8.2f} us/game")
+    print(f"flush (background):  {flush_seconds / GAME_COUNT * 1e6:8.2f} us/game")
+    print(f"archive size:        {size / GAME_COUNT:8.1f} bytes/game ({size / 1024:.0f} KiB)")
+    print(f"NDJSON export:       {GAME_COUNT / export_seconds:8.0f} games/s "
+          f"({exported / size:.1f}x expansion)")
+
+
+if __name__ == "__main__":
+    main()
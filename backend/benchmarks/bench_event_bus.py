@@ -0,0 +1,129 @@
+"""
+Benchmark: move path cost as event consumers are added
+Times make_move messages through MessageHandler with 0 to 64 extra
+MoveApplied consumers, once subscribed to the event bus and once called
+inline from the game, as every side effect used to be. The bus column
+should stay flat: publishing is one append whatever the subscriber count.
+Run from backend/: python -m benchmarks.bench_event_bus
+"""
+import asyncio
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+from app.models import GameState, MoveApplied
+from app.services import (
+    AnalyticsService,
+    EventBus,
+    GameArchive,
+    GameService,
+    HintService,
+    LeaderboardService,
+    LobbyService,
+    MatchHistoryStore,
+    MatchmakingService,
+    TournamentService,
+    Tracer,
+    TurnClockService,
+)
+from app.websocket import ConnectionManager, MessageHandler
+
+
+MOVE_MESSAGES = 20_000
+CONSUMER_COUNTS = (0, 1, 8, 64)
+# Cells alternating X/O that never complete a line on 3x3 with vanishing
+CYCLE = [(0, 0), (0, 1), (0, 2), (1, 1), (1, 0), (1, 2), (2, 1), (2, 0), (2, 2)]
+
+
+class NullSocket:
+    async def send_json(self, message):
+        pass
+
+
+class Counter:
+    """A consumer doing a little bookkeeping per event"""
+
+    def __init__(self):
+        self.events = 0
+        self.cells = {}
+
+    def __call__(self, events):
+        for event in events:
+            self.events += 1
+            key = (event.row, event.col)
+            self.cells[key] = self.cells.get(key, 0) + 1
+
+
+async def moves(consumers: int, inline: bool, directory: str) -> float:
+    """us per make_move message; consumers run on the bus or inline"""
+    event_bus = EventBus()
+    game_service = GameService(event_bus)
+    matchmaking_service = MatchmakingService(game_service)
+    connection_manager = ConnectionManager()
+    handler = MessageHandler(
+        game_service=game_service,
+        matchmaking_service=matchmaking_service,
+        connection_manager=connection_manager,
+        turn_clock_service=TurnClockService(game_service),
+        hint_service=HintService(),
+        game_archive=GameArchive(os.path.join(directory, f"archive-{consumers}-{inline}.vta")),
+        match_history=MatchHistoryStore(os.path.join(directory, f"history-{consumers}-{inline}.db")),
+        leaderboard_service=LeaderboardService(),
+        analytics_service=AnalyticsService(),
+        tournament_service=TournamentService(game_service, matchmaking_service),
+        lobby_service=LobbyService(game_service, matchmaking_service),
+        event_bus=event_bus,
+        tracer=Tracer()
+    )
+    counters = [Counter() for _ in range(consumers)]
+    if not inline:
+        for i, counter in enumerate(counters):
+            event_bus.subscribe(f"counter-{i}", counter, (MoveApplied,))
+
+    for player_id in ("a", "b"):
+        connection_manager.register(player_id, NullSocket())
+        await handler.handle_message(player_id, {"type": "join_queue"})
+    game = matchmaking_service.get_player_game("a")
+    if inline:
+        publish = event_bus.publish
+
+        def sink(event):
+            publish(event)
+            if type(event) is MoveApplied:
+                for counter in counters:
+                    counter([event])
+
+        game.event_sink = sink
+
+    elapsed = 0
+    for i in range(MOVE_MESSAGES):
+        row, col = CYCLE[i % len(CYCLE)]
+        message = {"type": "make_move", "row": row, "col": col}
+        player_id = game.current_turn
+        started = time.perf_counter_ns()
+        await handler.handle_message(player_id, message)
+        elapsed += time.perf_counter_ns() - started
+        assert game.state == GameState.PLAYING
+        # The next frame would be awaited here; subscribers run meanwhile
+        await asyncio.sleep(0)
+
+    await event_bus.join()
+    assert all(counter.events == MOVE_MESSAGES for counter in counters)
+    return elapsed / MOVE_MESSAGES / 1000
+
+
+def main() -> None:
+    print(f"{'consumers':>9} {'us/move (event bus)':>20} {'us/move (inline)':>17}")
+    for consumers in CONSUMER_COUNTS:
+        with tempfile.TemporaryDirectory() as directory:
+            # The log subscriber prints every move; keep it out of the terminal
+            with contextlib.redirect_stdout(io.StringIO()):
+                on_bus = asyncio.run(moves(consumers, False, directory))
+                inline = asyncio.run(moves(consumers, True, directory))
+        print(f"{consumers:>9} {on_bus:>20.2f} {inline:>17.2f}")
+
+
+if __name__ == "__main__":
+    main()
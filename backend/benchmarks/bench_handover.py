@@ -0,0 +1,67 @@
+"""
+Benchmark: drain/restore handover time for many live games
+Run from backend/: python -m benchmarks.bench_handover
+"""
+import contextlib
+import io
+import os
+import random
+import tempfile
+import time
+
+from app.models import Game
+from app.services import GameService, HandoverService, MatchmakingService
+
+
+GAME_COUNTS = [10_000, 100_000]
+MOVES_PER_GAME = 6
+
+
+def build_services(path: str) -> tuple[GameService, HandoverService]:
+    """Create a fresh service stack writing its handover to path"""
+    game_service = GameService()
+    matchmaking_service = MatchmakingService(game_service)
+    return game_service, HandoverService(game_service, matchmaking_service, path)
+
+
+def populate(game_service: GameService, count: int, rng: random.Random) -> None:
+    """Create count live games with a few random non-winning moves each"""
+    cells = [(r, c) for r in range(3) for c in range(3)]
+    for i in range(count):
+        game = game_service.create_game()
+        game.add_player(f"p{i}a")
+        game.add_player(f"p{i}b")
+        order = cells[:]
+        rng.shuffle(order)
+        for row, col in order[:MOVES_PER_GAME]:
+            if not game.make_move(row, col, game.current_turn):
+                break
+            if game.winner:
+                break
+
+
+def main() -> None:
+    rng = random.Random(42)
+    print(f"{'games':>8} {'live':>8} {'bytes':>11} {'drain s':>8} {'restore s':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "handover.bin")
+        for count in GAME_COUNTS:
+            old_games, old_handover = build_services(path)
+            with contextlib.redirect_stdout(io.StringIO()):
+                populate(old_games, count, rng)
+
+            drained = old_handover.drain()
+            new_games, new_handover = build_services(path)
+            started = time.perf_counter()
+            restored = new_handover.restore()
+            restore_seconds = time.perf_counter() - started
+
+            assert restored["games"] == drained["games"]
+            print(
+                f"{count:>8} {drained['games']:>8} {drained['bytes']:>11} "
+                f"{drained['seconds']:>8.3f} {restore_seconds:>10.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
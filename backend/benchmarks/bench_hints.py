@@ -0,0 +1,71 @@
+"""
+Benchmark: hint latency and cache behaviour across many concurrent games
+Every game requests a hint on every turn, then plays a random move
+Run from backend/: python -m benchmarks.bench_hints
+"""
+import contextlib
+import io
+import random
+import statistics
+import time
+
+from app.models import Game, GameState
+from app.services import HintService
+
+
+GAME_COUNT = 5_000
+TURNS = 12
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    """Nearest-rank percentile"""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main() -> None:
+    rng = random.Random(42)
+    service = HintService()
+    games = []
+    for i in range(GAME_COUNT):
+        game = Game(f"game-{i}")
+        game.add_player(f"p{i}a")
+        game.add_player(f"p{i}b")
+        games.append(game)
+
+    latencies = {True: [], False: []}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(TURNS):
+            # One round: each live game asks for a hint, then moves
+            for game in games:
+                if game.state != GameState.PLAYING:
+                    continue
+                started = time.perf_counter()
+                hint = service.get_hint(game, game.current_turn)
+                latencies[hint["cached"]].append(time.perf_counter() - started)
+
+                empties = [
+                    (r, c) for r in range(3) for c in range(3)
+                    if not game.board[r][c].value
+                ]
+                row, col = rng.choice(empties)
+                game.make_move(row, col, game.current_turn)
+
+    stats = service.stats()
+    print(f"games: {GAME_COUNT}, hints: {stats['hits'] + stats['misses']}")
+    print(f"cache entries: {stats['entries']}, memory: {stats['memory_bytes'] / 1024:.0f} KiB, "
+          f"hit rate: {stats['hit_rate']:.1%}")
+    for cached, samples in ((True, latencies[True]), (False, latencies[False])):
+        if not samples:
+            continue
+        label = "hit" if cached else "miss"
+        print(
+            f"{label:>5}: n={len(samples):>6} "
+            f"mean={statistics.mean(samples) * 1e6:>8.1f}us "
+            f"p50={percentile(samples, 0.5) * 1e6:>8.1f}us "
+            f"p99={percentile(samples, 0.99) * 1e6:>8.1f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
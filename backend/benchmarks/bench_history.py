@@ -0,0 +1,85 @@
+"""
+Benchmark: match history ingest rate and query latency
+Run from backend/: python -m benchmarks.bench_history [--games N] [--players N]
+The default of 10M games needs a few GB of disk and several minutes.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from app.services import MatchHistoryStore
+
+
+QUERIES_PER_KIND = 2000
+# Producer pauses when the writer falls this far behind, bounding memory
+MAX_PENDING = 200_000
+REASONS = ("win", "win", "win", "draw", "timeout", "abandoned")
+
+
+def percentile(samples, fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--games", type=int, default=10_000_000)
+    parser.add_argument("--players", type=int, default=100_000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    players = [f"player-{i}" for i in range(args.players)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "history.db")
+        store = MatchHistoryStore(path)
+        store.start()
+
+        started = time.perf_counter()
+        enqueue_seconds = 0.0
+        finished_at = 1.7e9
+        for i in range(args.games):
+            player_x, player_o = rng.sample(players, 2)
+            reason = rng.choice(REASONS)
+            winner = rng.choice((player_x, player_o)) if reason in ("win", "timeout") else None
+            finished_at += 0.01
+            row = (f"game-{i}", player_x, player_o, winner, reason, finished_at, rng.randint(5, 30))
+
+            enqueue_started = time.perf_counter()
+            store.record_row(row)
+            enqueue_seconds += time.perf_counter() - enqueue_started
+            if i % 10_000 == 0:
+                while store.pending_count() > MAX_PENDING:
+                    time.sleep(0.01)
+        store.stop()
+        ingest_seconds = time.perf_counter() - started
+        size = os.path.getsize(path)
+
+        queries = {
+            "last 20 games": lambda: store.last_games(rng.choice(players), 20),
+            "W/D/L totals": lambda: store.totals(rng.choice(players)),
+            "head-to-head": lambda: store.head_to_head(*rng.sample(players, 2)),
+        }
+        latencies = {}
+        for name, query in queries.items():
+            samples = []
+            for _ in range(QUERIES_PER_KIND):
+                query_started = time.perf_counter()
+                query()
+                samples.append(time.perf_counter() - query_started)
+            latencies[name] = samples
+
+    print(f"games: {args.games}, players: {args.players}")
+    print(f"record (move path):  {enqueue_seconds / args.games * 1e6:8.2f} us/game")
+    print(f"sustained ingest:    {args.games / ingest_seconds:8.0f} games/s "
+          f"({ingest_seconds:.1f} s total)")
+    print(f"database size:       {size / args.games:8.1f} bytes/game ({size / 2**20:.0f} MiB)")
+    for name, samples in latencies.items():
+        print(f"{name + ':':20s} p50 {percentile(samples, 0.5) * 1e6:7.1f} us, "
+              f"p99 {percentile(samples, 0.99) * 1e6:7.1f} us")
+
+
+if __name__ == "__main__":
+    main()
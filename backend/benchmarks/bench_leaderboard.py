@@ -0,0 +1,74 @@
+"""
+Benchmark: leaderboard update and rank-query throughput at 1M players
+Run from backend/: python -m benchmarks.bench_leaderboard
+"""
+import random
+import time
+
+from app.services import LeaderboardService
+
+
+PLAYER_COUNT = 1_000_000
+UPDATE_COUNT = 200_000
+QUERY_COUNT = 200_000
+
+
+def rate(count: int, seconds: float) -> str:
+    return f"{count / seconds:10.0f} ops/s ({seconds / count * 1e6:6.2f} us/op)"
+
+
+def main() -> None:
+    rng = random.Random(42)
+    players = [f"player-{i}" for i in range(PLAYER_COUNT)]
+    board = LeaderboardService(seed=42)
+
+    started = time.perf_counter()
+    board.load(
+        (player_id, rng.randint(0, 50), rng.randint(0, 20), rng.randint(0, 50))
+        for player_id in players
+    )
+    load_seconds = time.perf_counter() - started
+
+    # One finished game moves two players
+    started = time.perf_counter()
+    for _ in range(UPDATE_COUNT // 2):
+        winner, loser = rng.sample(players, 2)
+        board.record_result(winner, wins=1)
+        board.record_result(loser, losses=1)
+    update_seconds = time.perf_counter() - started
+
+    sample = [rng.choice(players) for _ in range(QUERY_COUNT)]
+    started = time.perf_counter()
+    for player_id in sample:
+        board.standing(player_id)
+    rank_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for player_id in sample[:QUERY_COUNT // 10]:
+        board.around(player_id, 5)
+    around_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(QUERY_COUNT):
+        board.top(10)
+    top_seconds = time.perf_counter() - started
+
+    # Worst case for the cache: every update lands in the top page
+    leaders = [p["player_id"] for p in board.top(100)]
+    started = time.perf_counter()
+    for i in range(QUERY_COUNT // 10):
+        board.record_result(leaders[i % len(leaders)], wins=1)
+        board.top(10)
+    churn_seconds = time.perf_counter() - started
+
+    print(f"players: {PLAYER_COUNT}")
+    print(f"load from totals:      {load_seconds:6.2f} s")
+    print(f"result update:       {rate(UPDATE_COUNT, update_seconds)}")
+    print(f"my rank:             {rate(QUERY_COUNT, rank_seconds)}")
+    print(f"around me (+-5):     {rate(QUERY_COUNT // 10, around_seconds)}")
+    print(f"top 10 (cached):     {rate(QUERY_COUNT, top_seconds)}")
+    print(f"top 10 after change: {rate(QUERY_COUNT // 10, churn_seconds)}")
+
+
+if __name__ == "__main__":
+    main()
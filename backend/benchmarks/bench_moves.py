@@ -0,0 +1,72 @@
+"""
+Benchmark: per-move cost of Game.make_move across board sizes
+Run from backend/: python -m benchmarks.bench_moves
+"""
+import contextlib
+import io
+import random
+import time
+
+from app.models import Game, GameRules, GameState
+
+
+CONFIGS = [
+    GameRules(board_size=3, win_length=3, vanish_limit=3),
+    GameRules(board_size=5, win_length=4, vanish_limit=4),
+    GameRules(board_size=7, win_length=5, vanish_limit=5),
+    GameRules(board_size=11, win_length=5, vanish_limit=8),
+    GameRules(board_size=15, win_length=5, vanish_limit=10),
+]
+GAMES_PER_CONFIG = 2000
+MAX_MOVES = 60
+
+
+def play_random_game(rules: GameRules, rng: random.Random) -> tuple[int, float]:
+    """Play one random game, return (move count, seconds spent in make_move)"""
+    game = Game("bench", rules)
+    game.add_player("p1")
+    game.add_player("p2")
+    size = rules.board_size
+    cells = [(r, c) for r in range(size) for c in range(size)]
+
+    moves = 0
+    elapsed = 0.0
+    while game.state == GameState.PLAYING and moves < MAX_MOVES:
+        row, col = rng.choice(cells)
+        if game.board[row][col].value:
+            continue
+        start = time.perf_counter()
+        game.make_move(row, col, game.current_turn)
+        elapsed += time.perf_counter() - start
+        moves += 1
+    return moves, elapsed
+
+
+def main() -> None:
+    rng = random.Random(42)
+    print(f"{'board':>7} {'k':>3} {'vanish':>7} {'moves':>9} {'us/move':>9}")
+    # make_move prints on win/vanish; keep it out of the terminal
+    with contextlib.redirect_stdout(io.StringIO()) as sink:
+        results = []
+        for rules in CONFIGS:
+            total_moves = 0
+            total_time = 0.0
+            for _ in range(GAMES_PER_CONFIG):
+                moves, elapsed = play_random_game(rules, rng)
+                total_moves += moves
+                total_time += elapsed
+                sink.seek(0)
+                sink.truncate()
+            results.append((rules, total_moves, total_time))
+
+    for rules, total_moves, total_time in results:
+        board = f"{rules.board_size}x{rules.board_size}"
+        print(
+            f"{board:>7} {rules.win_length:>3} "
+            f"{rules.vanish_limit:>7} {total_moves:>9} "
+            f"{total_time / total_moves * 1e6:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
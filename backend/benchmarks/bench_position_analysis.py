@@ -0,0 +1,109 @@
+"""
+Benchmark: batch position analysis against building a Game per position
+Run from backend/: python -m benchmarks.bench_position_analysis
+"""
+import contextlib
+import io
+import random
+import time
+
+import numpy as np
+
+from app.models import Game, GameRules, GameState
+from app.services import PositionAnalyzer
+from app.services.position_analysis_service import encode_game
+
+
+POSITION_COUNT = 10_000
+CONFIGS = [
+    GameRules(),
+    GameRules(board_size=7, win_length=5, vanish_limit=5),
+    GameRules(board_size=15, win_length=5, vanish_limit=10),
+]
+
+
+def random_moves(rules: GameRules, rng: random.Random) -> list:
+    """Moves of a random game cut off at a random point"""
+    game = Game("sample", rules)
+    game.add_player("p1")
+    game.add_player("p2")
+    n = rules.board_size
+    for _ in range(rng.randrange(1, 4 * rules.vanish_limit)):
+        if game.state != GameState.PLAYING:
+            break
+        empties = [(r, c) for r in range(n) for c in range(n) if not game.board[r][c].value]
+        game.make_move(*rng.choice(empties), game.current_turn)
+    return [(m.row, m.col) for m in game.moves]
+
+
+def analyze_with_game(rules: GameRules, moves: list) -> tuple:
+    """The per-object path: replay through make_move, then inspect the Game"""
+    game = Game("position", rules)
+    game.add_player("p1")
+    game.add_player("p2")
+    for row, col in moves:
+        game.make_move(row, col, game.current_turn)
+
+    n = rules.board_size
+    legal = [(r, c) for r in range(n) for c in range(n) if not game.board[r][c].value]
+    vanishing = [game.get_next_vanishing_position(p) for p in ("p1", "p2")]
+    winning = []
+    for player in game.players:
+        pieces = set(game.get_active_pieces(player.player_id))
+        pieces.discard(game.get_next_vanishing_position(player.player_id))
+        winning.append([
+            cell for cell in legal
+            if any(
+                all(other == cell or other in pieces for other in line)
+                for line in rules.lines.cell_lines[cell[0]][cell[1]]
+            )
+        ])
+    return game.winner, legal, vanishing, winning
+
+
+def main() -> None:
+    rng = random.Random(42)
+    print(f"{'board':>7} {'positions':>10} {'Game path':>14} {'batch':>14} {'+ to_dict':>14} {'speedup':>8}")
+    for rules in CONFIGS:
+        with contextlib.redirect_stdout(io.StringIO()) as sink:
+            samples = [random_moves(rules, rng) for _ in range(POSITION_COUNT)]
+            started = time.perf_counter()
+            for i, moves in enumerate(samples):
+                analyze_with_game(rules, moves)
+                if i % 1000 == 0:
+                    sink.seek(0)
+                    sink.truncate()
+            game_seconds = time.perf_counter() - started
+
+            # Compact input: encoded once, as a client would send it
+            encoded = []
+            for moves in samples:
+                game = Game("encode", rules)
+                game.add_player("p1")
+                game.add_player("p2")
+                for row, col in moves:
+                    game.make_move(row, col, game.current_turn)
+                encoded.append(encode_game(game))
+        boards = np.stack([board for board, _ in encoded])
+        to_move = [side for _, side in encoded]
+
+        analyzer = PositionAnalyzer(rules)
+        started = time.perf_counter()
+        result = analyzer.analyze(boards, to_move)
+        batch_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        result.to_dict()
+        dict_seconds = time.perf_counter() - started
+
+        board = f"{rules.board_size}x{rules.board_size}"
+        print(
+            f"{board:>7} {POSITION_COUNT:>10} "
+            f"{POSITION_COUNT / game_seconds:>10.0f} p/s "
+            f"{POSITION_COUNT / batch_seconds:>10.0f} p/s "
+            f"{POSITION_COUNT / (batch_seconds + dict_seconds):>10.0f} p/s "
+            f"{game_seconds / batch_seconds:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
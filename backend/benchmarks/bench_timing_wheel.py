@@ -0,0 +1,101 @@
+"""
+Benchmark: turn deadline scheduling for many concurrent games
+Compares the shared timing wheel with one asyncio timer per game
+Run from backend/: python -m benchmarks.bench_timing_wheel
+"""
+import asyncio
+import random
+import time
+
+from app.services import TimingWheel
+
+
+GAME_COUNTS = [100_000, 500_000]
+REARMS_PER_GAME = 4  # make_move calls re-arming the deadline
+
+
+def bench_wheel(count: int, rng: random.Random) -> dict:
+    """Arm, re-arm and cancel on the wheel, then advance through all deadlines"""
+    start = 0.0
+    wheel = TimingWheel(tick=0.1, start=start)
+    deadlines = [rng.uniform(1.0, 120.0) for _ in range(count)]
+
+    began = time.perf_counter()
+    for key, deadline in enumerate(deadlines):
+        wheel.arm(key, deadline)
+    arm_seconds = time.perf_counter() - began
+
+    began = time.perf_counter()
+    for _ in range(REARMS_PER_GAME):
+        for key, deadline in enumerate(deadlines):
+            wheel.arm(key, deadline + 1.0)
+    rearm_seconds = time.perf_counter() - began
+
+    began = time.perf_counter()
+    for key in range(0, count, 2):
+        wheel.cancel(key)
+    cancel_seconds = time.perf_counter() - began
+
+    began = time.perf_counter()
+    expired = 0
+    now = start
+    while len(wheel):
+        now += 0.1
+        expired += len(wheel.advance(now))
+    advance_seconds = time.perf_counter() - began
+
+    return {
+        "arm": arm_seconds / count,
+        "rearm": rearm_seconds / (count * REARMS_PER_GAME),
+        "cancel": cancel_seconds / (count // 2),
+        "advance": advance_seconds / max(expired, 1),
+    }
+
+
+async def bench_call_later(count: int, rng: random.Random) -> dict:
+    """Same arm/re-arm/cancel pattern with one loop.call_later handle per game"""
+    loop = asyncio.get_running_loop()
+    deadlines = [rng.uniform(1.0, 120.0) for _ in range(count)]
+
+    began = time.perf_counter()
+    handles = [loop.call_later(d, lambda: None) for d in deadlines]
+    arm_seconds = time.perf_counter() - began
+
+    began = time.perf_counter()
+    for _ in range(REARMS_PER_GAME):
+        for key, deadline in enumerate(deadlines):
+            handles[key].cancel()
+            handles[key] = loop.call_later(deadline + 1.0, lambda: None)
+    rearm_seconds = time.perf_counter() - began
+
+    began = time.perf_counter()
+    for handle in handles:
+        handle.cancel()
+    cancel_seconds = time.perf_counter() - began
+
+    return {
+        "arm": arm_seconds / count,
+        "rearm": rearm_seconds / (count * REARMS_PER_GAME),
+        "cancel": cancel_seconds / count,
+        "advance": float("nan"),
+    }
+
+
+def main() -> None:
+    rng = random.Random(42)
+    print(f"{'scheduler':>12} {'games':>8} {'arm ns':>8} {'rearm ns':>9} "
+          f"{'cancel ns':>10} {'expire ns':>10}")
+    for count in GAME_COUNTS:
+        for name, result in (
+            ("wheel", bench_wheel(count, rng)),
+            ("call_later", asyncio.run(bench_call_later(count, rng))),
+        ):
+            print(
+                f"{name:>12} {count:>8} {result['arm'] * 1e9:>8.0f} "
+                f"{result['rearm'] * 1e9:>9.0f} {result['cancel'] * 1e9:>10.0f} "
+                f"{result['advance'] * 1e9:>10.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Benchmark: Swiss tournament with in-process bot clients, round turnaround
+Every bot is a fake WebSocket that answers its own turn with a random
+legal move through MessageHandler, so moves, game over, scoring, pairing,
+bulk game creation and announcements all run the production code paths.
+Turnaround is the time from the last game over of a round to the last
+game_start of the next one.
+Run from backend/: python -m benchmarks.bench_tournament [--players 10000]
+"""
+import argparse
+import asyncio
+import contextlib
+import os
+import random
+import tempfile
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from app.models import TournamentFormat
+from app.services import (
+    AnalyticsService,
+    EventBus,
+    GameArchive,
+    GameService,
+    HintService,
+    LeaderboardService,
+    LobbyService,
+    MatchHistoryStore,
+    MatchmakingService,
+    TournamentService,
+    Tracer,
+    TurnClockService,
+)
+from app.websocket import ConnectionManager, MessageHandler
+
+
+class RoundClock:
+    """Collects per-round timestamps seen by the bots"""
+
+    def __init__(self):
+        self.first_start: Dict[int, float] = {}
+        self.last_start: Dict[int, float] = defaultdict(float)
+        self.last_over: Dict[int, float] = defaultdict(float)
+        self.moves = 0
+        self.finished = asyncio.Event()
+
+
+class BotSocket:
+    """Fake connection that plays a random legal move whenever it is its turn"""
+
+    def __init__(self, player_id: str, handler: MessageHandler, clock: RoundClock, rng: random.Random):
+        self._player_id = player_id
+        self._handler = handler
+        self._clock = clock
+        self._rng = rng
+        self._round = 0
+        self._tasks = set()
+
+    async def send_json(self, message: dict) -> None:
+        now = time.perf_counter()
+        kind = message["type"]
+        if kind == "game_start":
+            self._round = message["tournament"]["round"]
+            self._clock.first_start.setdefault(self._round, now)
+            self._clock.last_start[self._round] = now
+        elif kind == "game_over":
+            self._clock.last_over[self._round] = now
+            return
+        elif kind == "tournament_finished":
+            self._clock.finished.set()
+            return
+        elif kind != "game_update":
+            return
+
+        game = message["game"]
+        if game["state"] != "playing" or game["current_turn"] != self._player_id:
+            return
+        empty = [
+            (r, c) for r, row in enumerate(game["board"]) for c, cell in enumerate(row) if not cell
+        ]
+        row, col = self._rng.choice(empty)
+        self._clock.moves += 1
+        # Reply on a later loop iteration, like a real client would
+        task = asyncio.get_running_loop().create_task(
+            self._handler.handle_message(
+                self._player_id, {"type": "make_move", "row": row, "col": col}
+            )
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+
+async def run(player_count: int, rounds: Optional[int], directory: str) -> List[str]:
+    """Play a whole tournament, return the report lines"""
+    rng = random.Random(42)
+    event_bus = EventBus()
+    game_service = GameService(event_bus)
+    matchmaking_service = MatchmakingService(game_service)
+    connection_manager = ConnectionManager()
+    tournament_service = TournamentService(game_service, matchmaking_service)
+    match_history = MatchHistoryStore(os.path.join(directory, "history.db"))
+    match_history.start()
+    handler = MessageHandler(
+        game_service=game_service,
+        matchmaking_service=matchmaking_service,
+        connection_manager=connection_manager,
+        turn_clock_service=TurnClockService(game_service),
+        hint_service=HintService(),
+        game_archive=GameArchive(os.path.join(directory, "archive.vta")),
+        match_history=match_history,
+        leaderboard_service=LeaderboardService(),
+        analytics_service=AnalyticsService(),
+        tournament_service=tournament_service,
+        lobby_service=LobbyService(game_service, matchmaking_service),
+        event_bus=event_bus,
+        tracer=Tracer()
+    )
+
+    clock = RoundClock()
+    tournament = tournament_service.create_tournament(TournamentFormat.SWISS, rounds=rounds)
+    for i in range(player_count):
+        player_id = f"bot-{i}"
+        connection_manager.register(player_id, BotSocket(player_id, handler, clock, rng))
+        tournament_service.register(tournament.tournament_id, player_id)
+
+    started = time.perf_counter()
+    await handler.announce_tournament(tournament_service.start(tournament.tournament_id))
+    await clock.finished.wait()
+    total = time.perf_counter() - started
+    match_history.stop()
+
+    report = [f"{'round':>5} {'games':>6} {'duration s':>11} {'turnaround ms':>14}"]
+    turnarounds = []
+    for number in range(1, tournament.round_number + 1):
+        duration = clock.last_over[number] - clock.first_start[number]
+        turnaround = ""
+        if number + 1 in clock.last_start:
+            turnarounds.append(clock.last_start[number + 1] - clock.last_over[number])
+            turnaround = f"{turnarounds[-1] * 1e3:.1f}"
+        report.append(f"{number:>5} {player_count // 2:>6} {duration:>11.2f} {turnaround:>14}")
+
+    if turnarounds:
+        turnarounds.sort()
+        report.append(
+            f"turnaround (last game over -> last game_start): "
+            f"median {turnarounds[len(turnarounds) // 2] * 1e3:.1f} ms, max {turnarounds[-1] * 1e3:.1f} ms"
+        )
+    report.append(
+        f"{tournament.round_number} rounds, {clock.moves} moves in {total:.1f} s "
+        f"({clock.moves / total:.0f} moves/s)"
+    )
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--players", type=int, default=10_000)
+    parser.add_argument("--rounds", type=int, default=None, help="default: ceil(log2(players))")
+    args = parser.parse_args()
+
+    print(f"Swiss tournament: {args.players} bots")
+    with tempfile.TemporaryDirectory() as directory:
+        # The handler logs every move; keep it out of the terminal
+        with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+            report = asyncio.run(run(args.players, args.rounds, directory))
+    print("\n".join(report))
+
+
+if __name__ == "__main__":
+    main()
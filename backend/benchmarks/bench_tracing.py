@@ -0,0 +1,114 @@
+"""
+Benchmark: cost of tracing spans per message at different sample rates
+Measures the bare trace + 5 spans a move goes through, then whole
+make_move messages through MessageHandler with the tracer off and on.
+Run from backend/: python -m benchmarks.bench_tracing
+"""
+import asyncio
+import contextlib
+import io
+import tempfile
+import time
+import os
+
+from app.models import GameState
+from app.services import (
+    AnalyticsService,
+    EventBus,
+    GameArchive,
+    GameService,
+    HintService,
+    LeaderboardService,
+    LobbyService,
+    MatchHistoryStore,
+    MatchmakingService,
+    TournamentService,
+    Tracer,
+    TurnClockService,
+)
+from app.websocket import ConnectionManager, MessageHandler
+
+
+SPAN_MESSAGES = 1_000_000
+MOVE_MESSAGES = 100_000
+RATES = (0.0, 0.01, 1.0)
+# Cells alternating X/O that never complete a line on 3x3 with vanishing
+CYCLE = [(0, 0), (0, 1), (0, 2), (1, 1), (1, 0), (1, 2), (2, 1), (2, 0), (2, 2)]
+
+
+class NullSocket:
+    async def send_json(self, message):
+        pass
+
+
+def bare_spans(tracer: Tracer) -> float:
+    """ns per message for one trace with the spans of a move"""
+    started = time.perf_counter_ns()
+    for _ in range(SPAN_MESSAGES):
+        with tracer.trace():
+            with tracer.span("receive_json"):
+                pass
+            with tracer.span("handle_message"):
+                with tracer.span("make_move"):
+                    pass
+                with tracer.span("to_dict"):
+                    pass
+                with tracer.span("broadcast_to_game"):
+                    pass
+    return (time.perf_counter_ns() - started) / SPAN_MESSAGES
+
+
+async def moves(tracer: Tracer, directory: str) -> float:
+    """us per make_move message through MessageHandler"""
+    event_bus = EventBus()
+    game_service = GameService(event_bus)
+    matchmaking_service = MatchmakingService(game_service)
+    connection_manager = ConnectionManager()
+    handler = MessageHandler(
+        game_service=game_service,
+        matchmaking_service=matchmaking_service,
+        connection_manager=connection_manager,
+        turn_clock_service=TurnClockService(game_service),
+        hint_service=HintService(),
+        game_archive=GameArchive(os.path.join(directory, "archive.vta")),
+        match_history=MatchHistoryStore(os.path.join(directory, "history.db")),
+        leaderboard_service=LeaderboardService(),
+        analytics_service=AnalyticsService(),
+        tournament_service=TournamentService(game_service, matchmaking_service),
+        lobby_service=LobbyService(game_service, matchmaking_service),
+        event_bus=event_bus,
+        tracer=tracer
+    )
+    for player_id in ("a", "b"):
+        connection_manager.register(player_id, NullSocket())
+        await handler.handle_message(player_id, {"type": "join_queue"})
+
+    game = matchmaking_service.get_player_game("a")
+    elapsed = 0
+    for i in range(MOVE_MESSAGES):
+        row, col = CYCLE[i % len(CYCLE)]
+        message = {"type": "make_move", "row": row, "col": col}
+        player_id = game.current_turn
+        started = time.perf_counter_ns()
+        with tracer.trace():
+            await handler.handle_message(player_id, message)
+        elapsed += time.perf_counter_ns() - started
+        assert game.state == GameState.PLAYING
+    return elapsed / MOVE_MESSAGES / 1000
+
+
+def main() -> None:
+    print(f"{'sample rate':>11} {'ns/msg (spans only)':>20} {'us/move (handler)':>18}")
+    baseline = None
+    for rate in RATES:
+        spans = bare_spans(Tracer(sample_rate=rate, capacity=10_000, seed=1))
+        with tempfile.TemporaryDirectory() as directory:
+            # The handler logs every move; keep it out of the terminal
+            with contextlib.redirect_stdout(io.StringIO()):
+                per_move = asyncio.run(moves(Tracer(sample_rate=rate, seed=1), directory))
+        baseline = baseline or per_move
+        print(f"{rate:>11} {spans:>20.0f} {per_move:>11.2f} ({per_move / baseline - 1:+.1%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Unit tests for the rolling gameplay analytics
+"""
+from app.models import Game, GameRules
+from app.services import AnalyticsService
+
+
+class FakeClock:
+    """Manually advanced time source"""
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def play(analytics: AnalyticsService, game: Game, moves) -> None:
+    """Make moves in turn, recording each placement and vanish as the bus would"""
+    n = game.rules.board_size
+    for row, col in moves:
+        assert game.make_move(row, col, game.current_turn)
+        analytics.record_placement(n, row, col)
+        # Players alternate, so every move from the (2v+1)-th on vanishes a piece
+        if len(game.moves) > 2 * game.rules.vanish_limit:
+            analytics.record_vanish(n)
+    if game.finish_reason:
+        analytics.record_game_finished(game)
+
+
+def new_game(game_id: str, rules: GameRules = None) -> Game:
+    game = Game(game_id, rules)
+    game.add_player("player1")
+    game.add_player("player2")
+    return game
+
+
+class TestAnalyticsService:
+    """Test counters, heatmaps and window roll-ups"""
+
+    def test_counts_moves_outcomes_and_heatmap(self):
+        """Test a first-mover win with vanishing on the classic board"""
+        clock = FakeClock()
+        analytics = AnalyticsService(clock)
+        game = new_game("g1")
+        # X's fourth move vanishes (1, 0) and completes the diagonal
+        play(analytics, game, [(1, 0), (2, 0), (2, 2), (0, 1), (1, 1), (2, 1), (0, 0)])
+
+        minute = analytics.snapshot()["windows"]["1m"]["3"]
+        assert minute["moves"] == 7
+        assert minute["vanishes"] == 1
+        assert minute["games"] == 1
+        assert minute["first_mover_wins"] == 1
+        assert minute["first_mover_win_rate"] == 1.0
+        assert minute["average_game_length"] == 7
+        assert minute["vanish_decided_rate"] == 0.0
+        assert minute["cell_heatmap"][0][0] == 1
+        assert sum(map(sum, minute["cell_heatmap"])) == 7
+
+    def test_vanish_decided_win(self):
+        """Test a win through a cell the loser's vanished piece held"""
+        analytics = AnalyticsService(FakeClock())
+        game = new_game("g1")
+        # O's fourth move vanishes its piece at (1, 1); X takes it for the middle column
+        play(analytics, game, [
+            (1, 2), (1, 1), (0, 0), (1, 0), (0, 1), (0, 2), (2, 1), (2, 2), (1, 1)
+        ])
+        assert game.winner == "player1"
+        minute = analytics.snapshot()["windows"]["1m"]["3"]
+        assert minute["vanish_decided_rate"] == 1.0
+
+    def test_windows_roll_off(self):
+        """Test that old buckets leave the short windows but stay in the day"""
+        clock = FakeClock()
+        analytics = AnalyticsService(clock)
+        play(analytics, new_game("g1"), [(1, 1)])
+
+        clock.now += 120
+        play(analytics, new_game("g2"), [(0, 0), (2, 2)])
+        windows = analytics.snapshot()["windows"]
+        assert windows["1m"]["3"]["moves"] == 2
+        assert windows["1h"]["3"]["moves"] == 3
+
+        clock.now += 2 * 3600
+        windows = analytics.snapshot()["windows"]
+        assert windows["1h"]["3"]["moves"] == 0
+        assert windows["1d"]["3"]["moves"] == 3
+
+    def test_board_sizes_are_separate(self):
+        """Test that custom boards get their own heatmap"""
+        analytics = AnalyticsService(FakeClock())
+        play(analytics, new_game("g1", GameRules(board_size=5, win_length=4, vanish_limit=4)), [(4, 4)])
+        windows = analytics.snapshot()["windows"]["1m"]
+        assert windows["5"]["cell_heatmap"][4][4] == 1
+        assert "3" not in windows
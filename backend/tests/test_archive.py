@@ -0,0 +1,158 @@
+"""
+Unit tests for the finished-game archive
+"""
+import asyncio
+import json
+import struct
+import sys
+import zlib
+from array import array
+
+from app.models import Game, GameRules
+from app.services import GameArchive
+from app.services.archive_service import MAGIC, iter_games, iter_ndjson
+
+
+def finished_game(game_id: str) -> Game:
+    """Play a short game that player1 wins on the top row"""
+    game = Game(game_id)
+    game.add_player("player1")
+    game.add_player("player2")
+    for row, col in [(0, 0), (1, 0), (0, 1), (1, 1), (0, 2)]:
+        game.make_move(row, col, game.current_turn)
+    return game
+
+
+class TestGameArchive:
+    """Test batching, columnar segments and streaming reads"""
+
+    def test_round_trip_across_segments(self, tmp_path):
+        """Test that games from several flushes read back in order"""
+        archive = GameArchive(str(tmp_path / "games.vta"))
+        archive.record(finished_game("g1"))
+        assert archive.pending_count() == 1
+        assert archive.flush() == 1
+
+        abandoned = Game("g2")
+        abandoned.add_player("player3")
+        abandoned.add_player("player4")
+        abandoned.make_move(1, 1, "player3")
+        archive.record(abandoned, reason="abandoned")
+        archive.flush()
+
+        games = list(iter_games(archive.path))
+        assert [g["game_id"] for g in games] == ["g1", "g2"]
+
+        first = games[0]
+        assert first["players"] == ["player1", "player2"]
+        assert first["winner"] == "player1"
+        assert first["outcome"] == "x"
+        assert first["reason"] == "win"
+        assert [m[:2] for m in first["moves"]] == [[0, 0], [1, 0], [0, 1], [1, 1], [0, 2]]
+
+        assert games[1]["winner"] is None
+        assert games[1]["reason"] == "abandoned"
+        assert games[1]["moves"][0][:2] == [1, 1]
+
+    def test_torn_tail_is_ignored_and_repaired(self, tmp_path):
+        """Test that a partial last segment neither breaks reads nor later appends"""
+        path = tmp_path / "games.vta"
+        archive = GameArchive(str(path))
+        archive.record(finished_game("g1"))
+        archive.flush()
+        with open(path, "ab") as f:
+            f.write(b"VTA1\xff\xff\x00\x00partial")
+        assert [g["game_id"] for g in iter_games(str(path))] == ["g1"]
+
+        reopened = GameArchive(str(path))
+        reopened.record(finished_game("g2"))
+        reopened.flush()
+        assert [g["game_id"] for g in iter_games(str(path))] == ["g1", "g2"]
+
+    def test_ndjson_export(self, tmp_path):
+        """Test NDJSON chunks"""
+        archive = GameArchive(str(tmp_path / "games.vta"))
+        for i in range(5):
+            archive.record(finished_game(f"g{i}"))
+        archive.flush()
+
+        chunks = list(iter_ndjson(archive.path, chunk_size=2))
+        assert len(chunks) == 3
+        lines = b"".join(chunks).decode().splitlines()
+        assert [json.loads(line)["game_id"] for line in lines] == [f"g{i}" for i in range(5)]
+
+    def test_missing_archive_is_empty(self, tmp_path):
+        """Test reading before anything was flushed"""
+        assert list(iter_games(str(tmp_path / "none.vta"))) == []
+
+    def test_rules_and_clock_round_trip(self, tmp_path):
+        """Test that wide rules and the turn clock are archived"""
+        archive = GameArchive(str(tmp_path / "games.vta"))
+        game = Game("timed", GameRules(board_size=15, win_length=5, vanish_limit=100, bank_seconds=90.0))
+        game.add_player("player1")
+        game.add_player("player2")
+        game.make_move(7, 7, "player1")
+        archive.record(game, reason="abandoned")
+        archive.flush()
+
+        (archived,) = iter_games(archive.path)
+        assert archived["rules"] == {
+            "board_size": 15,
+            "win_length": 5,
+            "vanish_limit": 100,
+            "move_seconds": None,
+            "bank_seconds": 90.0,
+        }
+        assert archived["moves"][0][:2] == [7, 7]
+
+    def test_legacy_segment_is_readable(self, tmp_path):
+        """Test segments written with one-byte rules and no clock column"""
+        raw = {
+            "game_id": b"old", "player_x": b"player1", "player_o": b"player2",
+            "outcome": array("B", [1]), "reason": array("B", [0]),
+            "rules": array("B", [3, 3, 3]),
+            "created_at": array("d", [1.0]), "finished_at": array("d", [2.0]),
+            "move_offsets": array("I", [0, 1]), "move_cells": array("B", [4]),
+            "move_deltas": array("I", [250]),
+        }
+        header_columns, blobs, offset = {}, [], 0
+        for name, values in raw.items():
+            data = values if isinstance(values, bytes) else values.tobytes()
+            blob = zlib.compress(data)
+            header_columns[name] = [offset, len(blob), len(data)]
+            blobs.append(blob)
+            offset += len(blob)
+        header = json.dumps({"count": 1, "byteorder": sys.byteorder, "columns": header_columns}).encode()
+        body = header + b"".join(blobs)
+        path = tmp_path / "games.vta"
+        path.write_bytes(struct.pack("<4sII", MAGIC, 12 + len(body), len(header)) + body)
+
+        (archived,) = iter_games(str(path))
+        assert archived["rules"]["vanish_limit"] == 3
+        assert archived["rules"]["bank_seconds"] is None
+        assert archived["moves"] == [[1, 1, 250]]
+
+    def test_unencodable_game_is_dropped_not_retried(self, tmp_path):
+        """Test that one bad row neither blocks its batch nor comes back"""
+        archive = GameArchive(str(tmp_path / "games.vta"))
+        archive.record(finished_game("good"))
+        archive.record(finished_game("bad"))
+        archive._pending[1] = archive._pending[1]._replace(rules=(3, 3, 1 << 20))
+
+        assert asyncio.run(archive.flush_async()) == 1
+        assert archive.pending_count() == 0
+        assert archive.rejected_count() == 1
+        assert [g["game_id"] for g in iter_games(archive.path)] == ["good"]
+
+    def test_failed_write_keeps_games(self, tmp_path):
+        """Test that an I/O error leaves the batch queued for the next flush"""
+        archive = GameArchive(str(tmp_path / "missing" / "games.vta"))
+        archive.record(finished_game("g1"))
+        try:
+            asyncio.run(archive.flush_async())
+        except OSError:
+            pass
+        else:
+            raise AssertionError("Expected the write to fail")
+        assert archive.pending_count() == 1
+        assert archive.rejected_count() == 0
@@ -0,0 +1,184 @@
+"""
+Unit tests for the game event bus and the subscribers fed from it
+"""
+import asyncio
+
+import pytest
+
+from app.models import GameFinished, PieceVanished
+from app.services import (
+    AnalyticsService,
+    BackpressurePolicy,
+    EventBus,
+    GameArchive,
+    GameService,
+    HintService,
+    LeaderboardService,
+    LobbyService,
+    MatchHistoryStore,
+    MatchmakingService,
+    TournamentService,
+    Tracer,
+    TurnClockService,
+)
+from app.websocket import ConnectionManager, MessageHandler
+
+
+class FakeWebSocket:
+    """Records frames instead of sending them"""
+
+    def __init__(self):
+        self.frames = []
+
+    async def send_json(self, message):
+        self.frames.append(message)
+
+
+def collect(bus, name, event_types=(int,), **options):
+    batches = []
+    bus.subscribe(name, batches.append, event_types, **options)
+    return batches
+
+
+class TestEventBus:
+    """Test batching, routing and backpressure policies"""
+
+    def test_batches_in_order_after_publish_returns(self):
+        """Test that events arrive later, in order, in batches of batch_size"""
+        bus = EventBus()
+        batches = collect(bus, "numbers", batch_size=4)
+
+        async def scenario():
+            for i in range(10):
+                bus.publish(i)
+            assert batches == []
+            await bus.join()
+
+        asyncio.run(scenario())
+        assert batches == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+
+    def test_routes_by_type_and_isolates_failures(self):
+        """Test type routing and that a failing subscriber does not stop others"""
+        bus = EventBus()
+        numbers = collect(bus, "numbers", (int,))
+        words = collect(bus, "words", (str,))
+
+        def broken(events):
+            raise RuntimeError("boom")
+
+        failing = bus.subscribe("broken", broken, (int,))
+
+        async def scenario():
+            bus.publish(1)
+            bus.publish("one")
+            bus.publish(2)
+            await bus.join()
+
+        asyncio.run(scenario())
+        assert numbers == [[1, 2]]
+        assert words == [["one"]]
+        assert failing.failed == 2
+        assert bus.stats()["published"] == 3
+
+    @pytest.mark.parametrize("policy, kept, dropped", [
+        (BackpressurePolicy.DROP_OLDEST, [7, 8, 9], 7),
+        (BackpressurePolicy.DROP_NEWEST, [0, 1, 2], 7),
+        (BackpressurePolicy.REPORT, [0, 1, 2], 7),
+    ])
+    def test_backpressure_policies(self, policy, kept, dropped):
+        """Test what each policy keeps when a subscriber queue of 3 overflows"""
+        bus = EventBus()
+        batches = collect(bus, "slow", capacity=3, batch_size=3, policy=policy)
+        fast = collect(bus, "fast", capacity=100)
+        subscription = bus._subscriptions[0]
+
+        async def scenario():
+            # Dispatch runs before the subscriber tasks get to deliver
+            for i in range(10):
+                bus.publish(i)
+            await bus.join()
+
+        asyncio.run(scenario())
+        assert [event for batch in batches for event in batch] == kept
+        assert subscription.dropped == dropped
+        assert [event for batch in fast for event in batch] == list(range(10))
+
+
+    def test_stuck_subscriber_does_not_stall_others(self):
+        """Test that a subscriber which never returns only loses its own events"""
+        bus = EventBus()
+        stuck_batches = []
+
+        async def stuck(events):
+            stuck_batches.append(events)
+            await asyncio.Event().wait()
+
+        stuck_subscription = bus.subscribe("stuck", stuck, (int,), capacity=5, batch_size=1)
+        healthy = collect(bus, "healthy", capacity=1000)
+
+        async def scenario():
+            for i in range(100):
+                bus.publish(i)
+                await asyncio.sleep(0)
+            assert await bus.join(timeout=0.1) is False
+
+        asyncio.run(scenario())
+        assert [event for batch in healthy for event in batch] == list(range(100))
+        assert stuck_batches == [[0]]
+        # One event is being handled, capacity more wait, the rest are shed
+        assert stuck_subscription.stats()["queued"] == 5
+        assert stuck_subscription.dropped == 100 - 1 - 5
+        assert bus.stats()["inbox"] == 0
+
+
+class TestMoveEvents:
+    """Test that moves and game ends reach their consumers through the bus"""
+
+    def test_side_effects_run_as_subscribers(self, tmp_path):
+        """Test analytics and finished-game records from a played and abandoned game"""
+        event_bus = EventBus()
+        game_service = GameService(event_bus)
+        matchmaking_service = MatchmakingService(game_service)
+        connection_manager = ConnectionManager()
+        analytics = AnalyticsService()
+        match_history = MatchHistoryStore(str(tmp_path / "history.db"))
+        handler = MessageHandler(
+            game_service=game_service,
+            matchmaking_service=matchmaking_service,
+            connection_manager=connection_manager,
+            turn_clock_service=TurnClockService(game_service),
+            hint_service=HintService(),
+            game_archive=GameArchive(str(tmp_path / "archive.vta")),
+            match_history=match_history,
+            leaderboard_service=LeaderboardService(),
+            analytics_service=analytics,
+            tournament_service=TournamentService(game_service, matchmaking_service),
+            lobby_service=LobbyService(game_service, matchmaking_service),
+            event_bus=event_bus,
+            tracer=Tracer()
+        )
+        finished = collect(event_bus, "test", (GameFinished,))
+        vanished = collect(event_bus, "vanished", (PieceVanished,))
+
+        async def scenario():
+            for player_id in ("a", "b"):
+                connection_manager.register(player_id, FakeWebSocket())
+                await handler.handle_message(player_id, {"type": "join_queue"})
+            game = matchmaking_service.get_player_game("a")
+            # Eight moves without a line: the 7th and 8th vanish a piece
+            for row, col in [(0, 0), (0, 1), (0, 2), (1, 1), (1, 0), (1, 2), (2, 1), (2, 0)]:
+                await handler.handle_message(game.current_turn, {"type": "make_move", "row": row, "col": col})
+            await handler.handle_message("b", {"type": "leave_game"})
+            await event_bus.join()
+            return game
+
+        game = asyncio.run(scenario())
+        board = analytics.snapshot()["windows"]["1m"]["3"]
+        assert (board["moves"], board["vanishes"], board["games"]) == (8, 2, 1)
+        assert [event.row for batch in vanished for event in batch] == [0, 0]
+        (event,), = finished
+        # The copy still has the leaver, who was removed from the live game since
+        assert event.reason == "abandoned" and event.leaver == "b"
+        assert [p.player_id for p in event.game.players] == ["a", "b"]
+        assert [p.player_id for p in game.players] == ["a"]
+        assert match_history.pending_count() == 1
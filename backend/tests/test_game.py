@@ -2,7 +2,7 @@
 Unit tests for game logic
 """
 import pytest
-from app.models import Game, CellValue, GameState
+from app.models import Game, CellValue, GameState, GameRules, get_line_table
 
 
 class TestGame:
@@ -198,3 +198,108 @@ class TestGame:
         # Check game state
         assert game.state == GameState.FINISHED
         assert game.winner == "player1"
+
+
+class TestGameRules:
+    """Test configurable board size, win length and vanish limit"""
+
+    def test_default_rules_are_classic(self):
+        """Test that games default to 3x3, three in a row, vanish after 3"""
+        game = Game("test-game")
+        assert game.rules == GameRules()
+        assert len(game.board) == 3
+        assert game.to_dict()["rules"] == {
+            "board_size": 3,
+            "win_length": 3,
+            "vanish_limit": 3,
+            "move_seconds": None,
+            "bank_seconds": None,
+        }
+        assert game.to_dict()["time_remaining"] is None
+
+    def test_invalid_rules(self):
+        """Test that inconsistent rule sets are rejected"""
+        with pytest.raises(ValueError):
+            GameRules(board_size=2)
+        with pytest.raises(ValueError):
+            GameRules(board_size=5, win_length=6)
+        with pytest.raises(ValueError):
+            GameRules(board_size=5, win_length=4, vanish_limit=3)
+        with pytest.raises(ValueError):
+            GameRules.from_dict({"board_size": "big"})
+
+    @pytest.mark.parametrize("board_size, max_vanish_limit", [(3, 9), (11, 121), (15, 127)])
+    def test_vanish_limit_is_bounded(self, board_size, max_vanish_limit):
+        """Test that vanish_limit stops at the cell count and the int8 age range"""
+        rules = GameRules(board_size=board_size, vanish_limit=max_vanish_limit)
+        assert rules.vanish_limit == max_vanish_limit
+        with pytest.raises(ValueError, match=f"at most {max_vanish_limit}"):
+            GameRules(board_size=board_size, vanish_limit=max_vanish_limit + 1)
+
+    @pytest.mark.parametrize("clock", [
+        {"move_seconds": "inf"},
+        {"move_seconds": "nan"},
+        {"bank_seconds": float("-inf")},
+        {"bank_seconds": 3601},
+        {"move_seconds": 0},
+    ])
+    def test_clock_must_be_finite_and_bounded(self, clock):
+        """Test that infinite, NaN and over-long clocks are rejected"""
+        with pytest.raises(ValueError):
+            GameRules.from_dict(clock)
+        assert GameRules.from_dict({"bank_seconds": 3600}).bank_seconds == 3600
+
+    def test_line_table_is_shared(self):
+        """Test that line tables are computed once per configuration"""
+        assert get_line_table(5, 4) is get_line_table(5, 4)
+        table = GameRules(board_size=5, win_length=4, vanish_limit=4).lines
+        # 5x5 four in a row: 10 per direction for rows/cols, 4 per diagonal
+        assert len(table.lines) == 28
+        # Corner cell lies on one row, one column and one diagonal
+        assert len(table.cell_lines[0][0]) == 3
+
+    def test_large_board_win(self):
+        """Test four in a row on a 5x5 board"""
+        rules = GameRules(board_size=5, win_length=4, vanish_limit=4)
+        game = Game("test-game", rules)
+        game.add_player("player1")
+        game.add_player("player2")
+
+        # Player 1 builds an anti-diagonal from [0,4] to [3,1]
+        game.make_move(0, 4, "player1")
+        game.make_move(0, 0, "player2")
+        game.make_move(1, 3, "player1")
+        game.make_move(1, 0, "player2")
+        game.make_move(2, 2, "player1")
+        assert game.state == GameState.PLAYING
+        game.make_move(2, 0, "player2")
+        game.make_move(3, 1, "player1")  # X - wins!
+
+        assert game.state == GameState.FINISHED
+        assert game.winner == "player1"
+
+    def test_custom_vanish_limit(self):
+        """Test that the oldest symbol vanishes only after vanish_limit"""
+        rules = GameRules(board_size=5, win_length=4, vanish_limit=4)
+        game = Game("test-game", rules)
+        game.add_player("player1")
+        game.add_player("player2")
+
+        game.make_move(0, 0, "player1")
+        game.make_move(2, 0, "player2")
+        game.make_move(4, 1, "player1")
+        game.make_move(1, 2, "player2")
+        game.make_move(0, 2, "player1")
+        game.make_move(2, 4, "player2")
+        game.make_move(4, 3, "player1")
+
+        # Player 1 holds 4 symbols, [0,0] is next to vanish
+        assert game.board[0][0] == CellValue.X
+        assert game.get_next_vanishing_position("player1") == (0, 0)
+
+        game.make_move(3, 0, "player2")
+        game.make_move(4, 4, "player1")  # X at [4,4] - [0,0] vanishes
+
+        assert game.board[0][0] == CellValue.EMPTY
+        assert game.get_next_vanishing_position("player1") == (4, 1)
+        assert game.state == GameState.PLAYING
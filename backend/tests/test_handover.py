@@ -0,0 +1,124 @@
+"""
+Unit tests for live-game handover between processes
+"""
+import pytest
+from app.models import Game, GameRules, GameState, CellValue
+from app.services import GameService, MatchmakingService, HandoverService
+
+
+def make_services(tmp_path):
+    """Create a fresh service stack writing handovers under tmp_path"""
+    game_service = GameService()
+    matchmaking_service = MatchmakingService(game_service)
+    handover_service = HandoverService(
+        game_service, matchmaking_service, str(tmp_path / "handover.bin")
+    )
+    return game_service, matchmaking_service, handover_service
+
+
+class TestGameSnapshot:
+    """Test compact game serialization"""
+
+    def test_round_trip_after_vanishing(self):
+        """Test that board, turn and vanishing order survive a snapshot"""
+        game = Game("test-game")
+        game.add_player("player1")
+        game.add_player("player2")
+        for row, col, player in [
+            (0, 0, "player1"), (1, 1, "player2"),
+            (0, 2, "player1"), (2, 0, "player2"),
+            (2, 2, "player1"), (0, 1, "player2"),
+            (1, 0, "player1"),  # [0,0] vanishes
+        ]:
+            game.make_move(row, col, player)
+
+        restored = Game.from_snapshot(game.to_snapshot())
+
+        assert restored.to_dict() == game.to_dict()
+        assert restored.board[0][0] == CellValue.EMPTY
+        assert restored.get_next_vanishing_position("player1") == (0, 2)
+
+        # Restored game keeps applying the vanishing rule
+        restored.make_move(2, 1, "player2")
+        assert restored.board[1][1] == CellValue.EMPTY
+
+    def test_round_trip_custom_rules(self):
+        """Test that rules are part of the snapshot"""
+        game = Game("test-game", GameRules(board_size=7, win_length=5, vanish_limit=5))
+        restored = Game.from_snapshot(game.to_snapshot())
+        assert restored.rules == game.rules
+        assert len(restored.board) == 7
+
+
+class TestHandoverService:
+    """Test drain and restore between two service stacks"""
+
+    def test_drain_and_restore(self, tmp_path):
+        """Test that live games move to the new process, finished ones don't"""
+        old_games, old_matchmaking, old_handover = make_services(tmp_path)
+        old_matchmaking.add_player_to_queue("player1")
+        live = old_matchmaking.add_player_to_queue("player2")
+        live.make_move(1, 1, "player1")
+        finished = old_games.create_game()
+        finished.state = GameState.FINISHED
+
+        result = old_handover.drain()
+        assert result["games"] == 1
+        assert old_matchmaking.is_draining()
+
+        new_games, new_matchmaking, new_handover = make_services(tmp_path)
+        restored = new_handover.restore()
+        assert restored["games"] == 1
+        assert new_games.get_game(finished.game_id) is None
+
+        game = new_matchmaking.get_player_game("player2")
+        assert game.game_id == live.game_id
+        assert game.current_turn == "player2"
+        assert game.make_move(0, 0, "player2") is True
+
+        # Handover file is consumed exactly once
+        assert new_handover.restore() is None
+
+    def test_unknown_version_rejected(self, tmp_path):
+        """Test that snapshots from an incompatible format are refused"""
+        import json
+        import zlib
+        _, _, handover = make_services(tmp_path)
+        blob = zlib.compress(json.dumps({"version": 99, "games": []}).encode())
+        with pytest.raises(ValueError):
+            handover.load(blob)
+
+    def test_unreadable_file_is_moved_aside(self, tmp_path):
+        """Test that a corrupt handover file neither raises nor registers games"""
+        old_games, old_matchmaking, old_handover = make_services(tmp_path)
+        old_matchmaking.add_player_to_queue("player1")
+        old_matchmaking.add_player_to_queue("player2")
+        old_handover.drain()
+        path = tmp_path / "handover.bin"
+        path.write_bytes(path.read_bytes()[:-8])
+
+        new_games, _, new_handover = make_services(tmp_path)
+        result = new_handover.restore()
+        assert result["games"] == 0 and "error" in result
+        assert new_games.get_all_games() == {}
+        assert not path.exists()
+        assert (tmp_path / result["moved_to"]).read_bytes() != b""
+        assert new_handover.restore() is None
+
+    def test_bad_game_restores_nothing(self, tmp_path):
+        """Test that one invalid game keeps the others from being registered"""
+        import json
+        import time
+        import zlib
+        old_games, old_matchmaking, old_handover = make_services(tmp_path)
+        old_matchmaking.add_player_to_queue("player1")
+        good = old_matchmaking.add_player_to_queue("player2").to_snapshot()
+        blob = zlib.compress(json.dumps(
+            {"version": 1, "created_at": time.time(), "games": [good, {"id": "broken"}]}
+        ).encode())
+        (tmp_path / "handover.bin").write_bytes(blob)
+
+        new_games, new_matchmaking, new_handover = make_services(tmp_path)
+        assert "error" in new_handover.restore()
+        assert new_games.get_all_games() == {}
+        assert new_matchmaking.get_player_game("player1") is None
@@ -0,0 +1,148 @@
+"""
+Unit tests for position canonicalization and hints
+"""
+import asyncio
+
+from fastapi.testclient import TestClient
+
+import app.main as main
+from app.models import Game, GameRules, canonical_key
+from app.services import HintService, PositionCache
+
+
+def play(game: Game, moves) -> Game:
+    """Apply (row, col) moves alternating between the two players"""
+    for row, col in moves:
+        game.make_move(row, col, game.current_turn)
+    return game
+
+
+def new_game() -> Game:
+    game = Game("test-game")
+    game.add_player("player1")
+    game.add_player("player2")
+    return game
+
+
+class TestCanonicalKey:
+    """Test symmetry canonicalization"""
+
+    def test_symmetric_positions_share_key(self):
+        """Test that rotations and mirrors map to the same key"""
+        # X at top-left corner, O at top edge
+        base = canonical_key(3, 3, mover=(0,), opponent=(1,))
+        # Rotated 90 degrees: X top-right, O right edge
+        rotated = canonical_key(3, 3, mover=(2,), opponent=(5,))
+        # Mirrored: X top-right, O top edge
+        mirrored = canonical_key(3, 3, mover=(2,), opponent=(1,))
+        assert base[0] == rotated[0] == mirrored[0]
+
+    def test_age_order_matters(self):
+        """Test that the vanishing order is part of the position"""
+        oldest_corner = canonical_key(3, 3, mover=(0, 4, 8), opponent=(1, 3))
+        oldest_center = canonical_key(3, 3, mover=(4, 0, 8), opponent=(1, 3))
+        assert oldest_corner[0] != oldest_center[0]
+
+    def test_side_to_move_matters(self):
+        """Test that swapping sides gives a different position"""
+        assert canonical_key(3, 3, (0, 4), (1,))[0] != canonical_key(3, 3, (1,), (0, 4))[0]
+
+
+class TestHintService:
+    """Test hint search and caching"""
+
+    def test_takes_immediate_win(self):
+        """Test that a winning move is suggested"""
+        game = play(new_game(), [(0, 0), (1, 0), (0, 1), (1, 1)])
+        hint = HintService().get_hint(game, "player1")
+        assert (hint["row"], hint["col"]) == (0, 2)
+        assert hint["score"] > 0
+
+    def test_blocks_opponent(self):
+        """Test that an immediate threat is blocked"""
+        game = play(new_game(), [(0, 0), (1, 1), (2, 2), (1, 0)])
+        hint = HintService(depth=3).get_hint(game, "player1")
+        assert (hint["row"], hint["col"]) == (1, 2)
+
+    def test_symmetric_positions_hit_cache(self):
+        """Test that a mirrored position is answered from the cache, mirrored back"""
+        service = HintService(cache=PositionCache(capacity=10))
+        first = service.get_hint(play(new_game(), [(0, 0), (1, 0), (0, 1), (1, 1)]), "player1")
+        # Mirror top-bottom: the winning move moves to the bottom row
+        second = service.get_hint(play(new_game(), [(2, 0), (1, 0), (2, 1), (1, 1)]), "player1")
+
+        assert first["cached"] is False
+        assert second["cached"] is True
+        assert (second["row"], second["col"]) == (2, 2)
+        stats = service.stats()
+        assert stats["entries"] == 1
+        assert stats["hit_rate"] == 0.5
+        assert stats["memory_bytes"] > 0
+
+    def test_only_on_own_turn(self):
+        """Test that hints are refused when it is not the player's turn"""
+        assert HintService().get_hint(new_game(), "player2") is None
+
+    def test_cache_is_bounded(self):
+        """Test LRU eviction"""
+        cache = PositionCache(capacity=2)
+        cache.put((3, 3, 3, 6, 1), (0, 0))
+        cache.put((3, 3, 3, 6, 2), (0, 0))
+        cache.get((3, 3, 3, 6, 1))
+        cache.put((3, 3, 3, 6, 3), (0, 0))
+        assert len(cache) == 2
+        assert cache.get((3, 3, 3, 6, 2)) is None
+        assert cache.get((3, 3, 3, 6, 1)) is not None
+
+    def test_budget_keeps_deepest_finished_search(self):
+        """Test that a search over budget answers from the last depth it finished"""
+        game = Game("big", GameRules(board_size=15, win_length=5, vanish_limit=20))
+        game.add_player("player1")
+        game.add_player("player2")
+        play(game, [(7, 7), (7, 8)])
+        service = HintService(large_board_depth=3, node_budget=1_000)
+        request = service._prepare(game, "player1")
+        assert service._search(request)[2] == 1
+        assert HintService(large_board_depth=3, node_budget=10**6)._search(request)[2] == 3
+
+    def test_async_hint_drops_stale_result(self):
+        """Test that a hint searched in a thread is discarded if the game moved on"""
+        service = HintService(depth=3)
+        game = play(new_game(), [(0, 0), (1, 1)])
+
+        async def scenario():
+            pending = asyncio.ensure_future(service.get_hint_async(game, "player1"))
+            await asyncio.sleep(0)
+            game.make_move(2, 2, "player1")
+            return await pending
+
+        assert asyncio.run(scenario()) is None
+        hint = asyncio.run(service.get_hint_async(game, "player2"))
+        assert hint["cached"] is False
+        assert asyncio.run(service.get_hint_async(game, "player2"))["cached"] is True
+
+
+class TestHintRequests:
+    """Test hint requests over WebSockets"""
+
+    def receive_until(self, websocket, message_type):
+        for _ in range(20):
+            message = websocket.receive_json()
+            if message["type"] == message_type:
+                return message
+        raise AssertionError(f"No {message_type}")
+
+    def test_requests_are_rate_limited(self):
+        """Test that a second hint inside the cooldown is refused"""
+        client = TestClient(main.app)
+        with client.websocket_connect("/ws/hint-a") as first, client.websocket_connect("/ws/hint-b") as second:
+            for websocket in (first, second):
+                websocket.send_json({"type": "join_queue"})
+            starts = {p: self.receive_until(ws, "game_start") for p, ws in (("hint-a", first), ("hint-b", second))}
+            mover = first if starts["hint-a"]["game"]["current_turn"] == "hint-a" else second
+
+            mover.send_json({"type": "request_hint"})
+            assert "row" in self.receive_until(mover, "hint")
+            mover.send_json({"type": "request_hint"})
+            assert self.receive_until(mover, "error")["message"] == "Too many hint requests, try again shortly"
+            mover.send_json({"type": "leave_game"})
@@ -0,0 +1,67 @@
+"""
+Unit tests for the per-player match history store
+"""
+from app.models import Game
+from app.services import MatchHistoryStore
+
+
+def finished_game(game_id: str, first: str, second: str) -> Game:
+    """Play a short game that the first player wins on the top row"""
+    game = Game(game_id)
+    game.add_player(first)
+    game.add_player(second)
+    for row, col in [(0, 0), (1, 0), (0, 1), (1, 1), (0, 2)]:
+        game.make_move(row, col, game.current_turn)
+    return game
+
+
+class TestMatchHistoryStore:
+    """Test batched writes and the indexed queries"""
+
+    def test_results_totals_and_head_to_head(self, tmp_path):
+        """Test that each seat gets its result and totals add up"""
+        store = MatchHistoryStore(str(tmp_path / "history.db"))
+        store.start()
+        store.record(finished_game("g1", "alice", "bob"))
+        store.record(finished_game("g2", "bob", "alice"))
+        store.record(finished_game("g3", "alice", "carol"))
+        store.record_row(("g4", "alice", "bob", None, "draw", 4e9, 9))
+        store.stop()
+
+        assert store.totals("alice") == {
+            "player_id": "alice", "wins": 2, "draws": 1, "losses": 1
+        }
+        assert store.totals("carol")["losses"] == 1
+        assert store.totals("nobody")["wins"] == 0
+
+        record = store.head_to_head("alice", "bob")
+        assert (record["wins"], record["draws"], record["losses"]) == (1, 1, 1)
+        assert store.head_to_head("bob", "alice")["wins"] == 1
+
+    def test_last_games_newest_first(self, tmp_path):
+        """Test that recent games come back newest first, limited"""
+        store = MatchHistoryStore(str(tmp_path / "history.db"), batch_size=2)
+        store.start()
+        for i in range(5):
+            store.record_row((f"g{i}", "alice", f"opp{i}", "alice", "win", 1000.0 + i, 5))
+        store.stop()
+
+        games = store.last_games("alice", limit=3)
+        assert [g["game_id"] for g in games] == ["g4", "g3", "g2"]
+        assert games[0]["opponent_id"] == "opp4"
+        assert games[0]["result"] == "win"
+        assert store.last_games("opp4")[0]["result"] == "loss"
+
+    def test_abandoned_games_skip_totals(self, tmp_path):
+        """Test that abandoned games are listed but not counted as results"""
+        store = MatchHistoryStore(str(tmp_path / "history.db"))
+        store.start()
+        game = Game("g1")
+        game.add_player("alice")
+        game.add_player("bob")
+        store.record(game, reason="abandoned")
+        store.stop()
+
+        assert store.last_games("alice")[0]["result"] == "abandoned"
+        assert store.totals("alice")["wins"] + store.totals("alice")["losses"] == 0
+        assert store.head_to_head("alice", "bob")["abandoned"] == 1
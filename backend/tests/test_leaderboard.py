@@ -0,0 +1,151 @@
+"""
+Unit tests for the order-statistic skip list and the leaderboard
+"""
+import asyncio
+import bisect
+import random
+
+import pytest
+
+from app.services import IndexedSkipList, LeaderboardService
+from app.websocket import LeaderboardBroadcaster
+
+
+class FakeWebSocket:
+    """Records frames instead of sending them"""
+
+    def __init__(self):
+        self.frames = []
+
+    async def send_json(self, message):
+        self.frames.append(message)
+
+
+class TestIndexedSkipList:
+    """Test ranks and positional access against a sorted list"""
+
+    def test_matches_sorted_list(self):
+        """Test random inserts and removals keep ranks and positions exact"""
+        rng = random.Random(7)
+        ranking = IndexedSkipList(seed=7)
+        reference = []
+        for _ in range(2000):
+            if reference and rng.random() < 0.4:
+                key = reference.pop(rng.randrange(len(reference)))
+                assert ranking.remove(key) == str(key)
+            else:
+                key = rng.randrange(10**6)
+                if key in reference:
+                    continue
+                bisect.insort(reference, key)
+                ranking.insert(key, str(key))
+
+        assert len(ranking) == len(reference)
+        for index in range(0, len(reference), 7):
+            assert ranking.rank(reference[index]) == index
+            assert ranking.at(index) == (reference[index], str(reference[index]))
+        assert [key for key, _ in ranking.slice(5, 10)] == reference[5:15]
+
+    def test_from_sorted_then_update(self):
+        """Test that a bulk-built list supports later inserts and removals"""
+        reference = list(range(0, 3000, 3))
+        ranking = IndexedSkipList.from_sorted(((key, None) for key in reference), seed=1)
+        ranking.insert(1000, None)
+        ranking.remove(3)
+        reference = sorted(set(reference) - {3} | {1000})
+
+        assert len(ranking) == len(reference)
+        for index in range(0, len(reference), 11):
+            assert ranking.rank(reference[index]) == index
+            assert ranking.at(index)[0] == reference[index]
+
+    def test_missing_keys(self):
+        """Test lookups of absent keys and positions"""
+        ranking = IndexedSkipList()
+        ranking.insert(1)
+        with pytest.raises(KeyError):
+            ranking.rank(2)
+        with pytest.raises(KeyError):
+            ranking.remove(2)
+        with pytest.raises(IndexError):
+            ranking.at(1)
+        assert ranking.slice(1, 5) == []
+
+
+class TestLeaderboardService:
+    """Test scoring, rank queries and top page caching"""
+
+    def test_ranks_by_score_then_first_to_reach_it(self):
+        """Test that ties keep the player who got there first ahead"""
+        board = LeaderboardService()
+        board.record_result("alice", wins=1)
+        board.record_result("bob", wins=1)
+        board.record_result("carol", draws=1)
+        board.record_result("dave", losses=1)
+
+        assert [p["player_id"] for p in board.top(10)] == ["alice", "bob", "carol", "dave"]
+        bob = board.standing("bob")
+        assert (bob["rank"], bob["score"], bob["wins"]) == (2, 2, 1)
+
+        board.record_result("carol", wins=1)
+        assert board.standing("carol")["rank"] == 1
+        assert board.standing("nobody") is None
+
+    def test_around_and_deep_pages(self):
+        """Test neighbours of a player and pages beyond the cached one"""
+        board = LeaderboardService(page_size=5)
+        for i in range(20):
+            board.record_result(f"p{i:02d}", wins=20 - i)
+
+        around = board.around("p10", radius=2)
+        assert [p["player_id"] for p in around] == ["p08", "p09", "p10", "p11", "p12"]
+        assert around[2]["rank"] == 11
+        assert [p["rank"] for p in board.top(3, offset=15)] == [16, 17, 18]
+        assert [p["player_id"] for p in board.around("p00", radius=1)] == ["p00", "p01"]
+
+    def test_version_changes_only_when_top_page_does(self):
+        """Test that results far below the top page keep the cache valid"""
+        board = LeaderboardService(page_size=3)
+        for i in range(10):
+            board.record_result(f"p{i}", wins=10 - i)
+        page = board.top(3)
+        version = board.version
+
+        board.record_result("p9", losses=1)
+        board.record_result("new", draws=1)
+        assert board.version == version
+        assert board.top(3) == page
+
+        board.record_result("p9", wins=20)
+        assert board.version != version
+        assert board.top(1)[0]["player_id"] == "p9"
+
+    def test_load_rebuilds_from_totals(self):
+        """Test rebuilding from stored W/D/L totals"""
+        board = LeaderboardService()
+        board.load([("alice", 1, 0, 3), ("bob", 2, 1, 0)])
+        assert [p["player_id"] for p in board.top(2)] == ["bob", "alice"]
+        assert board.standing("bob")["score"] == 5
+
+
+class TestLeaderboardBroadcaster:
+    """Test pushing leaderboard changes"""
+
+    def test_pushes_once_per_change(self):
+        """Test that only a changed leaderboard is pushed"""
+        async def scenario():
+            board = LeaderboardService()
+            broadcaster = LeaderboardBroadcaster(board, size=3)
+            websocket = FakeWebSocket()
+            await broadcaster.subscribe(websocket)
+            assert websocket.frames[0]["players"] == []
+
+            board.record_result("alice", wins=1)
+            board.record_result("bob", wins=1)
+            assert await broadcaster.push_if_changed() == 1
+            assert await broadcaster.push_if_changed() == 0
+            return websocket.frames
+
+        frames = asyncio.run(scenario())
+        assert len(frames) == 2
+        assert [p["player_id"] for p in frames[1]["players"]] == ["alice", "bob"]
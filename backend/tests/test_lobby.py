@@ -0,0 +1,197 @@
+"""
+Unit tests for invite-code rooms and the paginated lobby
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+import app.main as main
+from app.models import GameRules, GameState
+from app.services import GameService, LobbyService, MatchmakingService
+
+
+def make_lobby(page_size=20):
+    game_service = GameService()
+    matchmaking_service = MatchmakingService(game_service)
+    return LobbyService(game_service, matchmaking_service, page_size=page_size), game_service
+
+
+def receive_until(websocket, message_type):
+    for _ in range(20):
+        message = websocket.receive_json()
+        if message["type"] == message_type:
+            return message
+    raise AssertionError(f"No {message_type}")
+
+
+class TestRooms:
+    """Test creating, joining and closing rooms"""
+
+    def test_join_by_code(self):
+        """Test that a code finds the room case-insensitively and is spent on join"""
+        lobby, _ = make_lobby()
+        game, code = lobby.create_room("host")
+        assert len(code) == 6
+        assert lobby.find_room(f" {code.lower()} ") is game
+
+        with pytest.raises(ValueError, match="already in this room"):
+            lobby.join_room("host", code=code)
+        assert lobby.join_room("guest", code=code) is game
+        assert game.state == GameState.PLAYING
+        assert lobby.find_room(code) is None
+        with pytest.raises(ValueError, match="Room not found"):
+            lobby.join_room("third", code=code)
+
+    def test_private_rooms_are_unlisted(self):
+        """Test that private rooms stay out of the lobby and need their code"""
+        lobby, _ = make_lobby()
+        game, code = lobby.create_room("host", private=True)
+        assert lobby.page()["games"] == []
+        with pytest.raises(ValueError, match="Room not found"):
+            lobby.join_room("guest", game_id=game.game_id)
+        lobby.join_room("guest", code=code)
+        assert lobby.page(GameState.PLAYING)["games"] == []
+        assert lobby.counts() == {"waiting": 0, "playing": 0, "rooms": 0}
+
+    def test_close_room(self):
+        """Test that closing a room drops the game, its code and listing"""
+        lobby, game_service = make_lobby()
+        game, code = lobby.create_room("host")
+        lobby.close_room(game)
+        assert game_service.get_game(game.game_id) is None
+        assert lobby.find_room(code) is None
+        assert lobby.counts()["waiting"] == 0
+
+
+class TestMatchmakingQueues:
+    """Test that per-rules queues do not outlive their waiting players"""
+
+    def test_variant_queues_are_dropped_when_empty(self):
+        """Test that matching or leaving the last waiter removes a variant's queue"""
+        game_service = GameService()
+        matchmaking = MatchmakingService(game_service)
+        for vanish_limit in range(3, 10):
+            rules = GameRules(vanish_limit=vanish_limit)
+            matchmaking.add_player_to_queue(f"leaver{vanish_limit}", rules)
+            matchmaking.remove_player_from_queue(f"leaver{vanish_limit}")
+        assert matchmaking._waiting_players == {}
+
+        rules = GameRules(board_size=4, vanish_limit=16)
+        assert matchmaking.add_player_to_queue("a", rules) is None
+        assert matchmaking.add_player_to_queue("b", rules).state == GameState.PLAYING
+        assert matchmaking._waiting_players == {}
+
+
+class TestLobbyPages:
+    """Test cursor pagination and the cached first page"""
+
+    def test_cursor_walks_every_game_once(self):
+        """Test that following next_cursor lists each game once, oldest first"""
+        lobby, _ = make_lobby(page_size=4)
+        created = [lobby.create_room(f"p{i}")[0].game_id for i in range(10)]
+
+        seen, cursor = [], None
+        while True:
+            page = lobby.page(GameState.WAITING, cursor, limit=3)
+            seen.extend(entry["game_id"] for entry in page["games"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        assert seen == created
+        with pytest.raises(ValueError):
+            lobby.page(GameState.WAITING, "not-a-cursor")
+        with pytest.raises(ValueError):
+            lobby.page(GameState.FINISHED)
+
+    def test_first_page_follows_state_changes(self):
+        """Test that joins and removals reach the cached first page"""
+        lobby, _ = make_lobby(page_size=2)
+        games = [lobby.create_room(f"p{i}")[0] for i in range(3)]
+        first = lobby.page()
+        assert [g["game_id"] for g in first["games"]] == [g.game_id for g in games[:2]]
+        assert first["next_cursor"] is not None
+
+        lobby.join_room("guest", game_id=games[0].game_id)
+        assert [g["game_id"] for g in lobby.page()["games"]] == [g.game_id for g in games[1:]]
+        assert lobby.page()["next_cursor"] is None
+        assert [g["game_id"] for g in lobby.page(GameState.PLAYING)["games"]] == [games[0].game_id]
+
+        lobby.remove(games[0].game_id)
+        assert lobby.page(GameState.PLAYING)["games"] == []
+
+
+class TestLobbyEndpoints:
+    """Test rooms over WebSockets and the lobby HTTP endpoints"""
+
+    def test_room_game(self):
+        """Test creating a room, finding it over HTTP and joining it by code"""
+        client = TestClient(main.app)
+        with client.websocket_connect("/ws/room-a") as host, client.websocket_connect("/ws/room-b") as guest:
+            host.send_json({"type": "create_room"})
+            created = receive_until(host, "room_created")
+            code, game_id = created["code"], created["game"]["game_id"]
+
+            assert client.get(f"/api/rooms/{code}").json()["game_id"] == game_id
+            listed = client.get("/api/lobby?limit=100").json()["games"]
+            assert game_id in [entry["game_id"] for entry in listed]
+
+            guest.send_json({"type": "join_room", "code": code})
+            for websocket in (host, guest):
+                assert receive_until(websocket, "game_start")["game"]["state"] == "playing"
+            host.send_json({"type": "create_room"})
+            assert receive_until(host, "error")["message"] == "You are already in a game"
+
+            guest.send_json({"type": "leave_game"})
+            assert receive_until(host, "player_left")["player_id"] == "room-b"
+
+        assert client.get(f"/api/rooms/{code}").status_code == 404
+        health = client.get("/api/health").json()
+        assert "games" not in health
+        assert set(health["lobby"]) == {"waiting", "playing", "rooms"}
+        assert client.get("/api/lobby?state=finished").status_code == 400
+
+    def test_private_room_stays_out_of_lobby(self):
+        """Test that a private room is joinable by code but never listed"""
+        client = TestClient(main.app)
+        with client.websocket_connect("/ws/private-a") as host, client.websocket_connect("/ws/private-b") as guest:
+            host.send_json({"type": "create_room", "private": True})
+            created = receive_until(host, "room_created")
+            game_id = created["game"]["game_id"]
+            for state in ("waiting", "playing"):
+                listed = client.get(f"/api/lobby?state={state}&limit=100").json()["games"]
+                assert game_id not in [entry["game_id"] for entry in listed]
+
+            guest.send_json({"type": "join_room", "game_id": game_id})
+            assert receive_until(guest, "error")["message"] == "Room not found"
+            guest.send_json({"type": "join_room", "code": created["code"]})
+            assert receive_until(guest, "game_start")["game"]["game_id"] == game_id
+            listed = client.get("/api/lobby?state=playing&limit=100").json()["games"]
+            assert game_id not in [entry["game_id"] for entry in listed]
+
+    def test_host_disconnect_closes_waiting_room(self):
+        """Test that a room whose host disconnects before anyone joins is dropped"""
+        client = TestClient(main.app)
+        with client.websocket_connect("/ws/gone-host") as host:
+            host.send_json({"type": "create_room"})
+            created = receive_until(host, "room_created")
+        code, game_id = created["code"], created["game"]["game_id"]
+
+        assert client.get(f"/api/rooms/{code}").status_code == 404
+        assert main.game_service.get_game(game_id) is None
+        listed = client.get("/api/lobby?limit=100").json()["games"]
+        assert game_id not in [entry["game_id"] for entry in listed]
+
+    def test_room_creator_leaves_matchmaking_queue(self):
+        """Test that a player who queued and then opened a room is not matched by the queue"""
+        client = TestClient(main.app)
+        with client.websocket_connect("/ws/queued-host") as host, client.websocket_connect("/ws/queued-other") as other:
+            host.send_json({"type": "join_queue"})
+            receive_until(host, "waiting")
+            host.send_json({"type": "create_room"})
+            game_id = receive_until(host, "room_created")["game"]["game_id"]
+
+            other.send_json({"type": "join_queue"})
+            receive_until(other, "waiting")
+            assert main.matchmaking_service.get_player_game("queued-host").game_id == game_id
+            listed = client.get("/api/lobby?limit=100").json()["games"]
+            assert game_id in [entry["game_id"] for entry in listed]
+            other.send_json({"type": "leave_game"})
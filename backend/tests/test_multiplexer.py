@@ -0,0 +1,152 @@
+"""
+Tests for multiplexed WebSocket sessions
+"""
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.main as main
+from app.models import GameState
+from app.websocket import ConnectionManager, MultiplexedSession
+
+
+class FakeWebSocket:
+    """Records frames instead of sending them"""
+
+    def __init__(self):
+        self.frames = []
+        self.closed_with = None
+
+    async def send_json(self, message):
+        self.frames.append(message)
+
+    async def close(self, code=1000, reason=""):
+        self.closed_with = code
+
+
+class TestMultiplexedSession:
+    """Test batching of channel messages"""
+
+    def test_broadcasts_coalesce_into_one_frame(self):
+        """Test that messages for many channels share a single frame"""
+        async def scenario():
+            websocket = FakeWebSocket()
+            session = MultiplexedSession(websocket, flush_interval=0)
+            manager = ConnectionManager()
+            for player_id in ("bot-1", "bot-2", "bot-3"):
+                manager.register(player_id, session.open_channel(player_id))
+            manager.add_player_to_game("bot-1", "game-a")
+            manager.add_player_to_game("bot-2", "game-a")
+            manager.add_player_to_game("bot-3", "game-b")
+
+            await manager.broadcast_to_game({"type": "game_update"}, "game-a")
+            await manager.broadcast_to_game({"type": "game_update"}, "game-b")
+            await asyncio.sleep(0.01)
+            return websocket
+
+        websocket = asyncio.run(scenario())
+
+        assert len(websocket.frames) == 1
+        frame = websocket.frames[0]
+        assert frame["type"] == "batch"
+        assert sorted(m["channel"] for m in frame["messages"]) == [
+            "bot-1", "bot-2", "bot-3"
+        ]
+
+    def test_close_flushes_once(self):
+        """Test that closing through any channel closes the socket once"""
+        async def scenario():
+            websocket = FakeWebSocket()
+            session = MultiplexedSession(websocket, flush_interval=10)
+            first = session.open_channel("bot-1")
+            second = session.open_channel("bot-2")
+            await first.send_json({"type": "waiting"})
+            await first.close(code=1012)
+            await second.close(code=1012)
+            with pytest.raises(ConnectionError):
+                await second.send_json({"type": "waiting"})
+            return websocket
+
+        websocket = asyncio.run(scenario())
+        assert websocket.closed_with == 1012
+        assert websocket.frames == [
+            {"type": "batch", "messages": [{"channel": "bot-1", "type": "waiting"}]}
+        ]
+
+
+class TestMultiplexedEndpoint:
+    """Test /ws/mux end to end"""
+
+    def receive_until(self, websocket, message_type, channel):
+        """Read batch frames until a message of the given type arrives"""
+        for _ in range(10):
+            for message in websocket.receive_json()["messages"]:
+                if message["type"] == message_type and message["channel"] == channel:
+                    return message
+        raise AssertionError(f"No {message_type} for {channel}")
+
+    def test_two_players_on_one_socket(self, monkeypatch):
+        """Test matchmaking and a move for two channels of one session"""
+        monkeypatch.setattr(main, "MUX_TOKEN", "secret")
+        client = TestClient(main.app)
+
+        with client.websocket_connect("/ws/mux?token=secret") as websocket:
+            websocket.send_json({"type": "batch", "messages": [
+                {"channel": "mux-a", "type": "join_queue"},
+                {"channel": "mux-b", "type": "join_queue"},
+            ]})
+            start = self.receive_until(websocket, "game_start", "mux-b")
+            first = start["game"]["current_turn"]
+
+            websocket.send_json({
+                "channel": first, "type": "make_move", "row": 1, "col": 1
+            })
+            update = self.receive_until(websocket, "game_update", "mux-a")
+            assert update["game"]["board"][1][1] == "X"
+
+    def test_malformed_messages_keep_session(self, monkeypatch):
+        """Test that bad frames and batch entries get errors, not a torn-down session"""
+        monkeypatch.setattr(main, "MUX_TOKEN", "secret")
+        client = TestClient(main.app)
+
+        with client.websocket_connect("/ws/mux?token=secret") as websocket:
+            websocket.send_json({"type": "batch", "messages": [
+                {"channel": "bad-a", "type": "join_queue"},
+                {"channel": "bad-b", "type": "join_queue"},
+            ]})
+            game_id = self.receive_until(websocket, "game_start", "bad-a")["game"]["game_id"]
+
+            for frame in ('{"type": "batch", "messages": [42]}', "[1, 2]", "not json",
+                          '{"type": "batch", "messages": "x"}'):
+                websocket.send_text(frame)
+                self.receive_until(websocket, "error", None)
+            assert main.game_service.get_game(game_id).state == GameState.PLAYING
+
+            # A message that fails in its handler only errors its own channel
+            websocket.send_json({"channel": "bad-a", "type": "make_move", "row": "x", "col": 0})
+            assert "integers" in self.receive_until(websocket, "error", "bad-a")["message"]
+            assert main.game_service.get_game(game_id).state == GameState.PLAYING
+
+            async def broken_hint(game, player_id):
+                raise RuntimeError("search failed")
+
+            monkeypatch.setattr(main.hint_service, "get_hint_async", broken_hint)
+            first = main.game_service.get_game(game_id).current_turn
+            websocket.send_json({"channel": first, "type": "request_hint"})
+            assert self.receive_until(websocket, "error", first)["message"] == "Message could not be processed"
+            assert main.game_service.get_game(game_id).state == GameState.PLAYING
+
+            # The channels still answer on the same session
+            websocket.send_json({"channel": "bad-a", "type": "no_such_type"})
+            self.receive_until(websocket, "error", "bad-a")
+
+    def test_rejects_bad_token(self, monkeypatch):
+        """Test that sessions require the configured token"""
+        from starlette.websockets import WebSocketDisconnect
+
+        monkeypatch.setattr(main, "MUX_TOKEN", "secret")
+        client = TestClient(main.app)
+        with pytest.raises(WebSocketDisconnect):
+            with client.websocket_connect("/ws/mux?token=wrong") as websocket:
+                websocket.receive_json()
@@ -0,0 +1,93 @@
+"""
+Unit tests for vectorized batch position analysis
+"""
+import base64
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+import app.main as main
+from app.models import Game
+from app.services import PositionAnalyzer
+from app.services.position_analysis_service import O_SIDE, X_SIDE, encode_game
+
+
+class TestPositionAnalyzer:
+    """Test winners, legal moves, vanishing cells and immediate wins"""
+
+    def test_matches_game_after_replay(self):
+        """Test an encoded game against what Game itself reports"""
+        game = Game("g1")
+        game.add_player("player1")
+        game.add_player("player2")
+        for row, col in [(0, 0), (1, 1), (0, 1), (2, 2), (2, 0)]:
+            game.make_move(row, col, game.current_turn)
+        board, to_move = encode_game(game)
+        result = PositionAnalyzer().analyze([board], [to_move])
+
+        assert result.winner.tolist() == [0]
+        assert to_move == O_SIDE
+        # X holds three pieces: its next move vanishes (0, 0)
+        assert result.next_vanishing[0].tolist() == [0, -1]
+        # (0, 2) and (1, 0) would complete lines through (0, 0), which vanishes first
+        assert not result.winning_moves[0].any()
+        assert result.legal_moves[0].sum() == 4
+
+    def test_wins_threats_and_finished_positions(self):
+        """Test codes directly: immediate wins and a finished board"""
+        boards = [
+            [1, 2, 0,
+             0, -1, 0,
+             0, 0, -2],       # X completes the top row at 2
+            [1, 2, 3,
+             -1, -2, 0,
+             0, 0, 0],        # X has a full row
+        ]
+        result = PositionAnalyzer().analyze(boards)
+        assert result.winner.tolist() == [0, X_SIDE]
+        assert result.to_move.tolist() == [X_SIDE, O_SIDE]
+        assert np.nonzero(result.winning_moves[0, 0])[0].tolist() == [2]
+        assert not result.legal_moves[1].any()
+
+        columns = result.to_dict()
+        assert columns["winning_moves"]["x"] == [[2], []]
+        assert columns["legal_moves"][0] == [2, 3, 5, 6, 7]
+
+    def test_rejects_malformed_positions(self):
+        """Test shape, range and piece age validation"""
+        analyzer = PositionAnalyzer()
+        with pytest.raises(ValueError):
+            analyzer.analyze([[0] * 8])
+        with pytest.raises(ValueError):
+            analyzer.analyze([[4, 0, 0, 0, 0, 0, 0, 0, 0]])
+        with pytest.raises(ValueError):
+            analyzer.analyze([[1, 1, 0, 0, 0, 0, 0, 0, 0]])
+        with pytest.raises(ValueError):
+            analyzer.analyze([[2, 0, 0, 0, 0, 0, 0, 0, 0]])
+
+
+class TestAnalyzeEndpoint:
+    """Test the REST endpoint"""
+
+    def test_packed_and_list_inputs_agree(self):
+        """Test that base64-packed boards give the same columns as lists"""
+        client = TestClient(main.app)
+        board = [0] * 25
+        board[0], board[1], board[2] = 1, 2, 3
+        rules = {"board_size": 5, "win_length": 4, "vanish_limit": 4}
+
+        listed = client.post("/api/positions/analyze", json={"rules": rules, "boards": [board]})
+        packed = client.post("/api/positions/analyze", json={
+            "rules": rules,
+            "packed": base64.b64encode(np.array(board, dtype=np.int8).tobytes()).decode(),
+        })
+        assert listed.status_code == 200
+        assert listed.json() == packed.json()
+        assert listed.json()["winning_moves"]["x"] == [[3]]
+
+    def test_bad_request(self):
+        """Test that malformed batches are rejected with 400"""
+        client = TestClient(main.app)
+        response = client.post("/api/positions/analyze", json={"boards": [[0, 0]]})
+        assert response.status_code == 400
@@ -0,0 +1,106 @@
+"""
+Unit tests for the timing wheel and turn clocks
+"""
+import pytest
+from app.models import Game, GameRules, GameState
+from app.services import GameService, TimingWheel, TurnClockService
+
+
+class TestTimingWheel:
+    """Test deadline scheduling"""
+
+    def test_expires_at_deadline(self):
+        """Test that keys fire on the first advance past their deadline"""
+        wheel = TimingWheel(tick=1.0, slots_per_level=(8, 4), start=0.0)
+        wheel.arm("a", 3.0)
+        wheel.arm("b", 5.5)
+
+        assert wheel.advance(2.9) == []
+        assert wheel.advance(3.0) == ["a"]
+        assert wheel.advance(5.0) == []
+        assert wheel.advance(6.0) == ["b"]
+        assert len(wheel) == 0
+
+    def test_cancel_and_rearm(self):
+        """Test that cancel removes and arm replaces a schedule"""
+        wheel = TimingWheel(tick=1.0, slots_per_level=(8, 4), start=0.0)
+        wheel.arm("a", 2.0)
+        wheel.arm("b", 2.0)
+        assert wheel.cancel("b") is True
+        assert wheel.cancel("b") is False
+
+        wheel.arm("a", 6.0)
+        assert wheel.advance(5.0) == []
+        assert wheel.advance(6.0) == ["a"]
+
+    def test_cascades_across_levels(self):
+        """Test deadlines beyond level 0 and beyond the whole wheel"""
+        wheel = TimingWheel(tick=1.0, slots_per_level=(4, 4, 4), start=0.0)
+        deadlines = {"near": 3.0, "mid": 13.0, "far": 50.0, "beyond": 200.0}
+        for key, deadline in deadlines.items():
+            wheel.arm(key, deadline)
+
+        fired = {}
+        for now in range(1, 201):
+            for key in wheel.advance(float(now)):
+                fired[key] = now
+
+        assert fired == {key: int(d) for key, d in deadlines.items()}
+
+    def test_past_deadline_fires_next_tick(self):
+        """Test that arming an already passed deadline fires promptly"""
+        wheel = TimingWheel(tick=1.0, slots_per_level=(8, 4), start=0.0)
+        wheel.advance(10.0)
+        wheel.arm("late", 3.0)
+        assert wheel.advance(11.0) == ["late"]
+
+
+class TestTurnClock:
+    """Test per-move and bank time controls"""
+
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        """Controllable wall clock for Game"""
+        now = [1000.0]
+        monkeypatch.setattr("app.models.game.time.time", lambda: now[0])
+        return now
+
+    def start_game(self, rules: GameRules) -> tuple[GameService, Game]:
+        game_service = GameService()
+        game = game_service.create_game(rules)
+        game.add_player("player1")
+        game.add_player("player2")
+        return game_service, game
+
+    def test_move_limit_forfeits(self, clock):
+        """Test that exceeding the per-move limit loses the game"""
+        game_service, game = self.start_game(GameRules(move_seconds=10))
+        turn_clock = TurnClockService(game_service, tick=1.0)
+        turn_clock.schedule(game)
+
+        clock[0] += 5
+        game.make_move(1, 1, "player1")
+        turn_clock.schedule(game)
+        assert game.get_time_remaining() == {"player1": 10, "player2": 10}
+
+        assert turn_clock.expire(clock[0] + 9) == []
+        assert turn_clock.expire(clock[0] + 11) == [game]
+        assert game.state == GameState.FINISHED
+        assert game.winner == "player1"
+        assert turn_clock.scheduled_count() == 0
+
+    def test_bank_is_charged(self, clock):
+        """Test that bank time is spent only on the mover's own turns"""
+        _, game = self.start_game(GameRules(bank_seconds=60))
+
+        clock[0] += 20
+        game.make_move(0, 0, "player1")
+        clock[0] += 5
+        assert game.get_time_remaining() == {"player1": 40, "player2": 55}
+
+        # A move sent after the bank ran out loses on time
+        clock[0] += 60
+        assert game.make_move(1, 1, "player2") is True
+        assert game.board[1][1].value == ""
+        assert game.winner == "player1"
+        assert game.time_remaining["player2"] == 0
@@ -0,0 +1,266 @@
+"""
+Unit tests for tournament pairing, round advancement and announcements
+"""
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.main as main
+from app.models import GameState, Tournament, TournamentFormat, TournamentState
+from app.services import GameService, MatchmakingService, TournamentService
+
+
+class FakeWebSocket:
+    """Records frames instead of sending them"""
+
+    def __init__(self):
+        self.frames = []
+
+    async def send_json(self, message):
+        self.frames.append(message)
+
+
+def finish(game, winner=None):
+    """Mark a game as won by winner (a draw when None)"""
+    game.state = GameState.FINISHED
+    game.winner = winner
+    game.finish_reason = "win" if winner else "draw"
+
+
+def make_service():
+    game_service = GameService()
+    return TournamentService(game_service, MatchmakingService(game_service))
+
+
+class TestSwissPairing:
+    """Test Swiss rounds, byes and scoring"""
+
+    def test_rounds_avoid_rematches(self):
+        """Test that 8 players play 3 rounds without meeting twice"""
+        service = make_service()
+        tournament = service.create_tournament(TournamentFormat.SWISS)
+        for i in range(8):
+            service.register(tournament.tournament_id, f"p{i}")
+
+        update = service.start(tournament.tournament_id)
+        met = set()
+        rounds = 0
+        while not update.finished:
+            rounds += 1
+            assert len(update.games) == 4
+            for game in update.games:
+                x, o = (p.player_id for p in game.players)
+                assert frozenset((x, o)) not in met
+                met.add(frozenset((x, o)))
+            for game in update.games[:-1]:
+                finish(game, game.players[0].player_id)
+                assert service.record_game(game) is None
+            last = update.games[-1]
+            finish(last)
+            update = service.record_game(last)
+
+        assert rounds == 3
+        assert tournament.state == TournamentState.FINISHED
+        assert sum(tournament.scores.values()) == 12
+        standings = tournament.standings()
+        assert [row["rank"] for row in standings] == list(range(1, 9))
+        assert standings[0]["score"] >= standings[-1]["score"]
+
+    def test_odd_field_rotates_the_bye(self):
+        """Test that the bye scores a point and never goes to the same player twice"""
+        tournament = Tournament("t", TournamentFormat.SWISS, rounds=3)
+        for i in range(5):
+            tournament.add_player(f"p{i}")
+
+        byes = []
+        pairings = tournament.start()
+        while pairings:
+            for index, (x, o) in enumerate(pairings):
+                if o is None:
+                    byes.append(x)
+                else:
+                    tournament.open_game(f"g{tournament.round_number}-{index}", (x, o))
+            for index, (x, o) in enumerate(pairings):
+                if o is not None:
+                    tournament.record_result(f"g{tournament.round_number}-{index}", x)
+            pairings = tournament.next_round()
+
+        assert len(byes) == 3 and len(set(byes)) == 3
+        assert sum(tournament.scores.values()) == 3 * 3
+
+    def test_registration_errors(self):
+        """Test duplicate, late and unknown registrations"""
+        service = make_service()
+        tournament = service.create_tournament(TournamentFormat.SWISS)
+        service.register(tournament.tournament_id, "alice")
+        with pytest.raises(ValueError):
+            service.register(tournament.tournament_id, "alice")
+        with pytest.raises(ValueError):
+            service.register("nope", "bob")
+        service.register(tournament.tournament_id, "bob")
+        service.start(tournament.tournament_id)
+        with pytest.raises(ValueError):
+            service.register(tournament.tournament_id, "carol")
+
+
+class TestKnockout:
+    """Test seeded brackets, replays and abandoned games"""
+
+    def test_byes_draw_replay_and_champion(self):
+        """Test that top seeds get byes, draws replay with colours swapped and the bracket resolves"""
+        service = make_service()
+        tournament = service.create_tournament(TournamentFormat.KNOCKOUT)
+        for i in range(1, 7):
+            service.register(tournament.tournament_id, f"seed{i}")
+
+        update = service.start(tournament.tournament_id)
+        assert sorted(update.byes) == ["seed1", "seed2"]
+        pairs = sorted(sorted(p.player_id for p in game.players) for game in update.games)
+        assert pairs == [["seed3", "seed6"], ["seed4", "seed5"]]
+
+        drawn = update.games[0]
+        x, o = (p.player_id for p in drawn.players)
+        finish(drawn)
+        replay = service.record_game(drawn)
+        assert [p.player_id for p in replay.games[0].players] == [o, x]
+        assert replay.tournament.round_number == 1
+
+        # Higher seed (lower number) wins every game from here on
+        pending = [replay.games[0], update.games[1]]
+        while True:
+            result = None
+            for game in pending:
+                finish(game, min((p.player_id for p in game.players), key=lambda s: int(s[4:])))
+                result = service.record_game(game)
+            if result.finished:
+                break
+            pending = result.games
+
+        assert tournament.round_number == 3
+        assert tournament.standings()[0]["player_id"] == "seed1"
+
+    def test_leaver_loses_abandoned_game(self):
+        """Test that leaving a tournament game forfeits it to the opponent"""
+        service = make_service()
+        tournament = service.create_tournament(TournamentFormat.KNOCKOUT)
+        service.register(tournament.tournament_id, "alice")
+        service.register(tournament.tournament_id, "bob")
+
+        game = service.start(tournament.tournament_id).games[0]
+        update = service.record_game(game, reason="abandoned", leaver="alice")
+        assert update.finished
+        assert tournament.standings()[0]["player_id"] == "bob"
+
+
+class TestTournamentEndpoints:
+    """Test a tournament end to end over WebSockets"""
+
+    def receive_until(self, websocket, message_type):
+        for _ in range(20):
+            message = websocket.receive_json()
+            if message["type"] == message_type:
+                return message
+        raise AssertionError(f"No {message_type}")
+
+    def test_absent_player_forfeits(self):
+        """Test that a player who is not connected when a round starts loses its game"""
+        tournament = main.tournament_service.create_tournament(TournamentFormat.SWISS)
+        main.tournament_service.register(tournament.tournament_id, "present")
+        main.tournament_service.register(tournament.tournament_id, "absent")
+        websocket = FakeWebSocket()
+        main.connection_manager.register("present", websocket)
+        async def announce(update):
+            await main.message_handler.announce_tournament(update)
+            # The forfeit is scored by the tournament subscriber of the event bus
+            await main.event_bus.join()
+
+        try:
+            update = main.tournament_service.start(tournament.tournament_id)
+            asyncio.run(announce(update))
+        finally:
+            main.connection_manager.disconnect("present")
+
+        assert [frame["type"] for frame in websocket.frames] == [
+            "game_start", "player_disconnected", "tournament_finished"
+        ]
+        assert tournament.standings()[0]["player_id"] == "present"
+
+    def test_round_pulls_entrants_out_of_casual_games(self):
+        """Test that an entrant's casual game and open room end when their round starts"""
+        tournament = main.tournament_service.create_tournament(TournamentFormat.SWISS)
+        main.tournament_service.register(tournament.tournament_id, "busy-entrant")
+        main.tournament_service.register(tournament.tournament_id, "host-entrant")
+        sockets = {p: FakeWebSocket() for p in ("busy-entrant", "host-entrant", "casual")}
+        for player_id, websocket in sockets.items():
+            main.connection_manager.register(player_id, websocket)
+
+        async def scenario():
+            for player_id in ("busy-entrant", "casual"):
+                await main.message_handler.handle_message(player_id, {"type": "join_queue"})
+            await main.message_handler.handle_message("host-entrant", {"type": "create_room"})
+            update = main.tournament_service.start(tournament.tournament_id)
+            await main.message_handler.announce_tournament(update)
+            await main.event_bus.join()
+            return update
+
+        try:
+            update = asyncio.run(scenario())
+            casual = main.matchmaking_service.get_player_game("casual")
+            room = next(game for game, player_id in update.displaced if player_id == "host-entrant")
+        finally:
+            for player_id in sockets:
+                main.connection_manager.disconnect(player_id)
+
+        assert casual.state == GameState.FINISHED and casual.finish_reason == "abandoned"
+        assert [p.player_id for p in casual.players] == ["casual"]
+        assert "player_left" in [frame["type"] for frame in sockets["casual"].frames]
+        assert main.game_service.get_game(room.game_id) is None
+        assert room.game_id not in [entry["game_id"] for entry in main.lobby_service.page(limit=100)["games"]]
+        tournament_game = update.games[0]
+        for player_id in ("busy-entrant", "host-entrant"):
+            assert main.matchmaking_service.get_player_game(player_id) is tournament_game
+            assert sockets[player_id].frames[-1]["type"] == "game_start"
+        assert tournament_game.state == GameState.PLAYING
+
+    def test_two_player_tournament(self, monkeypatch):
+        """Test joining, starting, playing the only game and the final standings"""
+        monkeypatch.setattr(main, "ADMIN_TOKEN", "secret")
+        client = TestClient(main.app)
+        headers = {"X-Admin-Token": "secret"}
+        created = client.post("/api/admin/tournaments", json={"format": "swiss"}, headers=headers)
+        tournament_id = created.json()["tournament_id"]
+
+        with client.websocket_connect("/ws/cup-a") as first, client.websocket_connect("/ws/cup-b") as second:
+            sockets = {"cup-a": first, "cup-b": second}
+            for websocket in sockets.values():
+                websocket.send_json({"type": "join_tournament", "tournament_id": tournament_id})
+                joined = self.receive_until(websocket, "tournament_joined")
+            assert joined["tournament"]["players"] == 2
+
+            started = client.post(f"/api/admin/tournaments/{tournament_id}/start", headers=headers)
+            assert started.json()["state"] == "running"
+            starts = {p: self.receive_until(ws, "game_start") for p, ws in sockets.items()}
+            assert starts["cup-a"]["tournament"]["round"] == 1
+            x_player = starts["cup-a"]["game"]["current_turn"]
+            o_player = "cup-b" if x_player == "cup-a" else "cup-a"
+
+            # X completes the left column
+            for player_id, (row, col) in (
+                (x_player, (0, 0)), (o_player, (0, 1)),
+                (x_player, (1, 0)), (o_player, (1, 1)),
+                (x_player, (2, 0)),
+            ):
+                sockets[player_id].send_json({"type": "make_move", "row": row, "col": col})
+                for websocket in sockets.values():
+                    self.receive_until(websocket, "game_update")
+
+            final = self.receive_until(sockets[o_player], "tournament_finished")
+            assert final["standings"][0]["player_id"] == x_player
+
+        status = client.get(f"/api/tournaments/{tournament_id}").json()
+        assert status["state"] == "finished"
+        assert status["standings"][0] == {
+            "rank": 1, "player_id": x_player, "score": 1.0, "buchholz": 0.0
+        }
+        assert client.get("/api/tournaments/missing").status_code == 404
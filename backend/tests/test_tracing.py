@@ -0,0 +1,141 @@
+"""
+Unit tests for sampled tracing spans and the sampling profiler
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.main as main
+from app.services import SamplingProfiler, Tracer
+from app.services.profiler_service import collapse_stacks
+
+
+class FakeClock:
+    """Nanosecond clock advanced by hand"""
+
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+def spin(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+class TestTracer:
+    """Test sampling, span nesting and the ring buffer"""
+
+    def test_spans_nest_across_awaits(self):
+        """Test that spans inside awaited coroutines join the current trace"""
+        clock = FakeClock()
+        tracer = Tracer(sample_rate=1.0, clock=clock)
+
+        async def stage(name, cost):
+            with tracer.span(name):
+                await asyncio.sleep(0)
+                clock.now += cost
+
+        async def message():
+            with tracer.trace():
+                clock.now += 1000
+                await stage("make_move", 2000)
+                await stage("broadcast_to_game", 5000)
+
+        asyncio.run(message())
+        (trace,) = tracer.recent()
+        assert [span["name"] for span in trace["spans"]] == ["message", "make_move", "broadcast_to_game"]
+        assert [span["duration_us"] for span in trace["spans"]] == [8.0, 2.0, 5.0]
+        assert trace["spans"][2]["offset_us"] == 3.0
+        assert trace["started_at"] is not None
+
+    def test_off_records_nothing(self):
+        """Test that unsampled messages share the no-op span"""
+        tracer = Tracer(sample_rate=0.0)
+        with tracer.trace() as trace:
+            with tracer.span("make_move") as span:
+                pass
+        assert trace is span
+        assert tracer.stats()["buffered_spans"] == 0
+        with tracer.span("outside a trace"):
+            pass
+        assert tracer.recent() == []
+
+    def test_sample_rate_and_bounded_buffer(self):
+        """Test the sampled share and that old spans fall out of the ring"""
+        tracer = Tracer(sample_rate=0.25, capacity=100, seed=3)
+        for _ in range(4000):
+            with tracer.trace():
+                pass
+        assert tracer.stats()["buffered_spans"] == 100
+        traced = Tracer(sample_rate=0.25, capacity=10_000, seed=3)
+        for _ in range(4000):
+            with traced.trace():
+                pass
+        assert 850 < traced.stats()["buffered_spans"] < 1150
+        with pytest.raises(ValueError):
+            tracer.set_sample_rate(1.5)
+
+
+class TestSamplingProfiler:
+    """Test stack sampling and the collapsed output"""
+
+    def test_samples_busy_thread(self):
+        """Test that a spinning thread shows up in the collapsed stacks"""
+        stop = threading.Event()
+        worker = threading.Thread(target=spin, args=(stop,), name="busy worker")
+        worker.start()
+        try:
+            stacks = SamplingProfiler().profile(0.2, hz=200, thread_id=worker.ident)
+        finally:
+            stop.set()
+            worker.join()
+
+        assert sum(stacks.values()) >= 10
+        assert all(stack.startswith("busy_worker;") for stack in stacks)
+        assert any("test_tracing:spin" in stack for stack in stacks)
+        line = collapse_stacks(stacks).splitlines()[0]
+        assert line.rsplit(" ", 1)[1].isdigit()
+
+    def test_one_profile_at_a_time(self):
+        """Test that a second concurrent profile is refused"""
+        profiler = SamplingProfiler()
+        thread = threading.Thread(target=profiler.profile, args=(0.3,))
+        thread.start()
+        time.sleep(0.05)
+        try:
+            with pytest.raises(RuntimeError):
+                profiler.profile(0.1)
+        finally:
+            thread.join()
+
+
+class TestDiagnosticsEndpoints:
+    """Test the admin tracing and profile endpoints"""
+
+    def test_tracing_and_profile(self, monkeypatch):
+        """Test switching sampling on, tracing a message and profiling briefly"""
+        monkeypatch.setattr(main, "ADMIN_TOKEN", "secret")
+        headers = {"X-Admin-Token": "secret"}
+        client = TestClient(main.app)
+        try:
+            assert client.post("/api/admin/tracing", json={"sample_rate": 1}, headers=headers).status_code == 200
+            with client.websocket_connect("/ws/trace-a") as websocket:
+                websocket.receive_json()
+                websocket.send_json({"type": "request_hint"})
+                assert websocket.receive_json()["type"] == "error"
+        finally:
+            main.tracer.set_sample_rate(0)
+
+        traces = client.get("/api/admin/tracing?limit=1", headers=headers).json()["traces"]
+        assert [span["name"] for span in traces[0]["spans"]] == ["message", "receive_json", "handle_message"]
+
+        profile = client.post("/api/admin/profile?seconds=0.05&all_threads=true", headers=headers)
+        assert profile.status_code == 200
+        assert profile.headers["content-type"].startswith("text/plain")
+        assert client.post("/api/admin/profile?seconds=600", headers=headers).status_code == 400
@@ -36,13 +36,44 @@ if ! docker network inspect web >/dev/null 2>&1; then
     exit 1
 fi
 
+# Сборка заранее, чтобы сократить окно перезапуска
+echo "🔨 Сборка..."
+docker compose -f docker-compose.prod.yml build
+
+# Передача активных игр новому процессу (drain mode)
+if [ -n "$(docker ps -q -f name=vanishing_ttt_backend)" ]; then
+    echo "🚰 Сохранение активных игр..."
+    if [ -n "$ADMIN_TOKEN" ]; then
+        docker exec vanishing_ttt_backend python -c "import os, urllib.request as r; print(r.urlopen(r.Request('http://localhost:8000/api/admin/drain', method='POST', headers={'X-Admin-Token': os.environ['ADMIN_TOKEN']})).read().decode())" || true
+    else
+        docker kill -s SIGUSR1 vanishing_ttt_backend || true
+        # Ждём файл передачи (HANDOVER_PATH из docker-compose.prod.yml): он
+        # появляется атомарно (os.replace), когда все игры записаны
+        HANDOVER_FILE=/var/lib/vanishing-ttt/handover.bin
+        for attempt in $(seq 1 30); do
+            if docker exec vanishing_ttt_backend test -f "$HANDOVER_FILE" 2>/dev/null; then
+                echo "✅ Игры сохранены: $HANDOVER_FILE"
+                break
+            fi
+            if [ -z "$(docker ps -q -f name=vanishing_ttt_backend)" ]; then
+                echo "⚠️ Backend завершился до записи файла передачи"
+                break
+            fi
+            if [ "$attempt" -eq 30 ]; then
+                echo "⚠️ Файл передачи не появился за 30 секунд, активные игры будут потеряны"
+            fi
+            sleep 1
+        done
+    fi
+fi
+
 # Остановка старых контейнеров
 echo "⏹️  Остановка старых контейнеров..."
 docker compose -f docker-compose.prod.yml down --remove-orphans 2>/dev/null || true
 
-# Сборка и запуск
-echo "🔨 Сборка и запуск..."
-docker compose -f docker-compose.prod.yml up -d --build
+# Запуск (новый backend подхватит сохранённые игры при старте)
+echo "🚀 Запуск..."
+docker compose -f docker-compose.prod.yml up -d
 
 echo "⏳ Ожидание запуска..."
 sleep 5
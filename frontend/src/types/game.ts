@@ -11,6 +11,14 @@ export interface Player {
   symbol: CellValue;
 }
 
+export interface GameRules {
+  board_size: number;
+  win_length: number;
+  vanish_limit: number;
+  move_seconds?: number | null;
+  bank_seconds?: number | null;
+}
+
 export interface Game {
   game_id: string;
   board: CellValue[][];
@@ -18,6 +26,7 @@ export interface Game {
   state: GameState;
   current_turn: string | null;
   winner: string | null;
+  finish_reason?: "win" | "draw" | "timeout" | "abandoned" | null;
   move_count: number;
   next_vanishing?: {
     [player_id: string]: {
@@ -25,6 +34,8 @@ export interface Game {
       col: number;
     };
   };
+  rules?: GameRules;
+  time_remaining?: { [player_id: string]: number } | null;
 }
 
 export interface WebSocketMessage {
@@ -46,6 +57,7 @@ export interface WaitingMessage extends WebSocketMessage {
 export interface GameStartMessage extends WebSocketMessage {
   type: "game_start";
   game: Game;
+  tournament?: Tournament;
 }
 
 export interface GameUpdateMessage extends WebSocketMessage {
@@ -57,6 +69,7 @@ export interface GameOverMessage extends WebSocketMessage {
   type: "game_over";
   game: Game;
   winner: string | null;
+  reason?: "timeout";
 }
 
 export interface PlayerLeftMessage extends WebSocketMessage {
@@ -65,6 +78,84 @@ export interface PlayerLeftMessage extends WebSocketMessage {
   message: string;
 }
 
+export interface HintMessage extends WebSocketMessage {
+  type: "hint";
+  row: number;
+  col: number;
+  score: number;
+  cached: boolean;
+}
+
+export interface LeaderboardEntry {
+  rank: number;
+  player_id: string;
+  score: number;
+  wins: number;
+  draws: number;
+  losses: number;
+}
+
+export interface LeaderboardMessage extends WebSocketMessage {
+  type: "leaderboard";
+  version: number;
+  players: LeaderboardEntry[];
+}
+
+export interface Tournament {
+  tournament_id: string;
+  format: "swiss" | "knockout";
+  rules: GameRules;
+  state: "registering" | "running" | "finished";
+  round: number;
+  total_rounds: number;
+  players: number;
+  open_games: number;
+}
+
+export interface TournamentStanding {
+  rank: number;
+  player_id: string;
+  score: number;
+  buchholz: number;
+}
+
+export interface TournamentJoinedMessage extends WebSocketMessage {
+  type: "tournament_joined";
+  tournament: Tournament;
+}
+
+export interface TournamentByeMessage extends WebSocketMessage {
+  type: "tournament_bye";
+  tournament: Tournament;
+}
+
+export interface TournamentFinishedMessage extends WebSocketMessage {
+  type: "tournament_finished";
+  tournament: Tournament;
+  standings: TournamentStanding[];
+}
+
+export interface RoomCreatedMessage extends WebSocketMessage {
+  type: "room_created";
+  code: string;
+  game: Game;
+}
+
+export interface LobbyEntry {
+  game_id: string;
+  code: string | null;
+  state: GameState;
+  players: string[];
+  rules: GameRules;
+  created_at: string;
+  cursor: string;
+}
+
+export interface LobbyPage {
+  games: LobbyEntry[];
+  next_cursor: string | null;
+}
+
 export interface ErrorMessage extends WebSocketMessage {
   type: "error";
   message: string;